@@ -8,6 +8,7 @@ in the job matching, freelance, and donation system.
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from django.conf import settings
 
 # Set the default Django settings module for the 'celery' program.
@@ -57,6 +58,41 @@ app.conf.update(
 # }
 
 
+@worker_process_init.connect
+def warm_fetcher_registry(**kwargs):
+    """Resolve every FetchScript when a worker process starts so broken paths show up now."""
+    from core.utils.logger import logger
+    from fetchers.browser import reap_orphaned_browsers
+    from fetchers.profiles import profile_store
+    from fetchers.registry import fetcher_registry
+
+    # Chrome left behind by a previous child that was killed mid-fetch.
+    reap_orphaned_browsers()
+    profile_store.prune()
+
+    try:
+        fetcher_registry.warm()
+    except Exception as e:
+        # A missing table or unreachable DB must not stop the worker from booting.
+        logger.error(f"Could not warm fetcher registry: {e}")
+
+
+@worker_process_shutdown.connect
+def close_fetcher_pools(**kwargs):
+    """Quit this worker process's pooled Chrome sessions, browser and parse workers and HTTP connections."""
+    from fetchers.browser import browser_pool
+    from fetchers.cdp import async_browser
+    from fetchers.http_client import http_client
+    from fetchers.parse_pool import parse_pool
+    from fetchers.workers import browser_workers
+
+    browser_pool.close()
+    async_browser.close()
+    browser_workers.close()
+    parse_pool.close()
+    http_client.close()
+
+
 @app.task(bind=True)
 def debug_task(self):
     """Debug task for testing Celery configuration."""
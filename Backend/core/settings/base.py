@@ -203,6 +203,79 @@ PLATFORM_FOLLOWERS_CACHE_TIMEOUT = getattr(
     settings, "PLATFORM_FOLLOWERS_CACHE_TIMEOUT", None
 )
 
+# Browser Fetcher Configuration
+CHROMEDRIVER_PATH = settings.CHROMEDRIVER_PATH
+BROWSER_POOL_SIZE = settings.BROWSER_POOL_SIZE
+BROWSER_MAX_PAGES_PER_SESSION = settings.BROWSER_MAX_PAGES_PER_SESSION
+BROWSER_MAX_MEMORY_MB = settings.BROWSER_MAX_MEMORY_MB
+BROWSER_LEAN_MODE = settings.BROWSER_LEAN_MODE
+BROWSER_RENDERER_MAX_MEMORY_MB = settings.BROWSER_RENDERER_MAX_MEMORY_MB
+BROWSER_WORKER_PROCESSES = settings.BROWSER_WORKER_PROCESSES
+BROWSER_WORKER_MAX_RSS_MB = settings.BROWSER_WORKER_MAX_RSS_MB
+BROWSER_WORKER_MAX_JOBS = settings.BROWSER_WORKER_MAX_JOBS
+BROWSER_PROFILES_ENABLED = settings.BROWSER_PROFILES_ENABLED
+BROWSER_PROFILE_DIR = settings.BROWSER_PROFILE_DIR
+BROWSER_PROFILE_SLOTS = settings.BROWSER_PROFILE_SLOTS
+BROWSER_PROFILE_CACHE_MB = settings.BROWSER_PROFILE_CACHE_MB
+BROWSER_PROFILE_TTL = settings.BROWSER_PROFILE_TTL
+BROWSER_REMOTE_URLS = settings.BROWSER_REMOTE_URLS
+BROWSER_REMOTE_NODE_COOLDOWN = settings.BROWSER_REMOTE_NODE_COOLDOWN
+CHROME_BINARY = settings.CHROME_BINARY
+ASYNC_BROWSER_MAX_PAGES = settings.ASYNC_BROWSER_MAX_PAGES
+
+# HTTP Fetcher Configuration
+HTTP_POOL_MAXSIZE = settings.HTTP_POOL_MAXSIZE
+HTTP_TIMEOUT = settings.HTTP_TIMEOUT
+HTTP_MAX_RETRIES = settings.HTTP_MAX_RETRIES
+
+# Official API Fetcher Configuration
+YOUTUBE_API_KEY = settings.YOUTUBE_API_KEY
+YOUTUBE_API_URL = settings.YOUTUBE_API_URL
+
+# Fetch Rate Limiting / Circuit Breaker Configuration
+FETCH_RATE_LIMIT_PER_MINUTE = settings.FETCH_RATE_LIMIT_PER_MINUTE
+FETCH_RATE_LIMIT_BURST = settings.FETCH_RATE_LIMIT_BURST
+FETCH_RATE_LIMIT_MAX_WAIT = settings.FETCH_RATE_LIMIT_MAX_WAIT
+FETCH_DOMAIN_RATE_LIMITS = settings.FETCH_DOMAIN_RATE_LIMITS
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+CIRCUIT_BREAKER_FAILURE_WINDOW = settings.CIRCUIT_BREAKER_FAILURE_WINDOW
+CIRCUIT_BREAKER_COOLDOWN = settings.CIRCUIT_BREAKER_COOLDOWN
+
+# HTML Parsing Configuration
+HTML_PARSER_BACKEND = settings.HTML_PARSER_BACKEND
+FETCH_STRATEGY_MEMORY = settings.FETCH_STRATEGY_MEMORY
+
+# Fetch Replay Configuration
+FETCH_REPLAY_MODE = settings.FETCH_REPLAY_MODE
+FETCH_FIXTURES_DIR = settings.FETCH_FIXTURES_DIR or BASE_DIR / "fetchers" / "fixtures"
+FETCH_REPLAY_BROWSER = settings.FETCH_REPLAY_BROWSER
+
+# Page Snapshot Configuration
+FETCH_SNAPSHOTS_ENABLED = settings.FETCH_SNAPSHOTS_ENABLED
+FETCH_SNAPSHOTS_DIR = settings.FETCH_SNAPSHOTS_DIR or BASE_DIR / "snapshots"
+FETCH_SNAPSHOT_TTL = settings.FETCH_SNAPSHOT_TTL
+FETCH_SNAPSHOT_MAX_MB = settings.FETCH_SNAPSHOT_MAX_MB
+
+# Metrics Refresh Configuration
+REFRESH_CONCURRENCY = settings.REFRESH_CONCURRENCY
+REFRESH_PARSE_PROCESSES = settings.REFRESH_PARSE_PROCESSES
+REFRESH_QUEUE_SIZE = settings.REFRESH_QUEUE_SIZE
+REFRESH_WRITE_BATCH = settings.REFRESH_WRITE_BATCH
+REFRESH_MIN_INTERVAL = settings.REFRESH_MIN_INTERVAL
+REFRESH_MAX_INTERVAL = settings.REFRESH_MAX_INTERVAL
+REFRESH_TARGET_CHANGE = settings.REFRESH_TARGET_CHANGE
+REFRESH_VELOCITY_DAYS = settings.REFRESH_VELOCITY_DAYS
+PLATFORM_FETCH_SOFT_TIME_LIMIT = settings.PLATFORM_FETCH_SOFT_TIME_LIMIT
+PLATFORM_FETCH_TIME_LIMIT = settings.PLATFORM_FETCH_TIME_LIMIT
+PLATFORM_FETCH_MAX_RETRIES = settings.PLATFORM_FETCH_MAX_RETRIES
+PLATFORM_FETCH_RETRY_BACKOFF = settings.PLATFORM_FETCH_RETRY_BACKOFF
+PLATFORM_FETCH_RETRY_BACKOFF_MAX = settings.PLATFORM_FETCH_RETRY_BACKOFF_MAX
+FETCH_DEADLINE = settings.FETCH_DEADLINE
+FETCH_ATTEMPT_THREADS = settings.FETCH_ATTEMPT_THREADS
+FETCH_HEDGE_ENABLED = settings.FETCH_HEDGE_ENABLED
+FETCH_HEDGE_MIN_SAMPLES = settings.FETCH_HEDGE_MIN_SAMPLES
+FETCH_LATENCY_HISTORY = settings.FETCH_LATENCY_HISTORY
+
 # Django REST Framework Configuration
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
@@ -82,6 +82,79 @@ class Settings(BaseSettings):
 
     PLATFORM_FOLLOWERS_CACHE_TIMEOUT: int = 60 * 30  # 30 minutes
 
+    # Browser Fetcher Configuration
+    CHROMEDRIVER_PATH: str = ""  # Empty means PATH lookup, then webdriver-manager
+    BROWSER_POOL_SIZE: int = 2  # Warm Chrome sessions per worker process
+    BROWSER_MAX_PAGES_PER_SESSION: int = 50  # Recycle a session after this many pages
+    BROWSER_MAX_MEMORY_MB: int = 1024  # Recycle a session above this RSS
+    BROWSER_LEAN_MODE: bool = True  # No images, extensions, GPU or background traffic
+    BROWSER_RENDERER_MAX_MEMORY_MB: int = 512  # V8 heap cap per renderer
+    BROWSER_WORKER_PROCESSES: int = 0  # Browser-tier subprocesses; 0 = in-process
+    BROWSER_WORKER_MAX_RSS_MB: int = 1536  # Restart a worker above this tree RSS
+    BROWSER_WORKER_MAX_JOBS: int = 200  # Restart a browser worker after this many jobs
+    BROWSER_PROFILES_ENABLED: bool = True  # Persistent Chrome profile per domain
+    BROWSER_PROFILE_DIR: str = ""  # Empty = BASE_DIR/browser_profiles
+    BROWSER_PROFILE_SLOTS: int = 4  # Profiles (concurrent browsers) per domain
+    BROWSER_PROFILE_CACHE_MB: int = 100  # Disk cache cap of each profile
+    BROWSER_PROFILE_TTL: int = 14 * 24 * 60 * 60  # Delete profiles unused this long
+    BROWSER_REMOTE_URLS: list[str] = []  # Remote WebDriver nodes/Grid
+    BROWSER_REMOTE_NODE_COOLDOWN: int = 60  # Seconds a failed remote node is skipped
+    CHROME_BINARY: str = ""  # Chrome for CDP fetchers; empty = PATH
+    ASYNC_BROWSER_MAX_PAGES: int = 16  # Open tabs per event loop in async fetchers
+
+    # HTTP Fetcher Configuration
+    HTTP_POOL_MAXSIZE: int = 10  # Keep-alive connections kept per host
+    HTTP_TIMEOUT: int = 10  # Default seconds for connect/read
+    HTTP_MAX_RETRIES: int = 2  # Retries on connection errors and 502/503/504
+
+    # Official API Fetcher Configuration
+    YOUTUBE_API_KEY: str = ""  # YouTube Data API key for YoutubeApiFetcher
+    YOUTUBE_API_URL: str = ""  # channels.list override, e.g. a stub API
+
+    # Fetch Rate Limiting / Circuit Breaker Configuration
+    FETCH_RATE_LIMIT_PER_MINUTE: float = 6  # Default requests per minute per domain
+    FETCH_RATE_LIMIT_BURST: int = 3  # Token bucket capacity per domain
+    FETCH_RATE_LIMIT_MAX_WAIT: int = 30  # Seconds to wait for a token before giving up
+    FETCH_DOMAIN_RATE_LIMITS: dict[str, float] = {}  # Per-domain overrides (per minute)
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 3  # Consecutive failures before opening
+    CIRCUIT_BREAKER_FAILURE_WINDOW: int = 60 * 60  # Seconds failures are remembered
+    CIRCUIT_BREAKER_COOLDOWN: int = 60 * 10  # Seconds to stay open before a trial
+
+    # HTML Parsing Configuration
+    HTML_PARSER_BACKEND: str = "auto"  # auto, selectolax, lxml or html.parser
+    FETCH_STRATEGY_MEMORY: bool = True  # Try strategies that won before first
+
+    # Fetch Replay Configuration
+    FETCH_REPLAY_MODE: str = "off"  # "off", "record" or "replay"
+    FETCH_FIXTURES_DIR: str = ""  # Empty means Backend/fetchers/fixtures
+    FETCH_REPLAY_BROWSER: str = "fake"  # Replayed browser: "fake" or "chrome"
+
+    # Page Snapshot Configuration
+    FETCH_SNAPSHOTS_ENABLED: bool = False  # Keep every raw page a fetch sees
+    FETCH_SNAPSHOTS_DIR: str = ""  # Empty means Backend/snapshots
+    FETCH_SNAPSHOT_TTL: int = 60 * 60 * 24 * 7  # Seconds a snapshot is kept
+    FETCH_SNAPSHOT_MAX_MB: int = 500  # Oldest snapshots are evicted above this size
+
+    # Metrics Refresh Configuration
+    REFRESH_CONCURRENCY: int = 4  # Platforms fetched at the same time per refresh
+    REFRESH_PARSE_PROCESSES: int = -1  # Parse processes; -1 = per core, 0 = threads
+    REFRESH_QUEUE_SIZE: int = 16  # Items buffered between refresh pipeline stages
+    REFRESH_WRITE_BATCH: int = 20  # Most platform counts written to the cache at once
+    REFRESH_MIN_INTERVAL: int = 60 * 15  # Fastest a single platform is re-fetched
+    REFRESH_MAX_INTERVAL: int = 60 * 60 * 24  # Slowest a single platform is re-fetched
+    REFRESH_TARGET_CHANGE: int = 5  # Expected follower change that warrants a fetch
+    REFRESH_VELOCITY_DAYS: int = 14  # Days of daily metrics used to estimate velocity
+    PLATFORM_FETCH_SOFT_TIME_LIMIT: int = 120  # Seconds per platform fetch task
+    PLATFORM_FETCH_TIME_LIMIT: int = 150  # Hard kill for a platform fetch task
+    PLATFORM_FETCH_MAX_RETRIES: int = 3
+    PLATFORM_FETCH_RETRY_BACKOFF: int = 10  # Base seconds for exponential backoff
+    PLATFORM_FETCH_RETRY_BACKOFF_MAX: int = 300  # Upper bound for a single backoff
+    FETCH_DEADLINE: int = 90  # Seconds before a fetch is cancelled
+    FETCH_ATTEMPT_THREADS: int = 32  # Threads running fetch attempts per process
+    FETCH_HEDGE_ENABLED: bool = False  # Second attempt after the p95 latency
+    FETCH_HEDGE_MIN_SAMPLES: int = 10  # Fetch durations needed before hedging kicks in
+    FETCH_LATENCY_HISTORY: int = 50  # Recent fetch durations kept per platform
+
     # Logging Configuration
     LOG_FILE: str = "app.log"  # Default log file name
     LOG_LEVEL: str = "INFO"  # Default log level for the application
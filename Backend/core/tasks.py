@@ -4,6 +4,7 @@ from django.utils import timezone
 from core.utils.analytics import AnalyticsManager
 from core.utils.logger import logger
 from metrics.models.platform import Platform
+from metrics.tasks.orchestrator import refresh_platforms_concurrently
 
 
 @shared_task
@@ -40,18 +41,9 @@ def refresh_platform_metrics():
     # Get platforms from cache for efficiency
     platforms = Platform.objects.get_all()
 
-    success_count = 0
-    failure_count = 0
-
-    for platform in platforms:
-        try:
-            if platform.refresh_metrics():
-                success_count += 1
-            else:
-                failure_count += 1
-        except Exception as e:
-            logger.error(f"Error refreshing metrics for {platform.name}: {e}")
-            failure_count += 1
+    outcomes = refresh_platforms_concurrently(platforms)
+    success_count = sum(1 for outcome in outcomes.values() if outcome["success"])
+    failure_count = len(outcomes) - success_count
 
     duration = (timezone.now() - start_time).total_seconds()
     logger.info(
@@ -10,6 +10,15 @@ class CacheKey(Enum):
     PLATFORM_FOLLOWERS = "platform_followers_{name}"
     PLATFORM_DELTA = "platform_delta_{name}"
     PLATFORM_LAST_UPDATED = "platform_last_updated_{name}"
+    PLATFORM_FETCH_TIER = "platform_fetch_tier_{name}"
+    FETCH_SCRIPTS_VERSION = "fetch_scripts_version"
+    DOMAIN_RATE_LIMIT = "fetch_rate_limit:{domain}"
+    CIRCUIT_FAILURES = "circuit_failures_{name}"
+    CIRCUIT_OPEN = "circuit_open_{name}"
+    CIRCUIT_TRIAL = "circuit_trial_{name}"
+    PLATFORM_REFRESH_SCHEDULE = "platform_refresh_schedule_{name}"
+    PLATFORM_FETCH_LATENCIES = "platform_fetch_latencies_{name}"
+    FETCH_STRATEGY_STATS = "fetch_strategy_stats:{scope}"
 
     def build(self, **kwargs) -> str:
         """
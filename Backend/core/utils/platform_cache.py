@@ -49,6 +49,32 @@ class PlatformCacheManager:
         cache.set(delta_key, delta, timeout=None)
         cache.set(last_updated_key, timezone.now().isoformat(), timeout=None)
 
+    @staticmethod
+    def update_many_platform_metrics(followers_by_name: dict, tiers: dict = None):
+        """
+        Update metrics (and optionally fetch tiers) for several platforms at once.
+        Same result as update_platform_metrics per platform, in one cache read
+        and one cache write.
+        """
+        followers_keys = {
+            name: CacheKey.PLATFORM_FOLLOWERS.build(name=name) for name in followers_by_name
+        }
+        previous = cache.get_many(list(followers_keys.values()))
+        now = timezone.now().isoformat()
+
+        values = {}
+        for name, followers in followers_by_name.items():
+            previous_followers = previous.get(followers_keys[name])
+            values[followers_keys[name]] = followers
+            values[CacheKey.PLATFORM_DELTA.build(name=name)] = (
+                (followers - previous_followers) if previous_followers is not None else 0
+            )
+            values[CacheKey.PLATFORM_LAST_UPDATED.build(name=name)] = now
+        for name, tier in (tiers or {}).items():
+            values[CacheKey.PLATFORM_FETCH_TIER.build(name=name)] = tier
+
+        cache.set_many(values, timeout=None)
+
     @staticmethod
     def get_followers(platform_name: str) -> int:
         """Get cached followers count for a platform."""
@@ -67,14 +93,27 @@ class PlatformCacheManager:
         key = CacheKey.PLATFORM_LAST_UPDATED.build(name=platform_name)
         return cache.get(key)
 
+    @staticmethod
+    def set_fetch_tier(platform_name: str, tier: str):
+        """Record which fetch tier (e.g. 'http', 'browser') last produced a count."""
+        key = CacheKey.PLATFORM_FETCH_TIER.build(name=platform_name)
+        cache.set(key, tier, timeout=None)
+
+    @staticmethod
+    def get_fetch_tier(platform_name: str) -> str:
+        """Get the fetch tier that last produced a count for a platform."""
+        key = CacheKey.PLATFORM_FETCH_TIER.build(name=platform_name)
+        return cache.get(key)
+
     @staticmethod
     def clear_platform_cache(platform_name: str):
         """Clear all cached data for a platform."""
         followers_key = CacheKey.PLATFORM_FOLLOWERS.build(name=platform_name)
         delta_key = CacheKey.PLATFORM_DELTA.build(name=platform_name)
         last_updated_key = CacheKey.PLATFORM_LAST_UPDATED.build(name=platform_name)
+        fetch_tier_key = CacheKey.PLATFORM_FETCH_TIER.build(name=platform_name)
 
-        cache.delete_many([followers_key, delta_key, last_updated_key])
+        cache.delete_many([followers_key, delta_key, last_updated_key, fetch_tier_key])
 
     @classmethod
     def _create_or_update_daily_metric(cls, platform_name: str, followers: int):
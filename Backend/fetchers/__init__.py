@@ -1,6 +1,21 @@
 from . import platforms
-from .utils import run_fetcher
+from .deadline import FetchTimeout
+from .platforms import *  # noqa: F401,F403
+from .resilience import FetchSkipped
+from .utils import (
+    call_fetcher,
+    get_fetcher,
+    record_fetch_tier,
+    run_fetcher,
+    run_fetcher_batch,
+)
 
 __all__ = platforms.__all__ + (
-    run_fetcher,
+    "FetchSkipped",
+    "FetchTimeout",
+    "call_fetcher",
+    "get_fetcher",
+    "record_fetch_tier",
+    "run_fetcher",
+    "run_fetcher_batch",
 )
@@ -1,15 +1,367 @@
+import asyncio
+import html
+import re
 import time
-from abc import ABC, abstractmethod
+from abc import ABC
+from contextlib import contextmanager
+from typing import NamedTuple
+from urllib.parse import urlencode, urlparse
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import requests
+from django.conf import settings
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from core.utils.logger import logger
+from fetchers.browser import DEFAULT_BLOCKED_URL_PATTERNS, browser_pool
+from fetchers.cdp import CDPError, async_browser
+from fetchers.deadline import deadline_timeout
+from fetchers.extraction import InPageExtractor
+from fetchers.http_client import http_client
+from fetchers.parsing import make_soup
+from fetchers.profiles import profile_key
+from fetchers.readiness import NetworkIdle, ReadyCondition
+from fetchers.replay import (
+    BROWSER_FIXTURE,
+    RECORD,
+    REPLAY,
+    FakeDriver,
+    fixture_store,
+    replay_browser,
+    replay_mode,
+    replay_server,
+)
+from fetchers.resilience import FetchSkipped, domain_rate_limiter
+from fetchers.snapshots import snapshot_store
+from fetchers.strategies import ParsedPage, strategy_memory, strategy_scope
+from fetchers.timing import NAVIGATION, PARSE, READINESS, TRANSFER, stage
+from fetchers.workers import PAGE_JOB, TABS_JOB, browser_workers
+
+HTTP_TIER = "http"
+BROWSER_TIER = "browser"
+
+META_TAG_RE = re.compile(r"<meta\s[^>]*>", re.IGNORECASE)
+META_KEY_RE = re.compile(r"""(?:property|name)\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+META_CONTENT_RE = re.compile(
+    r"""content\s*=\s*(["'])(.*?)\1""", re.IGNORECASE | re.DOTALL
+)
+
+# Errors that mean "this tier could not produce a count, try the next one".
+TIER_ERRORS = (ValueError, KeyError, requests.RequestException, WebDriverException)
+ASYNC_TIER_ERRORS = TIER_ERRORS + (CDPError, asyncio.TimeoutError, OSError)
+
+
+class RawPage(NamedTuple):
+    """A page one tier downloaded, not parsed yet (see BaseFetcher.fetch_page)."""
+
+    tier: str
+    url: str
+    source: str
 
 
 class BaseFetcher(ABC):
-    @abstractmethod
-    def fetch_followers_count(self) -> int: ...
+    # Ordered (tier, parser method name) pairs tried by fetch_followers_count.
+    # Cheap tiers go first; the browser should be the last resort.
+    fetch_strategies: tuple = ()
+
+    # Condition that signals the follower count has rendered, and how long
+    # to wait for it. Subclasses override these with something page-specific.
+    ready_condition: ReadyCondition = NetworkIdle()
+    ready_timeout: float = 15
+    ready_poll_interval: float = 0.2
+
+    # URL patterns the browser refuses to load for this fetcher. Extend the
+    # default tuple to block more; replace it if a page needs something it blocks.
+    blocked_url_patterns: tuple = DEFAULT_BLOCKED_URL_PATTERNS
+
+    # Optional extractor run inside the page so only the count text crosses the
+    # WebDriver wire; the full page_source parser is the fallback.
+    in_page_extractor: InPageExtractor = None
+
+    # Per-fetcher override for the HTTP tier's timeout; None uses HTTP_TIMEOUT.
+    http_timeout: float = None
+
+    # Hard limit for one whole fetch in run_fetcher; None uses FETCH_DEADLINE.
+    fetch_deadline: float = None
+
+    # HTML parser backend for this fetcher; None uses HTML_PARSER_BACKEND.
+    parser_backend: str = None
+
+    # Tier that produced the most recent successful count, if any.
+    last_fetch_tier: str = None
+
+    # Extraction strategy that found the most recent count, for parsers that
+    # use _extract_with_strategies.
+    last_strategy: str = None
+
+    # Most tabs fetch_followers_counts opens at once in one browser session,
+    # and the tier that served each URL of the latest batch.
+    batch_max_tabs: int = 4
+    last_batch_tiers: dict = None
+
+    # True when the fetcher takes rate-limiter tokens itself, one per request
+    # it sends, instead of run_fetcher taking one per platform.
+    rate_limits_own_requests: bool = False
+
+    def fetch_followers_count(self) -> int:
+        """
+        Try each of the fetcher's strategies in order and return the first count found.
+
+        Raises:
+            ValueError: If every tier failed to produce a count
+        """
+        if not self.fetch_strategies:
+            raise NotImplementedError(
+                f"{type(self).__name__} must define fetch_strategies "
+                f"or override fetch_followers_count()"
+            )
+
+        errors = []
+        for tier, parser_name in self.fetch_strategies:
+            try:
+                count = self._run_tier(tier, getattr(self, parser_name))
+            except TIER_ERRORS as e:
+                logger.debug(f"{type(self).__name__}: {tier} tier failed: {e}")
+                errors.append(f"{tier}: {e}")
+                continue
+            self.last_fetch_tier = tier
+            return count
+
+        raise ValueError(
+            f"{type(self).__name__} could not find a count ({'; '.join(errors)})"
+        )
+
+    def _run_tier(self, tier: str, parser, url: str = None) -> int:
+        url = url or self.platform_url
+        if tier == HTTP_TIER:
+            page_source = self._get_page_source_with_http(url)
+            with stage(PARSE):
+                return parser(page_source)
+        if tier == BROWSER_TIER:
+            if browser_workers.enabled:
+                return browser_workers.run(
+                    self, PAGE_JOB, [url], parser.__name__, self._browser_job_timeout()
+                )
+            return self._fetch_with_browser(url, parser)
+        raise ValueError(f"Unknown fetch tier: {tier!r}")
+
+    def _browser_job_timeout(self) -> float:
+        return deadline_timeout(
+            self.fetch_deadline or getattr(settings, "FETCH_DEADLINE", 90),
+            "start a browser job",
+        )
+
+    # ─────────────────────────────── Batches ──────────────────────────────────
+    @property
+    def supports_batch(self) -> bool:
+        """Whether fetch_followers_counts can share one browser session across URLs."""
+        return any(tier == BROWSER_TIER for tier, _ in self.fetch_strategies)
+
+    def fetch_followers_counts(self, urls) -> dict:
+        """
+        Fetch several profiles on this fetcher's site at once.
+
+        Cheap tiers are tried per URL first. Every URL they could not handle is
+        then opened as its own tab in a single pooled browser session, and counts
+        are extracted as each tab becomes ready, instead of paying one browser
+        lease and one serial page load per URL.
+
+        Returns:
+            dict: URL mapped to its count, or to the exception that prevented one.
+            ``last_batch_tiers`` maps each successful URL to the tier that served it.
+        """
+        if not self.supports_batch:
+            raise NotImplementedError(
+                f"{type(self).__name__} has no browser tier to batch"
+            )
+
+        results, errors = {}, {url: [] for url in urls}
+        self.last_batch_tiers = {}
+        browser_parser = None
+        for url in urls:
+            for tier, parser_name in self.fetch_strategies:
+                if tier == BROWSER_TIER:
+                    browser_parser = getattr(self, parser_name)
+                    continue
+                try:
+                    results[url] = self._run_tier(tier, getattr(self, parser_name), url)
+                except TIER_ERRORS as e:
+                    errors[url].append(f"{tier}: {e}")
+                    continue
+                self.last_batch_tiers[url] = tier
+                break
+
+        remaining = [url for url in urls if url not in results]
+        for start in range(0, len(remaining), self.batch_max_tabs):
+            chunk = remaining[start : start + self.batch_max_tabs]
+            if browser_workers.enabled:
+                outcomes = browser_workers.run(
+                    self,
+                    TABS_JOB,
+                    chunk,
+                    browser_parser.__name__,
+                    self._browser_job_timeout(),
+                )
+            else:
+                outcomes = self._fetch_tabs_with_browser(chunk, browser_parser)
+            for url, outcome in outcomes.items():
+                if isinstance(outcome, Exception):
+                    errors[url].append(f"{BROWSER_TIER}: {outcome}")
+                    results[url] = ValueError(
+                        f"{type(self).__name__} could not find a count "
+                        f"({'; '.join(errors[url])})"
+                    )
+                else:
+                    results[url] = outcome
+                    self.last_batch_tiers[url] = BROWSER_TIER
+        return results
+
+    def _fetch_tabs_with_browser(self, urls, parser) -> dict:
+        """
+        Open every URL in its own tab of one pooled session, then poll the tabs
+        round-robin and take each one's count as soon as it is ready.
+        """
+        if replay_mode() == REPLAY and replay_browser() == "fake":
+            # The fake driver has no tabs; replaying serially is still offline and fast.
+            results = {}
+            for url in urls:
+                try:
+                    results[url] = self._fetch_with_browser(url, parser)
+                except TIER_ERRORS as e:
+                    results[url] = e
+            return results
+
+        results, sources = {}, {}
+        try:
+            with browser_pool.session(
+                blocked_urls=self.blocked_url_patterns,
+                profile=self._browser_profile(urls[0]),
+            ) as driver:
+                home = driver.current_window_handle
+                pending = {}
+                with stage(NAVIGATION):
+                    for url in urls:
+                        driver.switch_to.new_window("tab")
+                        target = url
+                        if replay_mode() == REPLAY:
+                            target = replay_server.url_for(url, kind=BROWSER_FIXTURE)
+                        # Assigning location does not block like driver.get(), so
+                        # every tab loads at the same time.
+                        driver.execute_script(
+                            "window.location.href = arguments[0];", target
+                        )
+                        pending[driver.current_window_handle] = url
+
+                deadline = time.monotonic() + self.ready_timeout
+                while pending:
+                    timed_out = time.monotonic() >= deadline
+                    for handle, url in list(pending.items()):
+                        driver.switch_to.window(handle)
+                        if not (timed_out or self._tab_ready(driver)):
+                            continue
+                        if timed_out:
+                            logger.warning(
+                                f"{type(self).__name__}: {self.ready_condition!r} not met "
+                                f"within {self.ready_timeout}s for {url}"
+                            )
+                        del pending[handle]
+                        with stage(TRANSFER):
+                            count = self._extract_in_page(driver)
+                            if count is not None:
+                                results[url] = count
+                            else:
+                                sources[url] = driver.page_source
+                        if replay_mode() == RECORD:
+                            fixture_store.save(BROWSER_FIXTURE, url, driver.page_source)
+                        if snapshot_store.enabled and replay_mode() != REPLAY:
+                            snapshot_store.capture(
+                                url,
+                                BROWSER_TIER,
+                                driver.page_source,
+                                fetcher=type(self).__name__,
+                            )
+                        driver.close()
+                    if pending:
+                        time.sleep(self.ready_poll_interval)
+                driver.switch_to.window(home)
+        except TIER_ERRORS as e:
+            for url in urls:
+                if url not in results and url not in sources:
+                    results[url] = e
+
+        for url, page_source in sources.items():
+            try:
+                with stage(PARSE):
+                    results[url] = parser(page_source)
+            except TIER_ERRORS as e:
+                results[url] = e
+        return results
+
+    def _tab_ready(self, driver) -> bool:
+        try:
+            return bool(self.ready_condition(driver))
+        except WebDriverException:
+            return False
+
+    # ─────────────────────────────── Snapshots ────────────────────────────────
+    def snapshot_urls(self) -> tuple:
+        """URLs whose stored snapshots this fetcher knows how to re-parse."""
+        return (self.platform_url,)
+
+    def parse_snapshot(self, page_source: str, tier: str) -> int:
+        """Run the parser this fetcher uses for ``tier`` on a stored page."""
+        for strategy_tier, parser_name in self.fetch_strategies:
+            if strategy_tier == tier:
+                return getattr(self, parser_name)(page_source)
+        raise ValueError(f"{type(self).__name__} has no parser for the {tier} tier")
+
+    def reparse_latest_snapshot(self):
+        """
+        Parse the newest stored snapshot instead of fetching the page again.
+
+        Returns:
+            tuple: (snapshot record, parsed count)
+
+        Raises:
+            LookupError: If the store has no snapshot for this fetcher
+            ValueError: If the parser cannot find a count in it
+        """
+        for url in self.snapshot_urls():
+            record = snapshot_store.latest(url)
+            if record is not None:
+                page_source = snapshot_store.load(record["digest"])
+                return record, self.parse_snapshot(page_source, record["tier"])
+        raise LookupError(f"No stored snapshot for {', '.join(self.snapshot_urls())}")
+
+    # ─────────────────────────────── Staged fetches ───────────────────────────
+    @property
+    def defers_parsing(self) -> bool:
+        """
+        Whether a refresh may call :meth:`fetch_page` and :meth:`parse_snapshot`
+        tier by tier instead of fetch_followers_count, parsing somewhere else.
+        """
+        return (
+            bool(self.fetch_strategies)
+            and type(self).fetch_followers_count is BaseFetcher.fetch_followers_count
+        )
+
+    def fetch_page(self, tier: str, url: str = None):
+        """
+        Run one tier of fetch_followers_count without parsing what it downloaded.
+
+        Returns:
+            RawPage for :meth:`parse_snapshot`, or the count itself when the
+            tier got it without a parse (in-page extraction, or a browser worker
+            process that parsed next to its browser)
+        """
+        url = url or self.platform_url
+        if tier == BROWSER_TIER and browser_workers.enabled:
+            return self._run_tier(
+                tier, getattr(self, dict(self.fetch_strategies)[tier]), url
+            )
+        return self._run_tier(
+            tier, lambda page_source: RawPage(tier, url, page_source), url
+        )
 
     @staticmethod
     def _parse_count(count_str: str) -> int:
@@ -28,26 +380,400 @@ class BaseFetcher(ABC):
 
         raise ValueError(f"Unrecognized count: {count_str!r}")
 
-    @staticmethod
-    def _get_page_source_with_browser(url: str, user_agent: str = None) -> str:
-        """Fetches the page source using a headless browser to handle dynamic content."""
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
+    def _make_soup(self, page_source: str, parse_only=None):
+        """Build a soup with this fetcher's parser backend, optionally limited by a SoupStrainer."""
+        return make_soup(
+            page_source, parse_only=parse_only, backend=self.parser_backend
+        )
 
-        default_user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0 Safari/537.36"
-        options.add_argument(f"user-agent={user_agent or default_user_agent}")
+    def _extract_with_strategies(self, page_source: str, strategies) -> int:
+        """
+        Run named extraction strategies until one returns a count.
 
-        options.add_argument("accept-language=en-US,en;q=0.9")
+        Each strategy is a method taking a :class:`ParsedPage` and raising
+        ValueError when it finds nothing. They are tried in the order strategy
+        memory expects to be cheapest for this platform, and the outcome is
+        recorded for the next fetch.
 
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+        Raises:
+            ValueError: If no strategy found a count
+        """
+        page = ParsedPage(self, page_source)
+        scope = strategy_scope(self)
+        outcomes, errors = [], []
+        for name in strategy_memory.order(scope, strategies):
+            start = time.perf_counter()
+            try:
+                count = getattr(self, name)(page)
+            except ValueError as e:
+                outcomes.append((name, (time.perf_counter() - start) * 1000, False))
+                errors.append(f"{name}: {e}")
+                continue
+            outcomes.append((name, (time.perf_counter() - start) * 1000, True))
+            strategy_memory.record(scope, outcomes, winner=name)
+            self.last_strategy = name
+            return count
 
+        strategy_memory.record(scope, outcomes)
+        raise ValueError(f"No extraction strategy found a count ({'; '.join(errors)})")
+
+    @staticmethod
+    def _meta_contents(page_source: str) -> dict:
+        """
+        Map meta tag names/properties (e.g. 'og:description') to their content,
+        using regexes over the raw HTML rather than building a DOM.
+        """
+        contents = {}
+        for tag in META_TAG_RE.findall(page_source):
+            key = META_KEY_RE.search(tag)
+            content = META_CONTENT_RE.search(tag)
+            if key and content:
+                contents.setdefault(
+                    key.group(1).lower(), html.unescape(content.group(2))
+                )
+        return contents
+
+    def _get_page_source_with_http(self, url: str, user_agent: str = None) -> str:
+        """Fetches the server-rendered page source with a plain HTTP GET."""
+        kwargs = {}
+        if user_agent:
+            kwargs["headers"] = {"User-Agent": user_agent}
+        if self.http_timeout:
+            kwargs["timeout"] = self.http_timeout
+        response = http_client.get(url, **kwargs)
+        response.raise_for_status()
+        return response.text
+
+    def _wait_until_ready(self, driver) -> bool:
+        """
+        Block until the fetcher's readiness condition holds or its deadline passes.
+        Returns False on timeout so the caller can still try to parse what rendered.
+        """
+        try:
+            WebDriverWait(
+                driver, self.ready_timeout, poll_frequency=self.ready_poll_interval
+            ).until(self.ready_condition)
+            return True
+        except TimeoutException:
+            logger.warning(
+                f"{type(self).__name__}: {self.ready_condition!r} not met "
+                f"within {self.ready_timeout}s"
+            )
+            return False
+
+    def _extract_in_page(self, driver):
+        """Run the in-page extractor; return the parsed count, or None to fall back."""
+        if self.in_page_extractor is None:
+            return None
         try:
+            count_text = self.in_page_extractor(driver)
+            if count_text:
+                return self._parse_count(count_text)
+        except (WebDriverException, ValueError) as e:
+            logger.debug(
+                f"{type(self).__name__}: {self.in_page_extractor!r} failed: {e}"
+            )
+        return None
+
+    @staticmethod
+    def _browser_profile(url: str):
+        """
+        Persistent browser profile to load ``url`` with: its site's, so cached
+        assets and consent cookies are reused. Replayed fetches get a clean one.
+        """
+        if replay_mode() == REPLAY:
+            return None
+        return profile_key(urlparse(url).hostname)
+
+    @contextmanager
+    def _loaded_page(self, url: str, user_agent: str = None):
+        """
+        Yield a driver that has loaded ``url`` and waited for readiness: a pooled
+        browser normally, a file-backed FakeDriver in replay mode. In record mode
+        the rendered page is saved as a fixture, and with FETCH_SNAPSHOTS_ENABLED
+        it is kept in the snapshot store.
+        """
+        mode = replay_mode()
+        if mode == REPLAY and replay_browser() == "fake":
+            driver = FakeDriver(fixture_store)
             driver.get(url)
-            # A generic wait for page to load, can be customized in subclasses if needed
-            time.sleep(5)
-            return driver.page_source
-        finally:
-            driver.quit()
+            yield driver
+            return
+        with browser_pool.session(
+            user_agent=user_agent,
+            blocked_urls=self.blocked_url_patterns,
+            profile=self._browser_profile(url),
+        ) as driver:
+            with stage(NAVIGATION):
+                if mode == REPLAY:
+                    driver.get(replay_server.url_for(url, kind=BROWSER_FIXTURE))
+                else:
+                    driver.get(url)
+            with stage(READINESS):
+                self._wait_until_ready(driver)
+            if mode == RECORD:
+                fixture_store.save(BROWSER_FIXTURE, url, driver.page_source)
+            if snapshot_store.enabled and mode != REPLAY:
+                # Costs a page_source transfer even when the count is read in-page.
+                snapshot_store.capture(
+                    url, BROWSER_TIER, driver.page_source, fetcher=type(self).__name__
+                )
+            yield driver
+
+    def _fetch_with_browser(self, url: str, parser) -> int:
+        """
+        Load the page in a pooled browser and extract the count in-page when the
+        fetcher declares an extractor, otherwise parse the full page source.
+        """
+        with self._loaded_page(url) as driver:
+            with stage(TRANSFER):
+                count = self._extract_in_page(driver)
+                if count is not None:
+                    return count
+                page_source = driver.page_source
+        with stage(PARSE):
+            return parser(page_source)
+
+
+class AsyncBaseFetcher(BaseFetcher):
+    """
+    Fetcher whose ``fetch_followers_count`` is a coroutine.
+
+    Subclasses declare ``fetch_strategies``, ``ready_condition`` and
+    ``in_page_extractor`` exactly as for :class:`BaseFetcher`. The HTTP tier
+    still goes through the shared requests session (on a thread); the browser
+    tier drives a tab of the process-wide CDP browser, so many async fetches
+    load pages at once on one event loop instead of holding a thread and a
+    pooled WebDriver session each.
+    """
+
+    # Concurrent async fetches already share one browser; no need to batch them.
+    supports_batch = False
+
+    async def fetch_followers_count(self) -> int:
+        """
+        Try each of the fetcher's strategies in order and return the first count found.
+
+        Raises:
+            ValueError: If every tier failed to produce a count
+        """
+        if not self.fetch_strategies:
+            raise NotImplementedError(
+                f"{type(self).__name__} must define fetch_strategies "
+                f"or override fetch_followers_count()"
+            )
+
+        errors = []
+        for tier, parser_name in self.fetch_strategies:
+            try:
+                count = await self._run_tier_async(tier, getattr(self, parser_name))
+            except ASYNC_TIER_ERRORS as e:
+                logger.debug(f"{type(self).__name__}: {tier} tier failed: {e}")
+                errors.append(f"{tier}: {e}")
+                continue
+            self.last_fetch_tier = tier
+            return count
+
+        raise ValueError(
+            f"{type(self).__name__} could not find a count ({'; '.join(errors)})"
+        )
+
+    async def _run_tier_async(self, tier: str, parser, url: str = None) -> int:
+        url = url or self.platform_url
+        if tier == HTTP_TIER:
+            page_source = await asyncio.to_thread(self._get_page_source_with_http, url)
+            with stage(PARSE):
+                return await asyncio.to_thread(parser, page_source)
+        if tier == BROWSER_TIER:
+            if replay_mode() == REPLAY and replay_browser() == "fake":
+                # The fake driver only reads fixture files; no browser to drive.
+                return await asyncio.to_thread(self._fetch_with_browser, url, parser)
+            return await self._fetch_with_cdp(url, parser)
+        raise ValueError(f"Unknown fetch tier: {tier!r}")
+
+    async def _fetch_with_cdp(self, url: str, parser) -> int:
+        """
+        Load the page in a CDP tab and extract the count in-page when the fetcher
+        declares an extractor, otherwise parse the full page source. Fixtures and
+        snapshots are saved as in :meth:`BaseFetcher._loaded_page`.
+        """
+        mode = replay_mode()
+        page_source = None
+        async with async_browser.page(blocked_urls=self.blocked_url_patterns) as page:
+            with stage(NAVIGATION):
+                if mode == REPLAY:
+                    await page.navigate(
+                        replay_server.url_for(url, kind=BROWSER_FIXTURE)
+                    )
+                else:
+                    await page.navigate(url)
+            with stage(READINESS):
+                await self._wait_until_ready_async(page)
+            if mode == RECORD or (snapshot_store.enabled and mode != REPLAY):
+                page_source = await page.content()
+                if mode == RECORD:
+                    await asyncio.to_thread(
+                        fixture_store.save, BROWSER_FIXTURE, url, page_source
+                    )
+                if mode != REPLAY:
+                    await asyncio.to_thread(
+                        snapshot_store.capture,
+                        url,
+                        BROWSER_TIER,
+                        page_source,
+                        fetcher=type(self).__name__,
+                    )
+            with stage(TRANSFER):
+                count = await self._extract_in_page_async(page)
+                if count is not None:
+                    return count
+                if page_source is None:
+                    page_source = await page.content()
+        with stage(PARSE):
+            return await asyncio.to_thread(parser, page_source)
+
+    async def _wait_until_ready_async(self, page) -> bool:
+        """Poll the readiness condition on the page; False once ready_timeout has passed."""
+        deadline = time.monotonic() + self.ready_timeout
+        while True:
+            try:
+                if await self.ready_condition.check_async(page):
+                    return True
+            except CDPError:
+                # The document is still being replaced by the navigation.
+                if page.connection.closed:
+                    raise
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    f"{type(self).__name__}: {self.ready_condition!r} not met "
+                    f"within {self.ready_timeout}s"
+                )
+                return False
+            await asyncio.sleep(self.ready_poll_interval)
+
+    async def _extract_in_page_async(self, page):
+        """Run the in-page extractor; return the parsed count, or None to fall back."""
+        if self.in_page_extractor is None:
+            return None
+        try:
+            count_text = await self.in_page_extractor.extract_async(page)
+            if count_text:
+                return self._parse_count(count_text)
+        except (CDPError, ValueError) as e:
+            logger.debug(
+                f"{type(self).__name__}: {self.in_page_extractor!r} failed: {e}"
+            )
+        return None
+
+
+class BatchApiFetcher(BaseFetcher):
+    """
+    Fetcher for an official API that returns counts for many accounts in one call.
+
+    Subclasses name the endpoint, how to read an account ID from a page URL and
+    how to read counts from a response. :meth:`fetch_followers_counts` then
+    sends one request per ``batch_size`` IDs instead of one per platform; the
+    orchestrator and the Celery fan-out group platforms sharing such a fetcher
+    into one run_fetcher_batch call, which splits the answer back out.
+    """
+
+    # Most account IDs the endpoint accepts in one request.
+    batch_size: int = 50
+
+    # Query parameter carrying the comma-separated IDs.
+    batch_id_param: str = "ids"
+
+    # One token per API request, taken on the API's host.
+    rate_limits_own_requests = True
+
+    supports_batch = True
+
+    def __init__(self, url: str):
+        self.platform_url = url
+
+    @property
+    def batch_api_url(self) -> str:
+        raise NotImplementedError(f"{type(self).__name__} must define batch_api_url")
+
+    def account_id(self, url: str) -> str:
+        """
+        The ID the API knows the account behind ``url`` by (default: the last
+        path segment).
+
+        Raises:
+            ValueError: If the URL does not identify an account
+        """
+        account = url.rstrip("/").split("/")[-1]
+        if not account:
+            raise ValueError(f"No account ID in {url}")
+        return account
+
+    def _batch_params(self) -> dict:
+        """Query parameters sent with every batch besides the IDs."""
+        return {}
+
+    def _batch_headers(self) -> dict:
+        return {}
+
+    def _parse_batch(self, data) -> dict:
+        """Map each account ID found in one decoded response to its count."""
+        raise NotImplementedError(f"{type(self).__name__} must define _parse_batch")
+
+    def fetch_followers_count(self) -> int:
+        outcome = self.fetch_followers_counts([self.platform_url])[self.platform_url]
+        if isinstance(outcome, Exception):
+            raise outcome
+        self.last_fetch_tier = HTTP_TIER
+        return outcome
+
+    def fetch_followers_counts(self, urls) -> dict:
+        """
+        Fetch the counts of every URL's account, ``batch_size`` IDs per request.
+
+        Returns:
+            dict: URL mapped to its count, or to the exception that prevented one.
+        """
+        results, ids = {}, {}
+        for url in urls:
+            try:
+                ids[url] = self.account_id(url)
+            except ValueError as e:
+                results[url] = e
+
+        accounts = list(dict.fromkeys(ids.values()))
+        counts = {}
+        for start in range(0, len(accounts), self.batch_size):
+            chunk = accounts[start : start + self.batch_size]
+            try:
+                counts.update(self._request_batch(chunk))
+            except TIER_ERRORS + (FetchSkipped,) as e:
+                logger.warning(
+                    f"{type(self).__name__}: batch of {len(chunk)} failed: {e}"
+                )
+                counts.update({account: e for account in chunk})
+
+        for url, account in ids.items():
+            results[url] = counts.get(
+                account, ValueError(f"{type(self).__name__}: no count for {account!r}")
+            )
+        self.last_batch_tiers = {
+            url: HTTP_TIER
+            for url, outcome in results.items()
+            if not isinstance(outcome, Exception)
+        }
+        return results
+
+    def _request_batch(self, account_ids) -> dict:
+        # IDs go in the URL itself so fixtures and snapshots are kept per chunk.
+        params = {**self._batch_params(), self.batch_id_param: ",".join(account_ids)}
+        url = f"{self.batch_api_url}?{urlencode(params)}"
+        if replay_mode() != REPLAY:
+            domain_rate_limiter.acquire(urlparse(url).hostname or "")
+
+        kwargs = {"headers": self._batch_headers()}
+        if self.http_timeout:
+            kwargs["timeout"] = self.http_timeout
+        response = http_client.get(url, **kwargs)
+        response.raise_for_status()
+        with stage(PARSE):
+            return self._parse_batch(response.json())
@@ -0,0 +1,501 @@
+"""
+Headless Chrome session management for the browser-based fetchers.
+
+Each worker process keeps a small pool of warm WebDriver sessions instead of
+launching a new Chrome for every fetch. Sessions are health-checked before
+they are handed out and recycled after a number of pages or once the browser
+process tree grows past a memory limit. Sessions leased for a domain run on
+that domain's persistent profile (see :mod:`fetchers.profiles`), so its disk
+cache and cookies carry over between launches. With ``BROWSER_REMOTE_URLS``
+the sessions are opened on remote browser nodes instead (see
+:mod:`fetchers.remote`).
+"""
+
+import atexit
+import functools
+import os
+import shutil
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from core.utils.logger import logger
+from fetchers.deadline import current_cancel_scope
+from fetchers.profiles import profile_store
+from fetchers.remote import remote_nodes
+from fetchers.timing import DRIVER_STARTUP, stage
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/115.0 Safari/537.36"
+)
+DEFAULT_ACCEPT_LANGUAGE = "en-US,en;q=0.9"
+
+# URL patterns (Network.setBlockedURLs wildcard syntax) that no fetcher needs:
+# images, media, fonts, stylesheets and well-known ad/analytics hosts.
+#
+# Resource types are matched by extension on purpose. CDP's Fetch domain can
+# block by resourceType (Image, Media, Font, Stylesheet), but it pauses every
+# matching request until the client answers its Fetch.requestPaused event, and
+# Selenium's execute_cdp_cmd cannot receive events, so those requests would
+# hang. Network.setBlockedURLs needs no listener and is applied per lease.
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.ico",
+    "*.mp4",
+    "*.webm",
+    "*.m3u8",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.css",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*connect.facebook.net*",
+    "*analytics.tiktok.com*",
+    "*ads-twitter.com*",
+    "*scorecardresearch.com*",
+    "*hotjar.com*",
+)
+
+# Environment variable stamped on every chromedriver (and inherited by its
+# Chrome children) with the pid of the process that launched it, so browsers
+# whose owner died can be found and killed.
+BROWSER_OWNER_ENV = "FOLLOWER_DASHBOARD_BROWSER_OWNER"
+
+
+@functools.lru_cache(maxsize=1)
+def resolve_chromedriver_path() -> str:
+    """
+    Resolve the chromedriver binary once per process.
+
+    Prefers an explicitly configured path, then a chromedriver already on PATH,
+    and only falls back to webdriver-manager (which may hit the network) when
+    neither is available.
+    """
+    configured = getattr(settings, "CHROMEDRIVER_PATH", "")
+    if configured:
+        return configured
+
+    on_path = shutil.which("chromedriver")
+    if on_path:
+        return on_path
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    path = ChromeDriverManager().install()
+    logger.info(f"Resolved chromedriver via webdriver-manager: {path}")
+    return path
+
+
+def _process_tree(pid: int) -> list:
+    """
+    Return a process and all of its descendants, parents first.
+    Reads /proc directly, so it returns just ``[pid]`` without procfs.
+    """
+    tree = []
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        try:
+            with open(f"/proc/{current}/task/{current}/children") as children:
+                pending.extend(int(child) for child in children.read().split())
+        except (OSError, ValueError):
+            continue
+    return tree
+
+
+def _process_tree_rss_mb(pid: int) -> float:
+    """Return the resident memory (MB) of a process and all of its descendants."""
+    total_kb = 0
+    for current in _process_tree(pid):
+        try:
+            with open(f"/proc/{current}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def reap_orphaned_browsers() -> int:
+    """
+    SIGKILL chromedriver/Chrome processes we launched whose owning process no
+    longer exists (a crashed worker, a SIGKILLed Celery child). Only processes
+    carrying BROWSER_OWNER_ENV are touched. Returns how many were killed.
+    """
+    marker = f"{BROWSER_OWNER_ENV}=".encode()
+    killed = 0
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/environ", "rb") as environ:
+                variables = environ.read().split(b"\0")
+        except OSError:
+            continue
+        owner = next(
+            (v[len(marker) :] for v in variables if v.startswith(marker)), None
+        )
+        if owner is None or not owner.isdigit() or _pid_alive(int(owner)):
+            continue
+        try:
+            os.kill(int(entry), signal.SIGKILL)
+            killed += 1
+        except OSError:
+            continue
+    if killed:
+        logger.warning(f"Killed {killed} orphaned browser process(es)")
+    return killed
+
+
+class PooledDriver:
+    """A WebDriver session plus the bookkeeping needed to decide when to recycle it."""
+
+    def __init__(self, driver: webdriver.Chrome, profile=None, node: str = None):
+        self.driver = driver
+        # ProfileLease of the persistent profile this browser runs on, if any.
+        self.profile = profile
+        # Remote node URL the session lives on; None for a local Chrome.
+        self.node = node
+        self.pages_served = 0
+        self.created_at = time.monotonic()
+
+    @property
+    def profile_key(self):
+        return self.profile.key if self.profile else None
+
+    @property
+    def pid(self):
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        return process.pid if process else None
+
+    def is_healthy(self) -> bool:
+        """Cheap round-trip to make sure the browser is still responsive."""
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def memory_mb(self) -> float:
+        return _process_tree_rss_mb(self.pid) if self.pid else 0.0
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error while quitting pooled browser: {e}")
+        self._release_leases()
+
+    def _release_leases(self):
+        if self.profile is not None:
+            self.profile.release()
+        if self.node is not None:
+            remote_nodes.release(self.node)
+            self.node = None
+
+    def kill(self):
+        """
+        SIGKILL chromedriver and every Chrome process under it. Used to cancel a
+        fetch that is stuck inside a WebDriver call, which quit() would wait on.
+        A remote session is deleted on its node instead, which fails the stuck call.
+        """
+        if self.node is not None:
+            threading.Thread(target=self.quit, name="remote-quit", daemon=True).start()
+            logger.warning(f"Ending remote browser session on {self.node}")
+            return
+        if not self.pid:
+            return
+        for pid in _process_tree(self.pid):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                continue
+        self._release_leases()
+        logger.warning(f"Killed pooled browser process tree (pid={self.pid})")
+
+
+class BrowserPool:
+    """
+    Process-local pool of headless Chrome sessions.
+
+    The pool never holds more than ``max_size`` sessions (idle or in use).
+    Callers block in :meth:`session` until a slot is free. An idle session on
+    the requested profile is preferred; when a new one must be launched and the
+    pool is full, the least recently used idle session is recycled.
+    """
+
+    def __init__(self, max_size: int, max_pages: int, max_memory_mb: int):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        # Least recently used first; guarded by _lock.
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._live = set()
+
+    def _ensure_process(self):
+        # Sessions must never be shared across a fork (Celery prefork children),
+        # so a pool inherited from the parent starts over empty.
+        if self._pid != os.getpid():
+            self._reset()
+
+    @staticmethod
+    def build_options() -> Options:
+        """Chrome options shared by every pooled session."""
+        options = Options()
+        # Return from driver.get() at DOMContentLoaded; readiness is decided
+        # by each fetcher's own condition rather than the full load event.
+        options.page_load_strategy = "eager"
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument(f"user-agent={DEFAULT_USER_AGENT}")
+        options.add_argument(f"accept-language={DEFAULT_ACCEPT_LANGUAGE}")
+        # Batched fetches load several background tabs at once; keep them at full speed.
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-backgrounding-occluded-windows")
+        options.add_argument("--disable-renderer-backgrounding")
+
+        if getattr(settings, "BROWSER_LEAN_MODE", True):
+            # We only ever read text, so skip everything that exists to be seen or heard.
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--mute-audio")
+            options.add_argument("--disable-background-networking")
+            options.add_argument(
+                "--disable-features=Translate,MediaRouter,OptimizationHints"
+            )
+            options.add_argument("--renderer-process-limit=2")
+            renderer_mb = getattr(settings, "BROWSER_RENDERER_MAX_MEMORY_MB", 512)
+            options.add_argument(f"--js-flags=--max-old-space-size={renderer_mb}")
+            options.add_experimental_option(
+                "prefs",
+                {
+                    "profile.managed_default_content_settings.images": 2,
+                    "profile.default_content_setting_values.notifications": 2,
+                },
+            )
+        return options
+
+    def _launch(self, profile: str = None) -> PooledDriver:
+        if remote_nodes.enabled:
+            return self._launch_remote()
+        lease = profile_store.lease(profile) if profile else None
+        options = self.build_options()
+        if lease is not None:
+            for argument in lease.chrome_arguments(profile_store.cache_mb):
+                options.add_argument(argument)
+        with stage(DRIVER_STARTUP):
+            service = Service(
+                resolve_chromedriver_path(),
+                env={**os.environ, BROWSER_OWNER_ENV: str(os.getpid())},
+            )
+            try:
+                driver = webdriver.Chrome(service=service, options=options)
+                # Needed once per session so Network.setBlockedURLs takes effect.
+                driver.execute_cdp_cmd("Network.enable", {})
+            except BaseException:
+                if lease is not None:
+                    lease.release()
+                raise
+        pooled = PooledDriver(driver, profile=lease)
+        with self._lock:
+            self._live.add(pooled)
+        logger.debug(f"Launched pooled browser (pid={pooled.pid})")
+        return pooled
+
+    def _launch_remote(self) -> PooledDriver:
+        # Profiles live on the nodes' disks, so remote sessions never get one.
+        with stage(DRIVER_STARTUP):
+            driver, node = remote_nodes.open_session(self.build_options())
+            pooled = PooledDriver(driver, node=node)
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+            except BaseException:
+                pooled.quit()
+                raise
+        with self._lock:
+            self._live.add(pooled)
+        logger.debug(f"Leased remote browser on {node}")
+        return pooled
+
+    def _discard(self, pooled: PooledDriver, reason: str):
+        logger.info(f"Recycling pooled browser (pid={pooled.pid}): {reason}")
+        with self._lock:
+            self._live.discard(pooled)
+        pooled.quit()
+
+    def _recycle_reason(self, pooled: PooledDriver):
+        if pooled.pages_served >= self.max_pages:
+            return f"served {pooled.pages_served} pages"
+        memory = pooled.memory_mb()
+        if memory > self.max_memory_mb:
+            return f"using {memory:.0f} MB"
+        return None
+
+    def _checkout(self, profile: str = None) -> PooledDriver:
+        while True:
+            pooled = self._take_idle(profile)
+            if pooled is None:
+                return self._launch(profile)
+            if pooled.is_healthy():
+                return pooled
+            self._discard(pooled, "failed health check")
+
+    def _take_idle(self, profile: str = None):
+        """Pop the newest idle session on ``profile``, making room if there is none."""
+        with self._lock:
+            for index in range(len(self._idle) - 1, -1, -1):
+                if self._idle[index].profile_key == profile:
+                    return self._idle.pop(index)
+            evict = None
+            if self._idle and len(self._live) >= self.max_size:
+                evict = self._idle.pop(0)
+        if evict is not None:
+            self._discard(evict, f"making room for the {profile or 'default'} profile")
+        return None
+
+    def _checkin(self, pooled: PooledDriver):
+        reason = self._recycle_reason(pooled)
+        if reason:
+            self._discard(pooled, reason)
+            return
+        try:
+            # Drop the previous page so an idle session does not keep its DOM alive.
+            pooled.driver.get("about:blank")
+        except WebDriverException as e:
+            self._discard(pooled, f"reset failed: {e}")
+            return
+        with self._lock:
+            self._idle.append(pooled)
+
+    @contextmanager
+    def session(
+        self,
+        user_agent: str = None,
+        blocked_urls=DEFAULT_BLOCKED_URL_PATTERNS,
+        profile: str = None,
+    ):
+        """
+        Lease a warm WebDriver for the duration of the ``with`` block.
+
+        ``blocked_urls`` are applied through CDP (``Network.setBlockedURLs``)
+        for this lease only, since a pooled session is shared by fetchers with
+        different needs. ``profile``
+        (a domain, see :func:`fetchers.profiles.profile_key`) asks for a browser
+        running on that domain's persistent profile. A session that raises a
+        WebDriver error, or was killed by a fetch deadline, is discarded rather
+        than returned to the pool.
+        """
+        self._ensure_process()
+        if not profile_store.enabled or remote_nodes.enabled:
+            profile = None
+        scope = current_cancel_scope()
+        with self._slots:
+            pooled = self._checkout(profile)
+            try:
+                if scope is not None:
+                    # Lets a deadline kill this browser if the fetch hangs in it.
+                    scope.register(pooled)
+                pooled.driver.execute_cdp_cmd(
+                    "Network.setUserAgentOverride",
+                    {
+                        "userAgent": user_agent or DEFAULT_USER_AGENT,
+                        "acceptLanguage": DEFAULT_ACCEPT_LANGUAGE,
+                    },
+                )
+                pooled.driver.execute_cdp_cmd(
+                    "Network.setBlockedURLs", {"urls": list(blocked_urls or ())}
+                )
+                yield pooled.driver
+            except WebDriverException:
+                self._discard(pooled, "WebDriver error during fetch")
+                raise
+            except BaseException:
+                if scope is not None and scope.cancelled:
+                    self._discard(pooled, "killed by fetch deadline")
+                else:
+                    self._checkin(pooled)
+                raise
+            else:
+                pooled.pages_served += 1
+                self._checkin(pooled)
+            finally:
+                if scope is not None:
+                    scope.unregister(pooled)
+
+    def stats(self) -> dict:
+        with self._lock:
+            live = len(self._live)
+            idle = len(self._idle)
+            profiles = sorted({p.profile_key for p in self._live if p.profile_key})
+        stats = {
+            "live": live,
+            "idle": idle,
+            "max_size": self.max_size,
+            "profiles": profiles,
+        }
+        if remote_nodes.enabled:
+            stats["remote_nodes"] = remote_nodes.stats()
+        return stats
+
+    def close(self):
+        """Quit every session owned by this process."""
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            live, self._live = self._live, set()
+        for pooled in live:
+            pooled.quit()
+        with self._lock:
+            self._idle = []
+
+
+browser_pool = BrowserPool(
+    max_size=getattr(settings, "BROWSER_POOL_SIZE", 2),
+    max_pages=getattr(settings, "BROWSER_MAX_PAGES_PER_SESSION", 50),
+    max_memory_mb=getattr(settings, "BROWSER_MAX_MEMORY_MB", 1024),
+)
+
+atexit.register(browser_pool.close)
@@ -0,0 +1,352 @@
+"""
+Native asyncio client for the Chrome DevTools Protocol.
+
+Selenium blocks a thread for every page it drives. This client talks CDP
+straight over a websocket, so one event loop can drive many tabs of one
+headless Chrome at the same time. Async fetchers (see ``AsyncBaseFetcher``)
+use it through :data:`async_browser`.
+
+* Chrome is launched once per OS process with the same flags as the Selenium
+  pool, and it survives across event loops.
+* Each event loop opens its own websocket connection to Chrome, since asyncio
+  streams are bound to the loop that created them.
+* :meth:`AsyncBrowser.page` hands out a fresh tab (a CDP target attached in
+  flat session mode), bounded by ``ASYNC_BROWSER_MAX_PAGES`` per loop.
+
+The websocket framing uses ``wsproto``.
+"""
+
+import asyncio
+import atexit
+import itertools
+import json
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+
+from django.conf import settings
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (
+    AcceptConnection,
+    CloseConnection,
+    Ping,
+    RejectConnection,
+    Request,
+    TextMessage,
+)
+
+from core.utils.logger import logger
+from fetchers.browser import (
+    BROWSER_OWNER_ENV,
+    DEFAULT_ACCEPT_LANGUAGE,
+    DEFAULT_BLOCKED_URL_PATTERNS,
+    DEFAULT_USER_AGENT,
+    BrowserPool,
+    _process_tree,
+)
+
+CHROME_CANDIDATES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+)
+
+
+class CDPError(Exception):
+    """Chrome answered a CDP command with an error, or the connection dropped."""
+
+
+def resolve_chrome_binary() -> str:
+    configured = getattr(settings, "CHROME_BINARY", "")
+    if configured:
+        return configured
+    for candidate in CHROME_CANDIDATES:
+        path = shutil.which(candidate)
+        if path:
+            return path
+    raise CDPError("No Chrome binary found; set CHROME_BINARY")
+
+
+class CDPConnection:
+    """One websocket to Chrome's browser endpoint, multiplexing every attached tab."""
+
+    def __init__(self, reader, writer, ws: WSConnection):
+        self._reader = reader
+        self._writer = writer
+        self._ws = ws
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, ws_url: str) -> "CDPConnection":
+        parsed = urlparse(ws_url)
+        reader, writer = await asyncio.open_connection(parsed.hostname, parsed.port)
+        ws = WSConnection(ConnectionType.CLIENT)
+        writer.write(ws.send(Request(host=parsed.netloc, target=parsed.path)))
+        await writer.drain()
+
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                raise CDPError(
+                    "Chrome closed the DevTools connection during the handshake"
+                )
+            ws.receive_data(data)
+            for event in ws.events():
+                if isinstance(event, AcceptConnection):
+                    return cls(reader, writer, ws)
+                if isinstance(event, RejectConnection):
+                    raise CDPError(
+                        f"Chrome rejected the DevTools connection ({event.status_code})"
+                    )
+
+    async def _read_loop(self):
+        parts = []
+        try:
+            while True:
+                data = await self._reader.read(1 << 20)
+                if not data:
+                    break
+                self._ws.receive_data(data)
+                for event in self._ws.events():
+                    if isinstance(event, TextMessage):
+                        parts.append(event.data)
+                        if event.message_finished:
+                            self._dispatch(json.loads("".join(parts)))
+                            parts = []
+                    elif isinstance(event, Ping):
+                        self._writer.write(self._ws.send(event.response()))
+                    elif isinstance(event, CloseConnection):
+                        self._writer.write(self._ws.send(event.response()))
+                        return
+        except (OSError, asyncio.IncompleteReadError) as e:
+            logger.debug(f"DevTools connection lost: {e}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("DevTools connection closed"))
+            self._pending.clear()
+
+    def _dispatch(self, message: dict):
+        # Events (no "id") are not needed: fetchers poll page state instead.
+        future = self._pending.pop(message.get("id"), None)
+        if future is None or future.done():
+            return
+        if "error" in message:
+            future.set_exception(CDPError(f"{message['error'].get('message')}"))
+        else:
+            future.set_result(message.get("result", {}))
+
+    async def send(
+        self, method: str, params: dict = None, session_id: str = None
+    ) -> dict:
+        if self._reader_task.done():
+            raise CDPError("DevTools connection closed")
+        message_id = next(self._ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        self._writer.write(self._ws.send(TextMessage(data=json.dumps(message))))
+        await self._writer.drain()
+        return await future
+
+    @property
+    def closed(self) -> bool:
+        return self._reader_task.done()
+
+    async def close(self):
+        if not self._reader_task.done():
+            try:
+                self._writer.write(self._ws.send(CloseConnection(code=1000)))
+                await self._writer.drain()
+            except (OSError, RuntimeError):
+                pass
+            self._reader_task.cancel()
+        self._writer.close()
+
+
+class AsyncPage:
+    """One tab, driven through a flat CDP session on the shared connection."""
+
+    def __init__(self, connection: CDPConnection, target_id: str, session_id: str):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    async def send(self, method: str, params: dict = None) -> dict:
+        return await self.connection.send(method, params, session_id=self.session_id)
+
+    async def navigate(self, url: str):
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+
+    async def execute_script(self, script: str, *args):
+        """Same contract as Selenium's execute_script: a function body using ``arguments``."""
+        expression = (
+            f"(function() {{ {script} }}).apply(null, {json.dumps(list(args))})"
+        )
+        result = await self.send(
+            "Runtime.evaluate",
+            {"expression": expression, "returnByValue": True, "awaitPromise": True},
+        )
+        if "exceptionDetails" in result:
+            raise CDPError(f"Script failed: {result['exceptionDetails'].get('text')}")
+        return result.get("result", {}).get("value")
+
+    async def content(self) -> str:
+        return await self.execute_script("return document.documentElement.outerHTML;")
+
+
+class AsyncBrowser:
+    """Process-wide headless Chrome, driven over CDP from any number of event loops."""
+
+    def __init__(self, max_pages: int):
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._process = None
+        self._profile_dir = None
+        self._ws_url = None
+        self._pid = None
+        self._loops = weakref.WeakKeyDictionary()
+
+    # ─────────────────────────────── Chrome process ───────────────────────────
+    def _ensure_chrome(self) -> str:
+        """Launch Chrome if this process has none running. Blocking; returns the ws URL."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Never reuse a Chrome inherited across fork.
+                self._process, self._ws_url, self._pid = None, None, os.getpid()
+            if self._process is not None and self._process.poll() is None:
+                return self._ws_url
+
+            self._profile_dir = tempfile.mkdtemp(prefix="cdp-profile-")
+            args = [
+                arg if arg.startswith("--") else f"--{arg}"
+                for arg in BrowserPool.build_options().arguments
+            ]
+            self._process = subprocess.Popen(
+                [
+                    resolve_chrome_binary(),
+                    *args,
+                    "--remote-debugging-port=0",
+                    f"--user-data-dir={self._profile_dir}",
+                    "about:blank",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env={**os.environ, BROWSER_OWNER_ENV: str(os.getpid())},
+            )
+            self._ws_url = self._read_devtools_url(Path(self._profile_dir))
+            logger.info(f"Launched CDP browser (pid={self._process.pid})")
+            return self._ws_url
+
+    def _read_devtools_url(self, profile_dir: Path, timeout: float = 20) -> str:
+        # Chrome writes "<port>\n<browser ws path>" here once DevTools is listening.
+        port_file = profile_dir / "DevToolsActivePort"
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise CDPError(
+                    f"Chrome exited during startup ({self._process.returncode})"
+                )
+            try:
+                port, path = port_file.read_text().split()[:2]
+                return f"ws://127.0.0.1:{port}{path}"
+            except (OSError, ValueError):
+                time.sleep(0.05)
+        raise CDPError("Chrome did not open its DevTools port in time")
+
+    # ─────────────────────────────── Per-loop state ───────────────────────────
+    async def _loop_state(self):
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = {
+                "connection": None,
+                "connecting": asyncio.Lock(),
+                "slots": asyncio.Semaphore(self.max_pages),
+            }
+            self._loops[loop] = state
+        # Pages opened at the same time on a fresh loop must share one connection.
+        async with state["connecting"]:
+            if state["connection"] is None or state["connection"].closed:
+                ws_url = await asyncio.to_thread(self._ensure_chrome)
+                state["connection"] = await CDPConnection.connect(ws_url)
+        return state
+
+    @asynccontextmanager
+    async def page(
+        self, user_agent: str = None, blocked_urls=DEFAULT_BLOCKED_URL_PATTERNS
+    ):
+        """Open a tab for the duration of the ``async with`` block, then close it."""
+        state = await self._loop_state()
+        async with state["slots"]:
+            connection = state["connection"]
+            target = await connection.send(
+                "Target.createTarget", {"url": "about:blank"}
+            )
+            target_id = target["targetId"]
+            try:
+                attached = await connection.send(
+                    "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+                )
+                page = AsyncPage(connection, target_id, attached["sessionId"])
+                await page.send("Network.enable")
+                await page.send(
+                    "Network.setUserAgentOverride",
+                    {
+                        "userAgent": user_agent or DEFAULT_USER_AGENT,
+                        "acceptLanguage": DEFAULT_ACCEPT_LANGUAGE,
+                    },
+                )
+                await page.send(
+                    "Network.setBlockedURLs", {"urls": list(blocked_urls or ())}
+                )
+                yield page
+            finally:
+                if not connection.closed:
+                    try:
+                        await connection.send(
+                            "Target.closeTarget", {"targetId": target_id}
+                        )
+                    except CDPError:
+                        pass
+
+    async def disconnect(self):
+        """Close this event loop's connection (Chrome keeps running)."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None and state["connection"] is not None:
+            await state["connection"].close()
+
+    def close(self):
+        """Kill this process's Chrome and remove its throwaway profile."""
+        with self._lock:
+            if self._pid != os.getpid() or self._process is None:
+                return
+            process, self._process = self._process, None
+        for pid in reversed(_process_tree(process.pid)):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                continue
+        process.wait(5)
+        if self._profile_dir:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+
+
+async_browser = AsyncBrowser(max_pages=getattr(settings, "ASYNC_BROWSER_MAX_PAGES", 16))
+
+atexit.register(async_browser.close)
@@ -0,0 +1,249 @@
+"""
+Deadlines, cancellation and hedging for individual fetches.
+
+Every fetch attempt runs inside a :class:`CancelScope` on one of the
+``FETCH_ATTEMPT_THREADS`` threads of this process. Pooled browsers leased by
+the attempt register with the scope, so cancelling the attempt kills their
+Chrome process trees. The stuck WebDriver call then fails at once instead of
+running until the Celery time limit. Async fetchers register their task
+instead (see :class:`TaskCanceller`), which is cancelled. HTTP requests take
+their timeout from :func:`deadline_timeout`, so an abandoned attempt stuck on a
+socket ends by its deadline too, and gives its thread back.
+
+:func:`call_with_deadline` bounds one call. :func:`hedged_call` can also start
+a second attempt once the first has been running longer than the platform's
+p95 latency, and keeps whichever finishes first.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.utils.cache_keys import CacheKey
+from core.utils.logger import logger
+
+_local = threading.local()
+
+
+class FetchTimeout(TimeoutError):
+    """A fetch did not finish within its deadline and was cancelled."""
+
+
+class CancelScope:
+    """Tracks the browsers leased by one attempt so they can be killed on cancel."""
+
+    def __init__(self, deadline: float = None):
+        self.deadline = deadline
+        self.cancelled = False
+        self._lock = threading.Lock()
+        self._drivers = set()
+
+    def register(self, pooled):
+        with self._lock:
+            if self.cancelled:
+                raise FetchTimeout(
+                    "Fetch was cancelled before it could lease a browser"
+                )
+            self._drivers.add(pooled)
+
+    def unregister(self, pooled):
+        with self._lock:
+            self._drivers.discard(pooled)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            drivers, self._drivers = self._drivers, set()
+        for pooled in drivers:
+            pooled.kill()
+
+    def remaining(self):
+        """Seconds left before the deadline (0 once cancelled), or None without one."""
+        if self.cancelled:
+            return 0.0
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+
+class TaskCanceller:
+    """Lets a CancelScope cancel an asyncio task that runs on another thread's loop."""
+
+    def __init__(self, task):
+        self.task = task
+        self.loop = task.get_loop()
+
+    def kill(self):
+        try:
+            self.loop.call_soon_threadsafe(self.task.cancel)
+        except RuntimeError:
+            # The loop already finished.
+            pass
+
+
+def current_cancel_scope():
+    """The scope of the attempt running on this thread, if any."""
+    return getattr(_local, "scope", None)
+
+
+def deadline_timeout(timeout: float, action: str = "fetch") -> float:
+    """
+    ``timeout`` capped at the time the current attempt has left, so a blocking
+    call cannot outlive the attempt's deadline. Outside an attempt it is
+    returned unchanged.
+
+    Raises:
+        FetchTimeout: If the attempt has no time left or was cancelled
+    """
+    scope = current_cancel_scope()
+    remaining = scope.remaining() if scope is not None else None
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise FetchTimeout(f"No time left to {action}")
+    return min(timeout, remaining) if timeout else remaining
+
+
+class AttemptExecutor:
+    """
+    Bounded thread pool that runs the fetch attempts of one OS process.
+
+    Created lazily and rebuilt after a fork, since threads do not survive it.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pid = None
+        self._executor = None
+
+    def submit(self, fn):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="fetch"
+                )
+                self._pid = os.getpid()
+            return self._executor.submit(fn)
+
+
+attempt_executor = AttemptExecutor(getattr(settings, "FETCH_ATTEMPT_THREADS", 32))
+
+
+class Attempt:
+    """One fetch attempt on the attempt executor, with a Future for its outcome."""
+
+    def __init__(self, func, deadline: float):
+        self.func = func
+        self.future = Future()
+        self.scope = CancelScope(deadline)
+
+    def start(self):
+        attempt_executor.submit(self._run)
+        return self
+
+    def _run(self):
+        if not self.future.set_running_or_notify_cancel():
+            return
+        if self.scope.cancelled:
+            # Cancelled while it waited for a free thread.
+            self.future.set_exception(FetchTimeout("Fetch was cancelled before it ran"))
+            return
+        _local.scope = self.scope
+        try:
+            result = self.func()
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+        finally:
+            _local.scope = None
+
+    def cancel(self):
+        self.scope.cancel()
+
+
+def call_with_deadline(func, timeout: float, name: str = "fetch"):
+    """
+    Run ``func`` with at most ``timeout`` seconds to finish.
+
+    Raises:
+        FetchTimeout: If it was still running at the deadline (and has been cancelled)
+    """
+    result, _ = hedged_call([func], timeout, name=name)
+    return result
+
+
+def hedged_call(
+    funcs, timeout: float, hedge_after: float = None, can_hedge=None, name="fetch"
+):
+    """
+    Run ``funcs[0]``; if it has not finished after ``hedge_after`` seconds (and
+    ``can_hedge()`` agrees), also start ``funcs[1]``. The first attempt to
+    succeed wins and the rest are cancelled.
+
+    Returns:
+        tuple: (result, index of the winning function)
+
+    Raises:
+        FetchTimeout: If no attempt succeeded before ``timeout``
+        Exception: The first attempt's error, if every attempt failed outright
+    """
+    deadline = time.monotonic() + timeout
+    attempts = [Attempt(funcs[0], deadline).start()]
+
+    if len(funcs) > 1 and hedge_after is not None and hedge_after < timeout:
+        done, _ = wait([attempts[0].future], timeout=hedge_after)
+        if not done and (can_hedge is None or can_hedge()):
+            logger.info(
+                f"{name}: no result after {hedge_after:.1f}s, starting hedged attempt"
+            )
+            attempts.append(Attempt(funcs[1], deadline).start())
+
+    pending = {attempt.future: index for index, attempt in enumerate(attempts)}
+    errors = []
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, _ = wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            if future.exception() is None:
+                for other in pending.values():
+                    attempts[other].cancel()
+                if index:
+                    logger.info(f"{name}: hedged attempt won")
+                return future.result(), index
+            errors.append(future.exception())
+
+    if not pending and errors:
+        raise errors[0]
+    for index in pending.values():
+        attempts[index].cancel()
+    raise FetchTimeout(f"{name} did not finish within {timeout:.0f}s")
+
+
+# ─────────────────────────────── Latency history ──────────────────────────────
+def record_latency(platform_name: str, seconds: float):
+    """Append a successful fetch duration to the platform's recent history."""
+    key = CacheKey.PLATFORM_FETCH_LATENCIES.build(name=platform_name)
+    size = getattr(settings, "FETCH_LATENCY_HISTORY", 50)
+    history = (cache.get(key) or [])[-(size - 1) :]
+    history.append(round(seconds, 3))
+    cache.set(key, history, timeout=None)
+
+
+def latency_p95(platform_name: str):
+    """p95 of the recent fetch durations, or None until there is enough history."""
+    history = (
+        cache.get(CacheKey.PLATFORM_FETCH_LATENCIES.build(name=platform_name)) or []
+    )
+    if len(history) < getattr(settings, "FETCH_HEDGE_MIN_SAMPLES", 10):
+        return None
+    ordered = sorted(history)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
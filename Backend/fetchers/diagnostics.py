@@ -0,0 +1,295 @@
+"""
+Structured, concurrent platform diagnostics.
+
+``diagnose_platforms`` and ``debug_fetch`` print a step-by-step walkthrough
+for one platform at a time. With ``--parallel``, ``--profile`` or a machine
+readable ``--format`` they use :func:`diagnose_platforms` instead: every
+platform is fetched once, up to ``parallel`` at a time, and summarized as one
+flat row (see :data:`COLUMNS`) that :func:`write_report` renders as a table,
+JSON or CSV. Rows are sorted by platform name and always have the same
+columns, so two runs can be diffed directly.
+
+Fetches run with a fresh fetcher instance under the fetcher's deadline, but
+outside the circuit breaker and rate limiter, so a platform whose breaker is
+open is still tested. Cache writes go to a scratch name and are cleared.
+"""
+
+import csv
+import io
+import json
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from core.utils.platform_cache import PlatformCacheManager
+from fetchers.deadline import call_with_deadline
+from fetchers.timing import CACHE_WRITE, STAGES, StageRecorder, stage
+from fetchers.utils import call_fetcher, fetch_deadline, get_fetcher
+
+TEXT = "text"
+JSON = "json"
+CSV = "csv"
+FORMATS = (TEXT, JSON, CSV)
+
+COLUMNS = (
+    "platform",
+    "fetcher",
+    "ok",
+    "followers",
+    "tier",
+    "strategy",
+    "total_ms",
+    *(f"{name}_ms" for name in STAGES),
+    "peak_mb",
+    "error",
+)
+
+
+class MemoryWindow:
+    """
+    Peak Python memory (tracemalloc) over each diagnostic run.
+
+    The peak is reset only when no other run is in progress, so with
+    overlapping runs each one reports the process peak over its window,
+    which includes its neighbours' allocations.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = 0
+        self._started_tracing = False
+
+    def __enter__(self):
+        with self._lock:
+            if self._active == 0:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+                tracemalloc.reset_peak()
+            self._active += 1
+        return self
+
+    def peak_mb(self) -> float:
+        return round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self._active -= 1
+            if self._active == 0 and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+
+def diagnose_platform(
+    platform, profile: bool = False, memory: MemoryWindow = None
+) -> dict:
+    """
+    Fetch one platform once and return its report row.
+
+    With ``profile``, per-stage timings and peak memory are captured as well;
+    otherwise those columns are left empty.
+    """
+    row = dict.fromkeys(COLUMNS)
+    row.update(platform=platform.name, ok=False)
+    start = time.perf_counter()
+    recorder = StageRecorder()
+
+    try:
+        fetcher_class = type(get_fetcher(platform))
+    except Exception as e:
+        row["error"] = f"Fetcher setup failed: {e}"
+        row["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return row
+    fetcher = fetcher_class(platform.page_url)
+    row["fetcher"] = fetcher_class.__name__
+
+    def attempt():
+        # The deadline runs this on its own thread, where the recorder must be active.
+        with recorder.active():
+            return call_fetcher(fetcher)
+
+    def measured():
+        count = call_with_deadline(
+            attempt, fetch_deadline(fetcher), name=f"diagnose {platform.name}"
+        )
+        scratch_name = f"diagnose_{platform.name}"
+        with recorder.active(), stage(CACHE_WRITE):
+            PlatformCacheManager.update_platform_metrics(scratch_name, count)
+        PlatformCacheManager.clear_platform_cache(scratch_name)
+        return count
+
+    try:
+        if profile:
+            with memory or MemoryWindow() as window:
+                row["followers"] = measured()
+                row["peak_mb"] = window.peak_mb()
+        else:
+            row["followers"] = measured()
+        row["ok"] = True
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+
+    row["tier"] = fetcher.last_fetch_tier
+    row["strategy"] = fetcher.last_strategy
+    row["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    if profile:
+        row.update(
+            {f"{name}_ms": round(ms, 1) for name, ms in recorder.as_ms().items()}
+        )
+    return row
+
+
+def diagnose_platforms(
+    platforms, parallel: int = 1, profile: bool = False, on_row=None
+) -> list:
+    """
+    Diagnose every platform, ``parallel`` at a time.
+
+    Args:
+        platforms: Platform instances to fetch
+        parallel: Number of platforms fetched concurrently
+        profile: Capture per-stage timings and peak memory
+        on_row: Called with each row as soon as its platform finishes
+
+    Returns:
+        list: One row per platform, sorted by platform name
+    """
+    platforms = list(platforms)
+    # Resolve the fetch_script relation up front so worker threads never
+    # touch the database.
+    for platform in platforms:
+        platform.fetch_script  # noqa: B018
+
+    memory = MemoryWindow()
+
+    def run(platform):
+        row = diagnose_platform(platform, profile=profile, memory=memory)
+        if on_row is not None:
+            on_row(row)
+        return row
+
+    if parallel <= 1:
+        rows = [run(platform) for platform in platforms]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=parallel, thread_name_prefix="diagnose"
+        ) as executor:
+            rows = list(executor.map(run, platforms))
+    return sorted(rows, key=lambda row: row["platform"])
+
+
+def format_row(row: dict) -> str:
+    """One-line summary of a row for progress output."""
+    if not row["ok"]:
+        return f"{row['platform']}: failed in {row['total_ms']:.0f} ms ({row['error']})"
+    line = (
+        f"{row['platform']}: {row['followers']} followers via {row['tier']}"
+        f"{' / ' + row['strategy'] if row['strategy'] else ''} in {row['total_ms']:.0f} ms"
+    )
+    if row["peak_mb"] is not None:
+        line += f", peak {row['peak_mb']:.1f} MB"
+    return line
+
+
+def write_report(rows, fmt: str, stream):
+    """Write rows to ``stream`` as an aligned table, a JSON list or CSV."""
+    if fmt == JSON:
+        stream.write(json.dumps(list(rows), indent=2) + "\n")
+        return
+    if fmt == CSV:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        stream.write(buffer.getvalue())
+        return
+
+    columns = [
+        c for c in COLUMNS if c != "error" and any(row[c] is not None for row in rows)
+    ]
+    cells = [[_cell(row[c]) for c in columns] for row in rows]
+    widths = [
+        max([len(c)] + [len(line[i]) for line in cells]) for i, c in enumerate(columns)
+    ]
+    header = " ".join(f"{c:<{w}}" for c, w in zip(columns, widths))
+    stream.write(header + "\n" + "-" * len(header) + "\n")
+    for row, line in zip(rows, cells):
+        stream.write(" ".join(f"{v:<{w}}" for v, w in zip(line, widths)))
+        stream.write(f"  {row['error']}\n" if row["error"] else "\n")
+
+
+def _cell(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+# ─────────────────────────────── Command options ──────────────────────────
+def add_report_arguments(parser):
+    """The options diagnostic commands share for structured runs."""
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Diagnose this many platforms at the same time",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Capture per-stage timings, peak memory and the winning extraction strategy",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=TEXT,
+        help="Report format for --parallel/--profile runs",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Write the report to this file instead of stdout",
+    )
+
+
+def report_requested(options) -> bool:
+    return options["parallel"] > 1 or options["profile"] or options["format"] != TEXT
+
+
+def run_report(command, platforms, options) -> list:
+    """
+    Run :func:`diagnose_platforms` for a management command and write its report.
+
+    Progress lines go to stdout, or to stderr when stdout carries JSON/CSV.
+    """
+    to_stdout = not options["output"]
+    progress = (
+        command.stderr if to_stdout and options["format"] != TEXT else command.stdout
+    )
+    progress.write(
+        f"Diagnosing {len(platforms)} platform(s), {max(options['parallel'], 1)} at a time"
+        f"{' with profiling' if options['profile'] else ''}"
+    )
+    rows = diagnose_platforms(
+        platforms,
+        parallel=options["parallel"],
+        profile=options["profile"],
+        on_row=lambda row: progress.write(format_row(row)),
+    )
+
+    if to_stdout:
+        report = io.StringIO()
+        write_report(rows, options["format"], report)
+        if options["format"] == TEXT:
+            command.stdout.write("")
+        command.stdout.write(report.getvalue(), ending="")
+    else:
+        with Path(options["output"]).open("w", encoding="utf-8", newline="") as stream:
+            write_report(rows, options["format"], stream)
+        progress.write(f"Report written to {options['output']}")
+    failed = sum(1 for row in rows if not row["ok"])
+    progress.write(f"{len(rows) - failed} ok, {failed} failed")
+    return rows
@@ -0,0 +1,124 @@
+"""
+In-page count extraction for browser fetchers.
+
+Instead of shipping the whole ``page_source`` (often several MB) over the
+WebDriver wire and re-parsing it in Python, a fetcher can declare an
+extractor that runs inside the page and returns only the text holding the
+count. Extractors are callables taking the driver and returning that text,
+or ``None`` when nothing matched, in which case the base class falls back to
+the full-source parser. ``extract_async`` does the same on an
+:class:`fetchers.cdp.AsyncPage`.
+"""
+
+import re
+
+
+def _compile(pattern):
+    if pattern is None or not isinstance(pattern, str):
+        return pattern
+    return re.compile(pattern, re.IGNORECASE)
+
+
+class InPageExtractor:
+    """Base class for in-page extractors."""
+
+    def __init__(self, pattern=None):
+        # Optional regex applied in Python to the returned text; group 1 is the count.
+        self.pattern = _compile(pattern)
+
+    def __call__(self, driver):
+        raise NotImplementedError
+
+    async def extract_async(self, page):
+        raise NotImplementedError
+
+    def _first_match(self, texts):
+        for text in texts:
+            if not text:
+                continue
+            if self.pattern is None:
+                return text.strip()
+            match = self.pattern.search(text)
+            if match:
+                return match.group(1) if match.groups() else match.group(0)
+        return None
+
+
+class SelectorText(InPageExtractor):
+    """Return the text of the first element matching a CSS selector (and the regex, if any)."""
+
+    SCRIPT = """
+        const texts = [];
+        for (const el of document.querySelectorAll(arguments[0])) {
+            texts.push(el.innerText || el.textContent || '');
+            if (texts.length >= arguments[1]) { break; }
+        }
+        return texts;
+    """
+
+    def __init__(self, css_selector: str, pattern=None, max_elements: int = 20):
+        super().__init__(pattern)
+        self.css_selector = css_selector
+        self.max_elements = max_elements
+
+    def __call__(self, driver):
+        texts = driver.execute_script(self.SCRIPT, self.css_selector, self.max_elements)
+        return self._first_match(texts or [])
+
+    async def extract_async(self, page):
+        texts = await page.execute_script(
+            self.SCRIPT, self.css_selector, self.max_elements
+        )
+        return self._first_match(texts or [])
+
+    def __repr__(self):
+        return f"SelectorText({self.css_selector!r})"
+
+
+class TextNodeMatch(InPageExtractor):
+    """
+    Walk the page's text nodes in the browser and return the first one matching
+    the regex. The pattern must be valid in both Python and JavaScript syntax.
+    """
+
+    SCRIPT = """
+        const re = new RegExp(arguments[0], arguments[1]);
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+        let node;
+        while ((node = walker.nextNode())) {
+            if (re.test(node.nodeValue)) { return node.nodeValue; }
+        }
+        return null;
+    """
+
+    def __call__(self, driver):
+        flags = "i" if self.pattern.flags & re.IGNORECASE else ""
+        text = driver.execute_script(self.SCRIPT, self.pattern.pattern, flags)
+        return self._first_match([text])
+
+    async def extract_async(self, page):
+        flags = "i" if self.pattern.flags & re.IGNORECASE else ""
+        text = await page.execute_script(self.SCRIPT, self.pattern.pattern, flags)
+        return self._first_match([text])
+
+    def __repr__(self):
+        return f"TextNodeMatch({self.pattern.pattern!r})"
+
+
+class ScriptText(InPageExtractor):
+    """Run an arbitrary JS snippet that returns the count text (or null)."""
+
+    def __init__(self, script: str, pattern=None):
+        super().__init__(pattern)
+        self.script = script
+
+    def __call__(self, driver):
+        text = driver.execute_script(self.script)
+        return self._first_match([text] if isinstance(text, str) else [])
+
+    async def extract_async(self, page):
+        text = await page.execute_script(self.script)
+        return self._first_match([text] if isinstance(text, str) else [])
+
+    def __repr__(self):
+        return "ScriptText(...)"
@@ -0,0 +1,92 @@
+"""
+Local stand-in for a remote browser farm.
+
+:class:`LocalBrowserFarm` starts several chromedriver servers, each in its own
+process on its own port. chromedriver speaks the same W3C WebDriver protocol
+(and CDP passthrough) as a Selenium Grid node, so pointing
+``BROWSER_REMOTE_URLS`` at :attr:`LocalBrowserFarm.urls` exercises the remote
+code path (load balancing, failover, leasing) on one machine. Stop a single
+node with :meth:`stop_node` to watch sessions fail over.
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import time
+
+import requests
+
+from core.utils.logger import logger
+from fetchers.browser import BROWSER_OWNER_ENV, _process_tree, resolve_chromedriver_path
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalBrowserFarm:
+    """``nodes`` chromedriver processes on 127.0.0.1, one WebDriver node each."""
+
+    def __init__(self, nodes: int = 2, base_port: int = 0, startup_timeout: float = 15):
+        self.nodes = nodes
+        self.base_port = base_port
+        self.startup_timeout = startup_timeout
+        self._processes = {}
+
+    @property
+    def urls(self) -> list:
+        return [f"http://127.0.0.1:{port}" for port in self._processes]
+
+    def start(self):
+        for index in range(self.nodes):
+            port = self.base_port + index if self.base_port else _free_port()
+            self._processes[port] = subprocess.Popen(
+                [resolve_chromedriver_path(), f"--port={port}"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                # Tagged like pooled browsers, so orphans get reaped the same way.
+                env={**os.environ, BROWSER_OWNER_ENV: str(os.getpid())},
+            )
+        for port in self._processes:
+            self._wait_ready(port)
+        logger.info(f"Local browser farm up: {', '.join(self.urls)}")
+        return self
+
+    def _wait_ready(self, port: int):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            try:
+                status = requests.get(
+                    f"http://127.0.0.1:{port}/status", timeout=1
+                ).json()
+                if status.get("value", {}).get("ready"):
+                    return
+            except (requests.RequestException, ValueError):
+                pass
+            time.sleep(0.1)
+        self.stop()
+        raise RuntimeError(f"Browser farm node on port {port} did not become ready")
+
+    def stop_node(self, port: int):
+        """Kill one node (and its browsers), e.g. to test failover."""
+        process = self._processes.pop(port, None)
+        if process is None:
+            return
+        for pid in reversed(_process_tree(process.pid)):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                continue
+        try:
+            process.wait(5)
+        except subprocess.TimeoutExpired:
+            # Not in the tree we just walked (e.g. /proc is missing): kill it directly.
+            process.kill()
+            process.wait(5)
+
+    def stop(self):
+        for port in list(self._processes):
+            self.stop_node(port)
@@ -0,0 +1,142 @@
+"""
+Shared HTTP client for the fetchers.
+
+A single ``requests.Session`` per worker process keeps keep-alive connection
+pools per host, so repeated fetches skip DNS, TCP and TLS setup. Every request
+gets a default timeout and advertises gzip/deflate/br (urllib3 decodes brotli
+through the ``brotli`` package that whitenoise[brotli] already installs).
+Inside a fetch attempt the timeout is capped at the time left before its
+deadline (see :func:`fetchers.deadline.deadline_timeout`).
+
+HTTP/2 is not used: requests/urllib3 only speak HTTP/1.1, and keep-alive
+already removes most of the per-request handshake cost for our traffic.
+"""
+
+import os
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from fetchers.browser import DEFAULT_ACCEPT_LANGUAGE, DEFAULT_USER_AGENT
+from fetchers.deadline import deadline_timeout
+from fetchers.replay import (
+    HTTP_FIXTURE,
+    RECORD,
+    REPLAY,
+    fixture_store,
+    replay_mode,
+    replay_server,
+)
+from fetchers.snapshots import snapshot_store
+from fetchers.timing import NAVIGATION, stage
+
+
+class TimeoutSession(requests.Session):
+    """Session that applies a default timeout when the caller does not pass one."""
+
+    def __init__(self, timeout: float):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+class HttpClient:
+    """
+    Process-local owner of the shared session.
+
+    The session is created lazily and rebuilt after a fork, since pooled
+    sockets must not be shared between Celery prefork children.
+    """
+
+    def __init__(self, pool_maxsize: int, timeout: float, retries: int):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.retries = retries
+        self._lock = threading.Lock()
+        self._pid = None
+        self._session = None
+        self._adapter = None
+
+    def _build(self):
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_maxsize,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=Retry(
+                total=self.retries,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD"}),
+            ),
+        )
+        session = TimeoutSession(self.timeout)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(
+            {
+                "User-Agent": DEFAULT_USER_AGENT,
+                "Accept-Language": DEFAULT_ACCEPT_LANGUAGE,
+                "Accept-Encoding": "gzip, deflate, br",
+            }
+        )
+        return session, adapter
+
+    @property
+    def session(self) -> requests.Session:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._session, self._adapter = self._build()
+                    self._pid = os.getpid()
+        return self._session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        mode = replay_mode()
+        target = (
+            replay_server.url_for(url, kind=HTTP_FIXTURE) if mode == REPLAY else url
+        )
+        kwargs["timeout"] = deadline_timeout(
+            kwargs.get("timeout", self.timeout), f"fetch {url}"
+        )
+        with stage(NAVIGATION):
+            response = self.session.get(target, **kwargs)
+        if mode == RECORD and response.ok:
+            fixture_store.save(HTTP_FIXTURE, url, response.text)
+        if mode != REPLAY and response.ok:
+            snapshot_store.capture(url, HTTP_FIXTURE, response.text)
+        return response
+
+    def stats(self) -> dict:
+        """
+        Per-host connection pool statistics for this process:
+        ``{host: {"connections": opened, "requests": served}}``.
+        """
+        if self._adapter is None or self._pid != os.getpid():
+            return {}
+        stats = {}
+        for key in self._adapter.poolmanager.pools.keys():
+            pool = self._adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            stats[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                "connections": pool.num_connections,
+                "requests": pool.num_requests,
+            }
+        return stats
+
+    def close(self):
+        if self._session is not None and self._pid == os.getpid():
+            self._session.close()
+        self._session = self._adapter = self._pid = None
+
+
+http_client = HttpClient(
+    pool_maxsize=getattr(settings, "HTTP_POOL_MAXSIZE", 10),
+    timeout=getattr(settings, "HTTP_TIMEOUT", 10),
+    retries=getattr(settings, "HTTP_MAX_RETRIES", 2),
+)
@@ -0,0 +1,214 @@
+"""
+Process pool for parsing fetched pages.
+
+Fetching is I/O-bound but building a soup from a multi-megabyte page is
+CPU-bound, and threads parsing at the same time all wait on the GIL. The
+refresh pipeline hands the pages it downloaded (:class:`fetchers.base.RawPage`)
+to :data:`parse_pool`, whose ``REFRESH_PARSE_PROCESSES`` processes run the
+fetcher's own parser, so parsing spreads over every core.
+
+Parse processes are fresh interpreters started like the browser workers (see
+:func:`fetchers.workers.start_worker_process`), so the pool also works inside
+daemonic processes such as Celery's prefork children, where ``multiprocessing``
+refuses to create children. Each sets Django up once and serves pages until the
+pool is closed or its parent goes away. A fetcher is rebuilt in the process
+from its import path and URL, so only that and the page cross the socket.
+"""
+
+import atexit
+import os
+import pickle
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from queue import Empty, Queue
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from core.utils.logger import logger
+from fetchers.workers import start_worker_process
+
+
+class ParseWorkerError(RuntimeError):
+    """A parse process died or could not be started; the page was not parsed."""
+
+
+def parse_raw_page(fetcher_path: str, page) -> int:
+    """Parse a RawPage with the parser the fetcher uses for its tier."""
+    fetcher = import_string(fetcher_path)(page.url)
+    return fetcher.parse_snapshot(page.source, page.tier)
+
+
+def fetcher_path(fetcher) -> str:
+    return f"{type(fetcher).__module__}.{type(fetcher).__qualname__}"
+
+
+def _picklable(error: Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+    return error
+
+
+def serve(fd: int):
+    """Entry point of a parse process: parse pages until told to stop."""
+    conn = Connection(fd)
+
+    import django
+
+    django.setup()
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        try:
+            reply = ("ok", parse_raw_page(*job))
+        except Exception as e:
+            # Parser errors keep their type, so the caller can try the next tier.
+            reply = ("error", _picklable(e))
+        conn.send(reply)
+
+
+class ParseWorker:
+    """Parent-side handle on one parse process."""
+
+    def __init__(self):
+        self.process, self.conn = start_worker_process("fetchers.parse_pool.serve")
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def parse(self, fetcher_path: str, page) -> int:
+        try:
+            self.conn.send((fetcher_path, page))
+            status, payload = self.conn.recv()
+        except (EOFError, OSError) as e:
+            raise ParseWorkerError(f"Parse process (pid={self.pid}) died: {e}")
+        if status == "error":
+            raise payload
+        return payload
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+            self.process.wait(5)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            pass
+        if self.is_alive():
+            self.process.kill()
+            self.process.wait()
+        self.conn.close()
+
+
+class ParsePool:
+    """Lazily started parse processes, owned by one OS process."""
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = Queue()
+        self._live = set()
+        self._dispatch = None
+
+    @property
+    def size(self) -> int:
+        """Number of parse processes; a negative setting means one per CPU core."""
+        if self.processes < 0:
+            return os.cpu_count() or 1
+        return self.processes
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def submit(self, fetcher_path: str, page) -> Future:
+        """Parse ``page`` in a parse process; the future fails as :meth:`parse` would."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Processes inherited across fork belong to the parent.
+                self._reset()
+            if self._dispatch is None:
+                self._dispatch = ThreadPoolExecutor(
+                    max_workers=self.size, thread_name_prefix="parse"
+                )
+                logger.info(f"Parsing pages in up to {self.size} process(es)")
+            dispatch = self._dispatch
+        return dispatch.submit(self.parse, fetcher_path, page)
+
+    def parse(self, fetcher_path: str, page) -> int:
+        """
+        Parse ``page`` in a parse process, blocking until it answers.
+
+        Raises:
+            ParseWorkerError: If the process died or could not be started
+        """
+        worker = self._checkout()
+        try:
+            count = worker.parse(fetcher_path, page)
+        except ParseWorkerError:
+            self._retire(worker)
+            raise
+        except BaseException:
+            self._idle.put(worker)
+            raise
+        self._idle.put(worker)
+        return count
+
+    def _checkout(self) -> ParseWorker:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except Empty:
+                break
+            if worker.is_alive():
+                return worker
+            self._retire(worker)
+        try:
+            worker = ParseWorker()
+        except OSError as e:
+            raise ParseWorkerError(f"Could not start a parse process: {e}")
+        with self._lock:
+            self._live.add(worker)
+        return worker
+
+    def _retire(self, worker: ParseWorker):
+        with self._lock:
+            self._live.discard(worker)
+        worker.stop()
+
+    def pids(self) -> list:
+        with self._lock:
+            return sorted(worker.pid for worker in self._live)
+
+    def close(self):
+        """Stop every parse process owned by this process."""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            dispatch, self._dispatch = self._dispatch, None
+            live, self._live = self._live, set()
+            self._idle = Queue()
+        if dispatch is not None:
+            dispatch.shutdown(wait=True, cancel_futures=True)
+        for worker in live:
+            worker.stop()
+
+
+parse_pool = ParsePool(getattr(settings, "REFRESH_PARSE_PROCESSES", -1))
+
+atexit.register(parse_pool.close)
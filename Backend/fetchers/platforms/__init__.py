@@ -5,6 +5,7 @@ __all__ = (
     "SnapchatFetcher",
     "TiktokFetcher",
     "TwitterFetcher",
+    "YoutubeApiFetcher",
     "YoutubeFetcher",
 )
 
@@ -15,3 +16,4 @@ from .snapchat import SnapchatFetcher
 from .tiktok import TiktokFetcher
 from .twitter import TwitterFetcher
 from .youtube import YoutubeFetcher
+from .youtube_api import YoutubeApiFetcher
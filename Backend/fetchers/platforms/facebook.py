@@ -1,41 +1,67 @@
 import re
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from fetchers.base import BaseFetcher
+from fetchers.base import BROWSER_TIER, HTTP_TIER, BaseFetcher
+from fetchers.extraction import SelectorText
+from fetchers.readiness import TextMatches
+
+FOLLOWERS_HREF_RE = re.compile(r"/followers/?$")
+FOLLOWERS_TEXT_RE = re.compile(r"([\d,.]+[KM]?)\s+followers", re.IGNORECASE)
+FOLLOWERS_LINKS = SoupStrainer("a", href=FOLLOWERS_HREF_RE)
 
 
 class FacebookFetcher(BaseFetcher):
+    fetch_strategies = (
+        (HTTP_TIER, "_parse_meta_tags"),
+        (BROWSER_TIER, "_parse_rendered_page"),
+    )
+    ready_condition = TextMatches(FOLLOWERS_TEXT_RE)
+    ready_timeout = 20
+    in_page_extractor = SelectorText(
+        'a[href$="/followers"], a[href$="/followers/"]', FOLLOWERS_TEXT_RE
+    )
+    # Tried cheapest-first per strategy memory; the full-text scan is the slow one.
+    rendered_page_strategies = (
+        "_count_from_link_text",
+        "_count_from_link_strong",
+        "_count_from_text_scan",
+    )
+
     def __init__(self, url: str):
         self.platform_url = url
 
-    def fetch_followers_count(self) -> int:
-        page_source = self._get_page_source_with_browser(self.platform_url)
-        soup = BeautifulSoup(page_source, "html.parser")
+    def _parse_meta_tags(self, page_source: str) -> int:
+        # Public pages describe themselves as "... 12K likes · 13K followers ..."
+        meta = self._meta_contents(page_source)
+        for key in ("og:description", "description"):
+            match = FOLLOWERS_TEXT_RE.search(meta.get(key, ""))
+            if match:
+                return self._parse_count(match.group(1))
+        raise ValueError("No followers count in Facebook meta tags")
 
-        # Look for the followers link pattern
-        followers_links = soup.find_all("a", href=re.compile(r"/followers/?$"))
+    def _parse_rendered_page(self, page_source: str) -> int:
+        return self._extract_with_strategies(page_source, self.rendered_page_strategies)
 
-        for link in followers_links:
-            text = link.get_text(strip=True)
-            match = re.search(r"([\d,.]+[KM]?)\s+followers", text, re.IGNORECASE)
+    def _count_from_link_text(self, page) -> int:
+        # Only the followers links are built into the tree for the link strategies
+        for link in page.soup(FOLLOWERS_LINKS).find_all("a"):
+            match = FOLLOWERS_TEXT_RE.search(link.get_text(strip=True))
             if match:
                 return self._parse_count(match.group(1))
+        raise ValueError("No followers link text")
 
-        # Fallback to searching for the strong tag if the above fails
-        for link in followers_links:
+    def _count_from_link_strong(self, page) -> int:
+        for link in page.soup(FOLLOWERS_LINKS).find_all("a"):
             strong_tag = link.find("strong")
             if strong_tag:
-                followers_text = strong_tag.get_text().strip()
-                return self._parse_count(followers_text)
-
-        # Fallback for pages with different structures
-        text_elements = soup.find_all(
-            string=re.compile(r"[\d,.]+[KM]?\s+followers", re.IGNORECASE)
-        )
-        for element in text_elements:
-            match = re.search(r"([\d,.]+[KM]?)\s+followers", element, re.IGNORECASE)
+                return self._parse_count(strong_tag.get_text().strip())
+        raise ValueError("No strong tag in a followers link")
+
+    def _count_from_text_scan(self, page) -> int:
+        # Pages with different structures: scan every text node of the full document
+        for element in page.soup().find_all(string=FOLLOWERS_TEXT_RE):
+            match = FOLLOWERS_TEXT_RE.search(element)
             if match:
                 return self._parse_count(match.group(1))
-
         raise ValueError("Could not find followers count on the page")
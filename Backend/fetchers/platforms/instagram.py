@@ -1,6 +1,7 @@
-import requests
+import json
 
-from fetchers.base import BaseFetcher
+from fetchers.base import HTTP_TIER, BaseFetcher
+from fetchers.http_client import http_client
 
 
 class InstagramFetcher(BaseFetcher):
@@ -8,20 +9,26 @@ class InstagramFetcher(BaseFetcher):
         self.platform_url = url
 
     def fetch_followers_count(self) -> int:
+        headers = {"x-ig-app-id": "936619743392459"}
+        r = http_client.get(self._api_url(), headers=headers)
+        r.raise_for_status()
+        return self._parse_profile(r.json())
+
+    def _api_url(self) -> str:
         username = self.platform_url.rstrip("/").split("/")[-1]
-        api = (
+        return (
             f"https://i.instagram.com/api/v1/users/web_profile_info/"
             f"?username={username}"
         )
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/115.0 Safari/537.36"
-            ),
-            "x-ig-app-id": "936619743392459",
-        }
-        r = requests.get(api, headers=headers)
-        r.raise_for_status()
-        data = r.json()
+
+    @staticmethod
+    def _parse_profile(data: dict) -> int:
         return data["data"]["user"]["edge_followed_by"]["count"]
+
+    def snapshot_urls(self) -> tuple:
+        return (self._api_url(),)
+
+    def parse_snapshot(self, page_source: str, tier: str) -> int:
+        if tier != HTTP_TIER:
+            raise ValueError(f"InstagramFetcher has no parser for the {tier} tier")
+        return self._parse_profile(json.loads(page_source))
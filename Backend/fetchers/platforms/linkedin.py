@@ -1,21 +1,39 @@
 import re
-from bs4 import BeautifulSoup
-from fetchers.base import BaseFetcher
+
+from fetchers.base import BROWSER_TIER, HTTP_TIER, BaseFetcher
+from fetchers.extraction import TextNodeMatch
+from fetchers.readiness import TextMatches
+
+FOLLOWERS_TEXT_RE = re.compile(r"([\d,.]+[KM]?)\s+followers", re.IGNORECASE)
 
 
 class LinkedinFetcher(BaseFetcher):
+    fetch_strategies = (
+        (HTTP_TIER, "_parse_meta_tags"),
+        (BROWSER_TIER, "_parse_rendered_page"),
+    )
+    ready_condition = TextMatches(FOLLOWERS_TEXT_RE)
+    ready_timeout = 15
+    in_page_extractor = TextNodeMatch(FOLLOWERS_TEXT_RE)
+
     def __init__(self, platform_url):
         self.platform_url = platform_url
 
-    def fetch_followers_count(self):
-        page_source = self._get_page_source_with_browser(self.platform_url)
-        soup = BeautifulSoup(page_source, "html.parser")
+    def _parse_meta_tags(self, page_source):
+        # Guest company pages carry "<Name> | 1,234 followers on LinkedIn." in the description
+        meta = self._meta_contents(page_source)
+        for key in ("description", "og:description"):
+            match = FOLLOWERS_TEXT_RE.search(meta.get(key, ""))
+            if match:
+                return self._parse_count(match.group(1))
+        raise ValueError("No followers count in LinkedIn meta tags")
+
+    def _parse_rendered_page(self, page_source):
+        soup = self._make_soup(page_source)
 
-        text_elements = soup.find_all(
-            string=re.compile(r"[\d,.]+[KM]?\s+followers", re.IGNORECASE)
-        )
+        text_elements = soup.find_all(string=FOLLOWERS_TEXT_RE)
         for element in text_elements:
-            match = re.search(r"([\d,.]+[KM]?)\s+followers", element, re.IGNORECASE)
+            match = FOLLOWERS_TEXT_RE.search(element)
             if match:
                 return self._parse_count(match.group(1))
         raise ValueError("Could not find followers count on the page for LinkedIn.")
@@ -1,14 +1,36 @@
-from bs4 import BeautifulSoup
-from fetchers.base import BaseFetcher
+import re
+
+from bs4 import SoupStrainer
+
+from fetchers.base import BROWSER_TIER, HTTP_TIER, BaseFetcher
+from fetchers.extraction import SelectorText
+from fetchers.readiness import SelectorPresent
+
+FOLLOWER_COUNT_JSON_RE = re.compile(r'"followerCount"\s*:\s*(\d+)')
+FOLLOWERS_STRONG = SoupStrainer("strong", attrs={"data-e2e": "followers-count"})
 
 
 class TiktokFetcher(BaseFetcher):
+    fetch_strategies = (
+        (HTTP_TIER, "_parse_embedded_json"),
+        (BROWSER_TIER, "_parse_rendered_page"),
+    )
+    ready_condition = SelectorPresent('strong[data-e2e="followers-count"]')
+    ready_timeout = 15
+    in_page_extractor = SelectorText('strong[data-e2e="followers-count"]')
+
     def __init__(self, platform_url):
         self.platform_url = platform_url
 
-    def fetch_followers_count(self):
-        page_source = self._get_page_source_with_browser(self.platform_url)
-        soup = BeautifulSoup(page_source, "html.parser")
+    def _parse_embedded_json(self, page_source):
+        # The profile's stats are embedded in the rehydration JSON of the SSR page
+        match = FOLLOWER_COUNT_JSON_RE.search(page_source)
+        if match:
+            return int(match.group(1))
+        raise ValueError("No followerCount in TikTok embedded data")
+
+    def _parse_rendered_page(self, page_source):
+        soup = self._make_soup(page_source, parse_only=FOLLOWERS_STRONG)
 
         followers_strong = soup.find("strong", {"data-e2e": "followers-count"})
 
@@ -1,13 +1,32 @@
 import re
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from fetchers.base import BaseFetcher
+from fetchers.base import BROWSER_TIER, BaseFetcher
+from fetchers.extraction import SelectorText
+from fetchers.readiness import SelectorPresent
+
+FOLLOWERS_HREF_RE = re.compile(r"/(verified_)?followers", re.IGNORECASE)
+FOLLOWERS_TEXT_RE = re.compile(r"([\d,]+)\s+Followers", re.IGNORECASE)
+FOLLOWERS_LINKS = SoupStrainer("a", href=FOLLOWERS_HREF_RE)
+FOLLOWERS_COUNT_TESTID = SoupStrainer(attrs={"data-testid": "followersCount"})
 
 
 class TwitterFetcher(BaseFetcher):
     """Fetcher for Twitter/X platform to extract follower counts."""
 
+    # Profile pages are rendered entirely client-side, so only the browser works
+    fetch_strategies = ((BROWSER_TIER, "_parse_rendered_page"),)
+    ready_condition = SelectorPresent(
+        'a[href$="/followers"], a[href$="/verified_followers"], '
+        '[data-testid="followersCount"]'
+    )
+    ready_timeout = 20
+    in_page_extractor = SelectorText(
+        'a[href$="/followers"], a[href$="/verified_followers"]', FOLLOWERS_TEXT_RE
+    )
+    rendered_page_strategies = ("_count_from_followers_link", "_count_from_testid")
+
     def __init__(self, platform_url: str):
         """Initialize the Twitter fetcher with the profile URL.
 
@@ -16,8 +35,11 @@ class TwitterFetcher(BaseFetcher):
         """
         self.platform_url = platform_url
 
-    def fetch_followers_count(self) -> int:
-        """Fetch the follower count from a Twitter profile page.
+    def _parse_rendered_page(self, page_source: str) -> int:
+        """Extract the follower count from a rendered Twitter profile page.
+
+        Args:
+            page_source: The HTML of the rendered profile page
 
         Returns:
             The number of followers as an integer
@@ -25,36 +47,29 @@ class TwitterFetcher(BaseFetcher):
         Raises:
             ValueError: If the followers count cannot be found or parsed
         """
-        page_source = self._get_page_source_with_browser(self.platform_url)
-        soup = BeautifulSoup(page_source, "html.parser")
+        return self._extract_with_strategies(page_source, self.rendered_page_strategies)
+
+    def _count_from_followers_link(self, page) -> int:
+        follower_link = page.soup(FOLLOWERS_LINKS).find("a", href=FOLLOWERS_HREF_RE)
+        if not follower_link:
+            raise ValueError("No followers link")
+        # The count is in a span, and the text "Followers" is in another.
+        # We'll get all the text and use regex to find the number next to "Followers"
+        link_text = follower_link.get_text(separator=" ", strip=True)
+        match = FOLLOWERS_TEXT_RE.search(link_text)
+        if not match:
+            raise ValueError("No count in the followers link")
+        return self._parse_count(match.group(1))
 
-        follower_link = soup.find(
-            "a", href=re.compile(r"/(verified_)?followers", re.IGNORECASE)
+    def _count_from_testid(self, page) -> int:
+        element = page.soup(FOLLOWERS_COUNT_TESTID).select_one(
+            '[data-testid="followersCount"]'
         )
+        if not element:
+            raise ValueError("No followersCount element")
+        return self._parse_count(element.get_text(strip=True))
+
 
-        if follower_link:
-            # The count is in a span, and the text "Followers" is in another.
-            # We'll get all the text and use regex to find the number next to "Followers"
-            link_text = follower_link.get_text(separator=" ", strip=True)
-            # This regex looks for a number (with commas) that is followed by "Followers"
-            match = re.search(r"([\d,]+)\s+Followers", link_text, re.IGNORECASE)
-            if match:
-                count_text = match.group(1)
-                try:
-                    return self._parse_count(count_text)
-                except ValueError:
-                    # Fallback to other strategies if parsing fails
-                    pass
-
-        # Try alternative approach if the above method failed
-        follower_count_element = soup.select_one('[data-testid="followersCount"]')
-        if follower_count_element:
-            try:
-                return self._parse_count(follower_count_element.get_text(strip=True))
-            except ValueError:
-                pass
-
-        raise ValueError("Could not find followers count on the page for Twitter.")
 #
 #
 # if __name__ == "__main__":
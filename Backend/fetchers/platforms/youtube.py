@@ -1,25 +1,59 @@
 import re
 
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from fetchers.base import BaseFetcher
+from fetchers.base import BROWSER_TIER, HTTP_TIER, BaseFetcher
+from fetchers.extraction import TextNodeMatch
+from fetchers.readiness import TextMatches
+
+SUBSCRIBERS_JSON_RE = re.compile(
+    r'"(?:simpleText|content)"\s*:\s*"([\d,.]+[KM]?)\s+subscribers"', re.IGNORECASE
+)
+SUBSCRIBERS_WORD_RE = re.compile(r"subscribers", re.IGNORECASE)
+SUBSCRIBERS_TEXT_RE = re.compile(r"([\d,.]+[KM]?)\s+subscribers", re.IGNORECASE)
+SPANS_ONLY = SoupStrainer("span")
 
 
 class YoutubeFetcher(BaseFetcher):
+    fetch_strategies = (
+        (HTTP_TIER, "_parse_embedded_json"),
+        (BROWSER_TIER, "_parse_rendered_page"),
+    )
+    ready_condition = TextMatches(SUBSCRIBERS_TEXT_RE)
+    ready_timeout = 15
+    in_page_extractor = TextNodeMatch(SUBSCRIBERS_TEXT_RE)
+    # Channel pages autoplay a trailer; never stream it
+    blocked_url_patterns = BaseFetcher.blocked_url_patterns + ("*googlevideo.com*",)
+    # The rendered page still carries ytInitialData, which needs no soup at all.
+    rendered_page_strategies = (
+        "_count_from_embedded_json",
+        "_count_from_subscriber_spans",
+    )
+
     def __init__(self, platform_url):
         self.platform_url = platform_url
 
-    def fetch_followers_count(self):
-        page_source = self._get_page_source_with_browser(self.platform_url)
-        soup = BeautifulSoup(page_source, "html.parser")
+    def _parse_embedded_json(self, page_source):
+        # ytInitialData in the server-rendered page already holds the subscriber text
+        match = SUBSCRIBERS_JSON_RE.search(page_source)
+        if match:
+            return self._parse_count(match.group(1))
+        raise ValueError("No subscriber count in YouTube embedded data")
+
+    def _parse_rendered_page(self, page_source):
+        return self._extract_with_strategies(page_source, self.rendered_page_strategies)
+
+    def _count_from_embedded_json(self, page):
+        return self._parse_embedded_json(page.source)
 
-        # Strategy 1: Find span tags with "subscribers" in their text
-        subscriber_spans = soup.find_all(
-            "span", string=re.compile(r"subscribers", re.IGNORECASE)
+    def _count_from_subscriber_spans(self, page):
+        # Find span tags with "subscribers" in their text
+        subscriber_spans = page.soup(SPANS_ONLY).find_all(
+            "span", string=SUBSCRIBERS_WORD_RE
         )
         for span in subscriber_spans:
             text = span.get_text(strip=True)
-            match = re.search(r"([\d,.]+[KM]?)\s+subscribers", text, re.IGNORECASE)
+            match = SUBSCRIBERS_TEXT_RE.search(text)
             if match:
                 return self._parse_count(match.group(1))
 
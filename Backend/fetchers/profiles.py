@@ -0,0 +1,179 @@
+"""
+Persistent Chrome profiles, one set per platform domain.
+
+A fresh Chrome profile starts with an empty HTTP cache and no cookies, so
+every fetch downloads the site's scripts and styles again and often lands on
+a consent interstitial first. With ``BROWSER_PROFILES_ENABLED`` pooled
+browsers launch with a ``--user-data-dir`` kept under ``BROWSER_PROFILE_DIR``
+instead, so the disk cache, cookies and localStorage survive across launches::
+
+    instagram.com/0/        profile slot 0 (Chrome's user-data-dir)
+    instagram.com/0.lock    flock held while a browser uses slot 0
+    instagram.com/1/ ...
+
+Chrome refuses to share a user-data-dir between two running browsers, so
+each domain has ``BROWSER_PROFILE_SLOTS`` slots and a browser holds an
+exclusive ``flock`` on its slot for as long as it runs. The lock is released
+by the kernel if the process dies, so a crashed worker never strands a slot.
+When every slot is taken the browser falls back to a throwaway profile.
+
+Each profile's disk cache is capped at ``BROWSER_PROFILE_CACHE_MB``, and slots
+unused for ``BROWSER_PROFILE_TTL`` seconds are deleted.
+"""
+
+import fcntl
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from core.utils.logger import logger
+
+# Files Chrome uses to detect another browser on the same profile. A slot is
+# only ever used under our flock, so any left over belong to a dead browser.
+SINGLETON_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie")
+
+
+def profile_key(hostname: str) -> str:
+    """Domain a profile is shared by: 'www.instagram.com' and 'instagram.com' are one."""
+    hostname = (hostname or "").lower()
+    return hostname[4:] if hostname.startswith("www.") else hostname
+
+
+class ProfileLease:
+    """Exclusive use of one profile slot, held until :meth:`release`."""
+
+    def __init__(self, key: str, path: Path, lock_file):
+        self.key = key
+        self.path = path
+        self._lock_file = lock_file
+
+    def chrome_arguments(self, cache_mb: int) -> list:
+        return [
+            f"--user-data-dir={self.path}",
+            f"--disk-cache-size={cache_mb * 1024 * 1024}",
+        ]
+
+    def release(self):
+        if self._lock_file is None:
+            return
+        try:
+            # The mtime of the slot is what pruning goes by.
+            os.utime(self.path)
+        except OSError:
+            pass
+        self._lock_file.close()
+        self._lock_file = None
+
+
+class ProfileStore:
+    """Per-domain Chrome profile slots with file locking and TTL pruning."""
+
+    def __init__(
+        self,
+        root,
+        slots: int,
+        cache_mb: int,
+        ttl_seconds: int,
+        prune_interval: int = 3600,
+    ):
+        self.root = Path(root)
+        self.slots = slots
+        self.cache_mb = cache_mb
+        self.ttl_seconds = ttl_seconds
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, "BROWSER_PROFILES_ENABLED", True)
+
+    def lease(self, key: str):
+        """
+        Lock a free profile slot for ``key``.
+
+        Returns:
+            ProfileLease, or None when every slot is in use (or the directory
+            is not writable) and the browser should use a throwaway profile.
+        """
+        if time.time() - self._last_prune > self.prune_interval:
+            self.prune()
+
+        domain_dir = self.root / key
+        try:
+            domain_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(
+                f"Could not create browser profile directory {domain_dir}: {e}"
+            )
+            return None
+
+        for slot in range(self.slots):
+            lock_file = self._try_lock(domain_dir / f"{slot}.lock")
+            if lock_file is None:
+                continue
+            path = domain_dir / str(slot)
+            path.mkdir(exist_ok=True)
+            for name in SINGLETON_FILES:
+                (path / name).unlink(missing_ok=True)
+            return ProfileLease(key, path, lock_file)
+
+        logger.info(
+            f"All {self.slots} browser profiles for {key} are in use; using a fresh one"
+        )
+        return None
+
+    @staticmethod
+    def _try_lock(lock_path: Path):
+        try:
+            lock_file = open(lock_path, "a")
+        except OSError:
+            return None
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    def prune(self) -> dict:
+        """Delete profile slots nobody has used for ``ttl_seconds``."""
+        with self._lock:
+            self._last_prune = time.time()
+            cutoff = time.time() - self.ttl_seconds
+            removed = kept = 0
+            for lock_path in self.root.glob("*/*.lock"):
+                path = lock_path.with_suffix("")
+                lock_file = self._try_lock(lock_path)
+                if lock_file is None:
+                    kept += 1
+                    continue
+                try:
+                    # The lock file itself stays: unlinking it would let two
+                    # processes lock different inodes for the same slot.
+                    if not path.exists():
+                        continue
+                    if path.stat().st_mtime < cutoff:
+                        shutil.rmtree(path, ignore_errors=True)
+                        removed += 1
+                    else:
+                        kept += 1
+                finally:
+                    lock_file.close()
+
+        if removed:
+            logger.info(f"Pruned {removed} unused browser profile(s), {kept} kept")
+        return {"removed": removed, "kept": kept}
+
+
+profile_store = ProfileStore(
+    getattr(settings, "BROWSER_PROFILE_DIR", None)
+    or Path(settings.BASE_DIR) / "browser_profiles",
+    slots=getattr(settings, "BROWSER_PROFILE_SLOTS", 4),
+    cache_mb=getattr(settings, "BROWSER_PROFILE_CACHE_MB", 100),
+    ttl_seconds=getattr(settings, "BROWSER_PROFILE_TTL", 14 * 24 * 60 * 60),
+)
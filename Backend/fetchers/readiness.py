@@ -0,0 +1,93 @@
+"""
+Page readiness conditions for browser fetchers.
+
+A fetcher declares the condition that tells us its follower count has
+rendered; the base class polls it with ``WebDriverWait`` instead of sleeping
+for a fixed amount of time. Each condition is a callable taking the driver,
+so it plugs straight into ``WebDriverWait.until``. ``check_async`` is the same
+check against an :class:`fetchers.cdp.AsyncPage`, for async fetchers.
+"""
+
+import re
+
+from selenium.webdriver.common.by import By
+
+
+class ReadyCondition:
+    """Base class for readiness conditions."""
+
+    def __call__(self, driver) -> bool:
+        raise NotImplementedError
+
+    async def check_async(self, page) -> bool:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class SelectorPresent(ReadyCondition):
+    """Ready once at least one element matches the CSS selector."""
+
+    SCRIPT = "return document.querySelector(arguments[0]) !== null;"
+
+    def __init__(self, css_selector: str):
+        self.css_selector = css_selector
+
+    def __call__(self, driver) -> bool:
+        return bool(driver.find_elements(By.CSS_SELECTOR, self.css_selector))
+
+    async def check_async(self, page) -> bool:
+        return bool(await page.execute_script(self.SCRIPT, self.css_selector))
+
+    def __repr__(self):
+        return f"SelectorPresent({self.css_selector!r})"
+
+
+class TextMatches(ReadyCondition):
+    """Ready once the rendered body text matches the regex."""
+
+    SCRIPT = "return document.body ? document.body.innerText : '';"
+
+    def __init__(self, pattern, flags: int = re.IGNORECASE):
+        self.pattern = (
+            re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+        )
+
+    def __call__(self, driver) -> bool:
+        text = driver.execute_script(self.SCRIPT)
+        return bool(text and self.pattern.search(text))
+
+    async def check_async(self, page) -> bool:
+        text = await page.execute_script(self.SCRIPT)
+        return bool(text and self.pattern.search(text))
+
+    def __repr__(self):
+        return f"TextMatches({self.pattern.pattern!r})"
+
+
+class NetworkIdle(ReadyCondition):
+    """
+    Ready once the DOM is parsed and no resource has finished loading for
+    ``idle_ms`` milliseconds, judged from the Resource Timing buffer.
+    """
+
+    SCRIPT = """
+        if (document.readyState === 'loading') { return false; }
+        const entries = performance.getEntriesByType('resource');
+        let last = 0;
+        for (const entry of entries) { last = Math.max(last, entry.responseEnd); }
+        return performance.now() - last >= arguments[0];
+    """
+
+    def __init__(self, idle_ms: int = 500):
+        self.idle_ms = idle_ms
+
+    def __call__(self, driver) -> bool:
+        return bool(driver.execute_script(self.SCRIPT, self.idle_ms))
+
+    async def check_async(self, page) -> bool:
+        return bool(await page.execute_script(self.SCRIPT, self.idle_ms))
+
+    def __repr__(self):
+        return f"NetworkIdle({self.idle_ms})"
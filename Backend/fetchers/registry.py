@@ -0,0 +1,130 @@
+"""
+Process-wide registry of fetcher classes and instances.
+
+Resolving ``FetchScript.script_path`` means an import plus attribute lookup,
+and a fresh fetcher instance loses whatever it has warmed up. The registry
+resolves each script path once, validates that it names a ``BaseFetcher``
+subclass, and keeps one fetcher instance per platform for as long as its
+script path and page URL stay the same.
+
+FetchScript changes bump a version counter in the shared cache; every worker
+compares it on use and drops its resolved classes and instances when it moves.
+"""
+
+import importlib
+import threading
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from core.utils.cache_keys import CacheKey
+from core.utils.logger import logger
+from fetchers.base import BaseFetcher
+
+
+class FetcherRegistry:
+    """Resolves fetcher classes once and reuses fetcher instances per platform."""
+
+    VERSION_KEY = CacheKey.FETCH_SCRIPTS_VERSION.build()
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._classes = {}
+        self._instances = {}
+        self._version = None
+
+    # ─────────────────────────────── Resolution ───────────────────────────────
+    def resolve(self, script_path: str) -> type:
+        """
+        Return the fetcher class for a dotted script path.
+
+        Raises:
+            ImproperlyConfigured: If the path cannot be imported or does not
+                name a BaseFetcher subclass
+        """
+        with self._lock:
+            fetcher_cls = self._classes.get(script_path)
+            if fetcher_cls is not None:
+                return fetcher_cls
+
+            try:
+                module_path, class_name = script_path.rsplit(".", 1)
+                module = importlib.import_module(module_path)
+                fetcher_cls = getattr(module, class_name)
+            except (ValueError, ImportError, AttributeError) as e:
+                raise ImproperlyConfigured(
+                    f"Cannot resolve fetch script {script_path!r}: {e}"
+                ) from e
+
+            if not (
+                isinstance(fetcher_cls, type) and issubclass(fetcher_cls, BaseFetcher)
+            ):
+                raise ImproperlyConfigured(
+                    f"Fetch script {script_path!r} is not a BaseFetcher subclass"
+                )
+
+            self._classes[script_path] = fetcher_cls
+            return fetcher_cls
+
+    def warm(self) -> dict:
+        """
+        Resolve every FetchScript in the database up front.
+
+        Returns:
+            dict: Script paths that failed to resolve, mapped to the error message
+        """
+        from metrics.models import FetchScript
+
+        self.sync()
+        errors = {}
+        script_paths = FetchScript.objects.values_list("script_path", flat=True)
+        for script_path in script_paths:
+            try:
+                self.resolve(script_path)
+            except ImproperlyConfigured as e:
+                errors[script_path] = str(e)
+                logger.error(str(e))
+
+        logger.info(
+            f"Fetcher registry warmed: {len(self._classes)} resolved, {len(errors)} broken"
+        )
+        return errors
+
+    # ─────────────────────────────── Instances ────────────────────────────────
+    def get_fetcher(self, platform) -> BaseFetcher:
+        """Return the (reused) fetcher instance for a platform."""
+        fetch_script = platform.fetch_script
+        if not fetch_script:
+            raise ImproperlyConfigured(f"No FetchScript linked for {platform.name}")
+
+        self.sync()
+        signature = (fetch_script.script_path, platform.page_url)
+        with self._lock:
+            cached = self._instances.get(platform.pk)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            fetcher = self.resolve(fetch_script.script_path)(platform.page_url)
+            self._instances[platform.pk] = (signature, fetcher)
+            return fetcher
+
+    # ────────────────────────────── Invalidation ──────────────────────────────
+    def sync(self):
+        """Drop everything resolved so far if a FetchScript changed anywhere."""
+        version = cache.get(self.VERSION_KEY, 0)
+        if version != self._version:
+            with self._lock:
+                self._classes.clear()
+                self._instances.clear()
+                self._version = version
+
+    @classmethod
+    def bump_version(cls):
+        """Tell every worker's registry that FetchScripts changed."""
+        try:
+            cache.incr(cls.VERSION_KEY)
+        except ValueError:
+            cache.set(cls.VERSION_KEY, 1, timeout=None)
+
+
+fetcher_registry = FetcherRegistry()
@@ -0,0 +1,143 @@
+"""
+Remote browser nodes for the browser tier.
+
+With ``BROWSER_REMOTE_URLS`` set, pooled sessions are opened on remote
+WebDriver endpoints (Selenium Grid or standalone nodes, or plain chromedriver
+servers) instead of a Chrome launched next to the worker, so browser capacity
+scales on its own and worker images need no Chrome at all.
+
+* Load balancing: a new session goes to the node with the fewest sessions this
+  process has leased from it, ties broken round robin.
+* Failover: a node that cannot open a session is put in cooldown for
+  ``BROWSER_REMOTE_NODE_COOLDOWN`` seconds and the next node is tried.
+* Leasing: remote sessions are pooled, health-checked and recycled by
+  ``BrowserPool`` exactly like local ones; a node's lease is given back when its
+  session quits.
+
+Sessions reach Chrome's DevTools through the ``/goog/cdp/execute`` passthrough
+chromedriver and Selenium Grid both expose, so per-lease blocked URLs and user
+agent overrides keep working. See :mod:`fetchers.farm` for a local stand-in farm.
+"""
+
+import os
+import threading
+import time
+
+from django.conf import settings
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from core.utils.logger import logger
+
+
+class RemoteChromeDriver(webdriver.Remote):
+    """webdriver.Remote for a Chrome node, plus Chrome's CDP command passthrough."""
+
+    def __init__(self, node_url: str, options):
+        connection = ChromiumRemoteConnection(
+            remote_server_addr=node_url,
+            vendor_prefix="goog",
+            browser_name="chrome",
+        )
+        super().__init__(command_executor=connection, options=options)
+        self.node_url = node_url
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})[
+            "value"
+        ]
+
+
+class RemoteNodePool:
+    """Least-loaded selection, cooldown-based failover and lease counts across nodes."""
+
+    def __init__(self, urls, cooldown: float):
+        self.urls = [url.rstrip("/") for url in urls]
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._leases = {url: 0 for url in self.urls}
+        self._down_until = {url: 0.0 for url in self.urls}
+        self._next = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.urls)
+
+    def candidates(self) -> list:
+        """Nodes in the order a new session should try them."""
+        now = time.monotonic()
+        with self._lock:
+            if self._pid != os.getpid():
+                # Leases inherited across fork belong to the parent's sessions.
+                self._reset()
+            rotation = self.urls[self._next :] + self.urls[: self._next]
+            self._next = (self._next + 1) % len(self.urls)
+            up = [url for url in rotation if self._down_until[url] <= now]
+            down = [url for url in rotation if self._down_until[url] > now]
+            # Stable sort: equally loaded nodes keep their round-robin order.
+            up.sort(key=self._leases.get)
+            # Nodes in cooldown are still tried last, soonest to recover first.
+            down.sort(key=self._down_until.get)
+        return up + down
+
+    def open_session(self, options):
+        """
+        Open a session on the best available node, failing over to the others.
+
+        Returns:
+            tuple: (RemoteChromeDriver, node URL)
+
+        Raises:
+            WebDriverException: If no node could open a session
+        """
+        errors = []
+        for url in self.candidates():
+            try:
+                driver = RemoteChromeDriver(url, options)
+            except (WebDriverException, Urllib3HTTPError, OSError) as e:
+                self._mark_down(url, e)
+                errors.append(f"{url}: {e}")
+                continue
+            with self._lock:
+                self._down_until[url] = 0.0
+                self._leases[url] += 1
+            logger.debug(f"Opened remote browser session on {url}")
+            return driver, url
+        raise WebDriverException(
+            f"No remote browser node could open a session ({'; '.join(errors)})"
+        )
+
+    def release(self, url: str):
+        with self._lock:
+            if url in self._leases and self._pid == os.getpid():
+                self._leases[url] = max(self._leases[url] - 1, 0)
+
+    def _mark_down(self, url: str, error):
+        with self._lock:
+            self._down_until[url] = time.monotonic() + self.cooldown
+        logger.warning(
+            f"Remote browser node {url} failed, cooling down {self.cooldown}s: {error}"
+        )
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                url: {
+                    "leases": self._leases[url],
+                    "down_for": max(round(self._down_until[url] - now), 0),
+                }
+                for url in self.urls
+            }
+
+
+remote_nodes = RemoteNodePool(
+    getattr(settings, "BROWSER_REMOTE_URLS", []),
+    cooldown=getattr(settings, "BROWSER_REMOTE_NODE_COOLDOWN", 60),
+)
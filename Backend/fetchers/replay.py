@@ -0,0 +1,240 @@
+"""
+Record/replay of fetcher traffic for offline work on extraction and performance.
+
+``FETCH_REPLAY_MODE`` (or :func:`set_replay_mode`) selects one of:
+
+* ``"off"``    - normal live fetching.
+* ``"record"`` - fetch live and store every HTTP response body and every
+  rendered browser page under ``FETCH_FIXTURES_DIR``.
+* ``"replay"`` - never touch the network. HTTP requests are answered by a
+  local stand-in server serving the recorded bodies, and the browser tier runs
+  against :class:`FakeDriver`, a file-backed stand-in for a WebDriver that
+  understands the scripts our readiness conditions and extractors send.
+
+``FETCH_REPLAY_BROWSER = "chrome"`` replays the browser tier through a real
+pooled Chrome pointed at the stand-in server instead, which is slower but
+exercises driver startup, navigation and readiness for benchmarking.
+"""
+
+import hashlib
+import re
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlparse
+
+from django.conf import settings
+from selenium.webdriver.common.by import By
+
+from core.utils.logger import logger
+from fetchers.extraction import SelectorText, TextNodeMatch
+from fetchers.parsing import make_soup
+from fetchers.readiness import NetworkIdle, SelectorPresent, TextMatches
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (OFF, RECORD, REPLAY)
+
+HTTP_FIXTURE = "http"
+BROWSER_FIXTURE = "browser"
+
+REPLAY_BROWSERS = ("fake", "chrome")
+
+_mode_override = None
+_browser_override = None
+
+
+def replay_mode() -> str:
+    return _mode_override or getattr(settings, "FETCH_REPLAY_MODE", OFF)
+
+
+def replay_browser() -> str:
+    return _browser_override or getattr(settings, "FETCH_REPLAY_BROWSER", "fake")
+
+
+def set_replay_mode(mode: str = None):
+    """Override FETCH_REPLAY_MODE for this process; ``None`` restores the setting."""
+    global _mode_override
+    if mode is not None and mode not in MODES:
+        raise ValueError(f"Unknown replay mode: {mode!r}")
+    _mode_override = mode
+
+
+def set_replay_browser(browser: str = None):
+    """Override FETCH_REPLAY_BROWSER for this process; ``None`` restores the setting."""
+    global _browser_override
+    if browser is not None and browser not in REPLAY_BROWSERS:
+        raise ValueError(f"Unknown replay browser: {browser!r}")
+    _browser_override = browser
+
+
+@contextmanager
+def replay_mode_override(mode: str):
+    previous = _mode_override
+    set_replay_mode(mode)
+    try:
+        yield
+    finally:
+        set_replay_mode(previous)
+
+
+class FixtureMissing(ValueError):
+    """No recorded response exists for a URL in replay mode."""
+
+
+class FixtureStore:
+    """Recorded bodies on disk, one file per (kind, URL)."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path_for(self, kind: str, url: str) -> Path:
+        host = re.sub(r"[^a-z0-9]+", "-", (urlparse(url).hostname or "local").lower())
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+        return self.root / kind / f"{host}-{digest}.html"
+
+    def save(self, kind: str, url: str, body: str) -> Path:
+        path = self.path_for(kind, url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding="utf-8")
+        logger.debug(f"Recorded {kind} fixture for {url} -> {path}")
+        return path
+
+    def load(self, kind: str, url: str) -> str:
+        path = self.path_for(kind, url)
+        if not path.exists():
+            raise FixtureMissing(f"No {kind} fixture recorded for {url} ({path})")
+        return path.read_text(encoding="utf-8")
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    store: FixtureStore = None
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        original = query.get("url", [""])[0]
+        kind = query.get("kind", [HTTP_FIXTURE])[0]
+        if kind not in (HTTP_FIXTURE, BROWSER_FIXTURE):
+            self.send_error(400, f"Unknown fixture kind: {kind}")
+            return
+        try:
+            body = self.store.load(kind, original).encode("utf-8")
+        except FixtureMissing as e:
+            self.send_error(404, str(e))
+            return
+        content_type = "application/json" if body[:1] in (b"{", b"[") else "text/html"
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"replay server: {format % args}")
+
+
+class ReplayServer:
+    """Local stand-in HTTP server that answers with recorded bodies."""
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+        self._server = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._server is None:
+                handler = type(
+                    "ReplayHandler", (_ReplayHandler,), {"store": self.store}
+                )
+                self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+                threading.Thread(
+                    target=self._server.serve_forever, name="replay-server", daemon=True
+                ).start()
+                logger.info(f"Replay server listening on port {self.port}")
+        return self
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def url_for(self, original_url: str, kind: str = HTTP_FIXTURE) -> str:
+        self.start()
+        return (
+            f"http://127.0.0.1:{self.port}/?kind={kind}"
+            f"&url={quote(original_url, safe='')}"
+        )
+
+    def stop(self):
+        with self._lock:
+            if self._server is not None:
+                self._server.shutdown()
+                self._server.server_close()
+                self._server = None
+
+
+class FakeDriver:
+    """
+    File-backed stand-in for a Chrome WebDriver in replay mode.
+
+    Pages come from the fixture store, and the JS our readiness conditions
+    and in-page extractors send is emulated against a parsed copy of the page.
+    """
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+        self.current_url = None
+        self.page_source = ""
+        self._soup = None
+
+    def get(self, url: str):
+        self.current_url = url
+        self.page_source = self.store.load(BROWSER_FIXTURE, url)
+        self._soup = make_soup(self.page_source)
+
+    @property
+    def title(self) -> str:
+        return self._soup.title.get_text() if self._soup and self._soup.title else ""
+
+    def find_elements(self, by, value):
+        if by != By.CSS_SELECTOR or self._soup is None:
+            return []
+        return self._soup.select(value)
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def execute_script(self, script, *args):
+        soup = self._soup
+        if script == TextMatches.SCRIPT:
+            return soup.get_text(" ") if soup else ""
+        if script == NetworkIdle.SCRIPT:
+            return True
+        if script == SelectorPresent.SCRIPT:
+            return bool(soup and soup.select_one(args[0]))
+        if script == SelectorText.SCRIPT:
+            elements = soup.select(args[0])[: args[1]] if soup else []
+            return [el.get_text(" ") for el in elements]
+        if script == TextNodeMatch.SCRIPT:
+            flags = re.IGNORECASE if "i" in args[1] else 0
+            pattern = re.compile(args[0], flags)
+            body = soup.body if soup and soup.body else soup
+            for text in body.find_all(string=True) if body else []:
+                if pattern.search(text):
+                    return str(text)
+            return None
+        if script.strip() == "return 1":
+            return 1
+        return None
+
+    def quit(self):
+        pass
+
+
+fixture_store = FixtureStore(
+    getattr(settings, "FETCH_FIXTURES_DIR", None)
+    or Path(settings.BASE_DIR) / "fetchers" / "fixtures"
+)
+replay_server = ReplayServer(fixture_store)
@@ -0,0 +1,233 @@
+"""
+Rate limiting and circuit breaking around fetchers.
+
+``DomainRateLimiter`` is a Redis token bucket shared by every worker, so we
+never hit one site faster than its configured rate no matter how many refreshes
+run at once. ``CircuitBreaker`` stops fetching a platform after repeated
+failures: while it is open fetches are refused outright (negative caching),
+after the cooldown a single half-open trial is let through, and a success
+closes it again. Callers keep serving the last cached count while a platform
+is skipped.
+"""
+
+import time
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from core.utils.cache_keys import CacheKey
+from core.utils.logger import logger
+from fetchers.replay import REPLAY, replay_mode
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class FetchSkipped(Exception):
+    """A fetch was not attempted; the platform's cached count is still the latest."""
+
+
+class CircuitOpenError(FetchSkipped):
+    pass
+
+
+class RateLimitedError(FetchSkipped):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DomainRateLimiter:
+    """Token bucket per target domain, kept in Redis and refilled by Redis' own clock."""
+
+    SCRIPT = """
+        local rate = tonumber(ARGV[1])
+        local capacity = tonumber(ARGV[2])
+        local clock = redis.call('TIME')
+        local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+        local tokens = tonumber(bucket[1]) or capacity
+        local ts = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + (now - ts) * rate)
+        local wait = 0
+        if tokens >= 1 then
+            tokens = tokens - 1
+        else
+            wait = (1 - tokens) / rate
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+        return tostring(wait)
+    """
+
+    def __init__(self):
+        self._script = None
+
+    @staticmethod
+    def limits_for(domain: str):
+        """Return (tokens per second, burst capacity) for a domain."""
+        per_minute = getattr(settings, "FETCH_DOMAIN_RATE_LIMITS", {}).get(
+            domain, getattr(settings, "FETCH_RATE_LIMIT_PER_MINUTE", 6)
+        )
+        burst = getattr(settings, "FETCH_RATE_LIMIT_BURST", 3)
+        return per_minute / 60, burst
+
+    def try_acquire(self, domain: str) -> float:
+        """Take a token if one is available. Returns 0, or the seconds until one will be."""
+        if self._script is None:
+            self._script = get_redis_connection("default").register_script(self.SCRIPT)
+        rate, capacity = self.limits_for(domain)
+        key = CacheKey.DOMAIN_RATE_LIMIT.build(domain=domain)
+        return float(self._script(keys=[key], args=[rate, capacity]))
+
+    def acquire(self, domain: str, max_wait: float = None):
+        """
+        Block until a token is available for the domain.
+
+        Raises:
+            RateLimitedError: If the wait would exceed ``max_wait`` seconds
+        """
+        if max_wait is None:
+            max_wait = getattr(settings, "FETCH_RATE_LIMIT_MAX_WAIT", 30)
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(domain)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitedError(
+                    f"Rate limit for {domain} exceeded; next slot in {wait:.1f}s", wait
+                )
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Per-platform closed/open/half-open breaker kept in the shared cache."""
+
+    def __init__(self, platform_name: str):
+        self.platform_name = platform_name
+        self.failures_key = CacheKey.CIRCUIT_FAILURES.build(name=platform_name)
+        self.open_key = CacheKey.CIRCUIT_OPEN.build(name=platform_name)
+        self.trial_key = CacheKey.CIRCUIT_TRIAL.build(name=platform_name)
+        self.threshold = getattr(settings, "CIRCUIT_BREAKER_FAILURE_THRESHOLD", 3)
+        self.cooldown = getattr(settings, "CIRCUIT_BREAKER_COOLDOWN", 600)
+        self.window = getattr(settings, "CIRCUIT_BREAKER_FAILURE_WINDOW", 3600)
+
+    @property
+    def state(self) -> str:
+        if cache.get(self.open_key):
+            return OPEN
+        if cache.get(self.failures_key, 0) >= self.threshold:
+            return HALF_OPEN
+        return CLOSED
+
+    def before_request(self) -> bool:
+        """
+        Raise if the platform must not be fetched right now. In the half-open
+        state only one caller (cluster-wide) gets the trial request.
+
+        Returns:
+            bool: Whether this caller took the half-open trial
+        """
+        state = self.state
+        if state == OPEN:
+            raise CircuitOpenError(f"Circuit open for {self.platform_name}")
+        if state != HALF_OPEN:
+            return False
+        if not cache.add(self.trial_key, True, self.cooldown):
+            raise CircuitOpenError(
+                f"Circuit half-open for {self.platform_name}; trial in flight"
+            )
+        return True
+
+    def release_trial(self):
+        """Let another caller run the half-open trial."""
+        cache.delete(self.trial_key)
+
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.info(f"Circuit closed for {self.platform_name}")
+        cache.delete_many([self.failures_key, self.open_key, self.trial_key])
+
+    def record_failure(self):
+        cache.add(self.failures_key, 0, self.window)
+        try:
+            failures = cache.incr(self.failures_key)
+        except ValueError:
+            failures = 1
+            cache.set(self.failures_key, failures, self.window)
+
+        if failures >= self.threshold:
+            cache.set(self.open_key, True, self.cooldown)
+            cache.delete(self.trial_key)
+            logger.warning(
+                f"Circuit opened for {self.platform_name} after {failures} failures; "
+                f"serving cached count for {self.cooldown}s"
+            )
+
+
+class FetchGuard:
+    """
+    Breaker check and rate limit around a single platform fetch.
+
+    Usage::
+
+        guard = FetchGuard(platform)
+        guard.enter()              # may raise FetchSkipped
+        try:
+            count = fetcher.fetch_followers_count()
+        except FetchSkipped:
+            guard.record_skipped()
+            raise
+        except Exception:
+            guard.record_failure()
+            raise
+        guard.record_success()
+    """
+
+    def __init__(self, platform):
+        self.breaker = CircuitBreaker(platform.name)
+        self.domain = urlparse(platform.page_url).hostname or ""
+        self.trial = False
+
+    def enter(self, rate_limit: bool = True):
+        """
+        Check the breaker and take a rate-limit token for the platform's domain.
+        Pass ``rate_limit=False`` for fetchers that take tokens per request themselves.
+        """
+        self.trial = self.breaker.before_request()
+        # Replayed fetches never reach the real site, so they don't spend its tokens.
+        if rate_limit and self.domain and replay_mode() != REPLAY:
+            try:
+                domain_rate_limiter.acquire(self.domain)
+            except RateLimitedError:
+                self.record_skipped()
+                raise
+
+    def try_acquire_extra(self) -> bool:
+        """Take one more token without waiting, e.g. for a hedged request."""
+        if not self.domain or replay_mode() == REPLAY:
+            return True
+        return domain_rate_limiter.try_acquire(self.domain) <= 0
+
+    def record_success(self):
+        self.breaker.record_success()
+
+    def record_failure(self):
+        self.breaker.record_failure()
+
+    def record_skipped(self):
+        """
+        The fetch was skipped before it reached the site, e.g. by our own rate
+        limiter. That says nothing about the site, so a half-open trial this
+        guard took is given back instead of being held for the whole cooldown.
+        """
+        if self.trial:
+            self.breaker.release_trial()
+            self.trial = False
+
+
+domain_rate_limiter = DomainRateLimiter()
@@ -0,0 +1,238 @@
+"""
+On-disk store of raw page snapshots taken during fetches.
+
+With ``FETCH_SNAPSHOTS_ENABLED`` every HTTP body and rendered browser page a
+fetcher sees is kept, so a wrong or failed count can be investigated (and
+re-parsed) without loading the page again. Layout under ``FETCH_SNAPSHOTS_DIR``::
+
+    blobs/ab/abcdef....zst      page bodies, content-addressed by SHA-256
+    refs/<url hash>/<ms>.json   one small record per fetch, pointing at a blob
+
+Identical pages are stored once. Bodies are compressed with zstd (the
+``zstandard`` dependency), or with gzip where it is not installed. Records
+older than ``FETCH_SNAPSHOT_TTL`` are dropped, then the oldest records go
+until the blobs fit in ``FETCH_SNAPSHOT_MAX_MB``. A blob is deleted once no
+record points at it.
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+
+from core.utils.logger import logger
+
+ZSTD = ".zst"
+GZIP = ".gz"
+
+
+def zstd_available() -> bool:
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == ZSTD:
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == ZSTD:
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _atomic_write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class SnapshotStore:
+    """Content-addressed, compressed snapshots with TTL and size-based eviction."""
+
+    def __init__(
+        self, root, ttl_seconds: int, max_bytes: int, prune_interval: int = 600
+    ):
+        self.root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.prune_interval = prune_interval
+        self.codec = ZSTD if zstd_available() else GZIP
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, "FETCH_SNAPSHOTS_ENABLED", False)
+
+    @staticmethod
+    def url_key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+    def _blob_path(self, digest: str, codec: str) -> Path:
+        return self.root / "blobs" / digest[:2] / f"{digest}{codec}"
+
+    # ─────────────────────────────── Writing ──────────────────────────────────
+    def save(self, url: str, tier: str, body: str, fetcher: str = None) -> str:
+        """Store a page body and a record of this fetch. Returns the body's digest."""
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self._find_blob(digest)
+        if existing is None:
+            _atomic_write(
+                self._blob_path(digest, self.codec), _compress(data, self.codec)
+            )
+        else:
+            # Freshen it so a concurrent prune does not treat it as unreferenced.
+            os.utime(existing)
+
+        taken_at = time.time()
+        record = {
+            "url": url,
+            "tier": tier,
+            "fetcher": fetcher,
+            "digest": digest,
+            "size": len(data),
+            "taken_at": taken_at,
+        }
+        ref = (
+            self.root
+            / "refs"
+            / self.url_key(url)
+            / f"{int(taken_at * 1000)}-{tier}.json"
+        )
+        _atomic_write(ref, json.dumps(record).encode("utf-8"))
+
+        if taken_at - self._last_prune > self.prune_interval:
+            self.prune()
+        return digest
+
+    def capture(self, url: str, tier: str, body: str, fetcher: str = None):
+        """save() if snapshots are enabled; a full disk must never fail the fetch itself."""
+        if not self.enabled or not body:
+            return None
+        try:
+            return self.save(url, tier, body, fetcher=fetcher)
+        except OSError as e:
+            logger.warning(f"Could not store snapshot of {url}: {e}")
+            return None
+
+    # ─────────────────────────────── Reading ──────────────────────────────────
+    def records(self, url: str, tier: str = None) -> list:
+        """Snapshot records for a URL, newest first."""
+        directory = self.root / "refs" / self.url_key(url)
+        records = []
+        for ref in sorted(directory.glob("*.json"), reverse=True):
+            try:
+                record = json.loads(ref.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if tier is None or record.get("tier") == tier:
+                records.append(record)
+        return records
+
+    def latest(self, url: str, tier: str = None):
+        records = self.records(url, tier)
+        return records[0] if records else None
+
+    def load(self, digest: str) -> str:
+        path = self._find_blob(digest)
+        if path is None:
+            raise FileNotFoundError(f"Snapshot {digest} has been evicted")
+        return _decompress(path.read_bytes(), path.suffix).decode("utf-8")
+
+    def _find_blob(self, digest: str):
+        for codec in (ZSTD, GZIP):
+            path = self._blob_path(digest, codec)
+            if path.exists():
+                return path
+        return None
+
+    # ─────────────────────────────── Eviction ─────────────────────────────────
+    def prune(self) -> dict:
+        """Drop expired records, then the oldest ones while over the size budget."""
+        with self._lock:
+            self._last_prune = time.time()
+            refs = []
+            for ref in (self.root / "refs").glob("*/*.json"):
+                try:
+                    record = json.loads(ref.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    ref.unlink(missing_ok=True)
+                    continue
+                refs.append((record.get("taken_at", 0), ref, record.get("digest")))
+            refs.sort()
+
+            cutoff = time.time() - self.ttl_seconds
+            expired = [entry for entry in refs if entry[0] < cutoff]
+            kept = [entry for entry in refs if entry[0] >= cutoff]
+
+            blobs, sizes = {}, {}
+            # Blobs this young may belong to a record another process is still writing.
+            settled = time.time() - 60
+            for path in (self.root / "blobs").glob("*/*"):
+                if path.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                digest = path.name.split(".")[0]
+                sizes[digest] = stat.st_size
+                if stat.st_mtime < settled:
+                    blobs[digest] = path
+
+            references = Counter(entry[2] for entry in kept)
+            total = sum(sizes.get(digest, 0) for digest in references)
+            evicted = []
+            while kept and total > self.max_bytes:
+                entry = kept.pop(0)
+                evicted.append(entry)
+                references[entry[2]] -= 1
+                if references[entry[2]] == 0:
+                    total -= sizes.get(entry[2], 0)
+
+            for _, ref, _ in expired + evicted:
+                ref.unlink(missing_ok=True)
+            removed_blobs = 0
+            for digest, path in blobs.items():
+                if references[digest] <= 0:
+                    path.unlink(missing_ok=True)
+                    removed_blobs += 1
+
+        result = {
+            "expired": len(expired),
+            "evicted": len(evicted),
+            "blobs_removed": removed_blobs,
+            "records": len(kept),
+        }
+        if expired or evicted or removed_blobs:
+            logger.info(f"Pruned snapshot store: {result}")
+        return result
+
+
+snapshot_store = SnapshotStore(
+    getattr(settings, "FETCH_SNAPSHOTS_DIR", None)
+    or Path(settings.BASE_DIR) / "snapshots",
+    ttl_seconds=getattr(settings, "FETCH_SNAPSHOT_TTL", 7 * 24 * 60 * 60),
+    max_bytes=getattr(settings, "FETCH_SNAPSHOT_MAX_MB", 500) * 1024 * 1024,
+)
@@ -0,0 +1,169 @@
+"""
+Extraction strategy memory.
+
+Several parsers try a list of fallback strategies on the same page (a
+followers link, a ``<strong>`` inside it, a full-text regex scan, ...).
+Instead of always starting from the top, :meth:`BaseFetcher._extract_with_strategies`
+asks :data:`strategy_memory` for an order: strategies that usually find the
+count, and find it cheaply, go first. After each parse the winner, every
+strategy that missed, and how long each took are written back to a Redis hash
+per platform, by one Lua script, so workers parsing the same platform at the
+same time never overwrite each other's results.
+
+When the winning strategy changes, the page layout has probably drifted. That
+is logged, and counted in the stats shown by ``diagnose_platforms``.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from core.utils.cache_keys import CacheKey
+from core.utils.logger import logger
+
+# Weight of the newest duration in each strategy's moving average.
+COST_SMOOTHING = 0.2
+
+
+class ParsedPage:
+    """
+    A page handed to extraction strategies. Soups are built on first use and
+    shared, so strategies reading the same tags do not parse the page twice.
+    """
+
+    def __init__(self, fetcher, source: str):
+        self.source = source
+        self._fetcher = fetcher
+        self._soups = {}
+
+    def soup(self, parse_only=None):
+        key = id(parse_only)
+        if key not in self._soups:
+            self._soups[key] = self._fetcher._make_soup(
+                self.source, parse_only=parse_only
+            )
+        return self._soups[key]
+
+
+def strategy_scope(fetcher) -> str:
+    """Stats are kept per fetcher class and profile URL, i.e. per platform."""
+    url = getattr(fetcher, "platform_url", "") or ""
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    return f"{type(fetcher).__name__}:{digest}"
+
+
+class StrategyMemory:
+    """Success and cost history of extraction strategies, kept in a Redis hash."""
+
+    # Hash fields are "<strategy>|wins", "<strategy>|misses", "<strategy>|avg_ms"
+    # and "<strategy>|last_win", plus "winner" and "drift". Returns the previous
+    # winner when this parse's winner replaces it.
+    SCRIPT = """
+        local winner, now, smoothing = ARGV[1], ARGV[2], tonumber(ARGV[3])
+        for i = 4, #ARGV, 3 do
+            local name, elapsed = ARGV[i], tonumber(ARGV[i + 1])
+            if ARGV[i + 2] == '1' then
+                redis.call('HINCRBY', KEYS[1], name .. '|wins', 1)
+                redis.call('HSET', KEYS[1], name .. '|last_win', now)
+            else
+                redis.call('HINCRBY', KEYS[1], name .. '|misses', 1)
+            end
+            local previous = tonumber(redis.call('HGET', KEYS[1], name .. '|avg_ms'))
+            if previous then
+                elapsed = previous + smoothing * (elapsed - previous)
+            end
+            redis.call('HSET', KEYS[1], name .. '|avg_ms', string.format('%.3f', elapsed))
+        end
+        if winner == '' then
+            return ''
+        end
+        local previous = redis.call('HGET', KEYS[1], 'winner')
+        redis.call('HSET', KEYS[1], 'winner', winner)
+        if previous and previous ~= winner then
+            redis.call('HINCRBY', KEYS[1], 'drift', 1)
+            return previous
+        end
+        return ''
+    """
+
+    def __init__(self):
+        self._script = None
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, "FETCH_STRATEGY_MEMORY", True)
+
+    @staticmethod
+    def _key(scope: str) -> str:
+        return CacheKey.FETCH_STRATEGY_STATS.build(scope=scope)
+
+    def stats(self, scope: str) -> dict:
+        """``{"strategies": {name: {...}}, "winner": name, "drift": n}`` for a scope."""
+        fields = get_redis_connection("default").hgetall(self._key(scope))
+        stats = {"strategies": {}, "winner": None, "drift": 0}
+        for field, value in fields.items():
+            field, value = field.decode(), value.decode()
+            if field == "winner":
+                stats["winner"] = value
+            elif field == "drift":
+                stats["drift"] = int(value)
+            else:
+                name, _, stat = field.rpartition("|")
+                entry = stats["strategies"].setdefault(
+                    name, {"wins": 0, "misses": 0, "avg_ms": None, "last_win": None}
+                )
+                entry[stat] = int(value) if stat in ("wins", "misses") else float(value)
+        return stats
+
+    def order(self, scope: str, strategies) -> list:
+        """
+        Strategies sorted by expected cost: average duration divided by the
+        (smoothed) success rate. Untried strategies are assumed as costly as the
+        worst known one, and ties keep the declared order.
+        """
+        strategies = list(strategies)
+        if not self.enabled:
+            return strategies
+        known = self.stats(scope)["strategies"]
+        costs = [entry["avg_ms"] for entry in known.values() if entry.get("avg_ms")]
+        unknown_cost = max(costs) if costs else 1.0
+
+        def expected_cost(indexed):
+            index, name = indexed
+            entry = known.get(name)
+            if not entry:
+                return (unknown_cost / 0.5, index)
+            rate = (entry["wins"] + 1) / (entry["wins"] + entry["misses"] + 2)
+            return ((entry.get("avg_ms") or unknown_cost) / rate, index)
+
+        return [name for _, name in sorted(enumerate(strategies), key=expected_cost)]
+
+    def record(self, scope: str, outcomes, winner: str = None):
+        """
+        Store one parse's results in a single atomic round trip.
+
+        Args:
+            scope: See :func:`strategy_scope`
+            outcomes: (strategy name, milliseconds, succeeded) for each strategy tried
+            winner: The strategy that produced the count, if any
+        """
+        if not self.enabled:
+            return
+        if self._script is None:
+            self._script = get_redis_connection("default").register_script(self.SCRIPT)
+        args = [winner or "", time.time(), COST_SMOOTHING]
+        for name, elapsed_ms, succeeded in outcomes:
+            args.extend([name, elapsed_ms, 1 if succeeded else 0])
+        previous = self._script(keys=[self._key(scope)], args=args).decode()
+        if previous:
+            logger.warning(
+                f"Extraction strategy drift for {scope}: {previous} -> {winner}"
+            )
+
+    def reset(self, scope: str):
+        get_redis_connection("default").delete(self._key(scope))
+
+
+strategy_memory = StrategyMemory()
@@ -0,0 +1,115 @@
+"""
+Local stand-in for batch counts APIs.
+
+:class:`StubApiServer` answers ``GET /?<id param>=a,b,c`` with the counts it
+was given, in the YouTube Data API ``channels.list`` shape by default, and
+remembers every batch of IDs it was asked for. Point a BatchApiFetcher at it
+(``YOUTUBE_API_URL`` for YoutubeApiFetcher) to exercise batching without
+credentials or network, and check how many requests a refresh really sent::
+
+    server = StubApiServer({"UC...": 1200, "UC...": 56}).start()
+    # settings.YOUTUBE_API_URL = server.url
+    ...
+    assert len(server.batches) == math.ceil(len(platforms) / 50)
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from core.utils.logger import logger
+
+
+def youtube_channels(counts: dict) -> dict:
+    """channels.list?part=statistics response for the given channel counts."""
+    return {
+        "kind": "youtube#channelListResponse",
+        "items": [
+            {
+                "kind": "youtube#channel",
+                "id": channel_id,
+                "statistics": {"subscriberCount": str(count)},
+            }
+            for channel_id, count in counts.items()
+        ],
+    }
+
+
+class _StubApiHandler(BaseHTTPRequestHandler):
+    server_ref: "StubApiServer" = None
+
+    def do_GET(self):
+        stub = self.server_ref
+        query = parse_qs(urlparse(self.path).query)
+        ids = [i for i in ",".join(query.get(stub.id_param, [])).split(",") if i]
+        if len(ids) > stub.max_ids:
+            self.send_error(400, f"At most {stub.max_ids} ids per request")
+            return
+        stub.record(ids)
+
+        found = {i: stub.counts[i] for i in ids if i in stub.counts}
+        body = json.dumps(stub.render(found)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"stub api: {format % args}")
+
+
+class StubApiServer:
+    """Serves fixed account counts over HTTP on 127.0.0.1, like an official batch API."""
+
+    def __init__(
+        self,
+        counts: dict,
+        id_param: str = "id",
+        max_ids: int = 50,
+        render=youtube_channels,
+        port: int = 0,
+    ):
+        self.counts = dict(counts)
+        self.id_param = id_param
+        self.max_ids = max_ids
+        self.render = render
+        self.batches = []
+        self._requested_port = port
+        self._server = None
+        self._lock = threading.Lock()
+
+    def record(self, ids):
+        with self._lock:
+            self.batches.append(ids)
+
+    def start(self):
+        with self._lock:
+            if self._server is None:
+                handler = type(
+                    "StubApiHandler", (_StubApiHandler,), {"server_ref": self}
+                )
+                self._server = ThreadingHTTPServer(
+                    ("127.0.0.1", self._requested_port), handler
+                )
+                threading.Thread(
+                    target=self._server.serve_forever, name="stub-api", daemon=True
+                ).start()
+                logger.info(f"Stub API listening on {self.url}")
+        return self
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/"
+
+    def stop(self):
+        with self._lock:
+            if self._server is not None:
+                self._server.shutdown()
+                self._server.server_close()
+                self._server = None
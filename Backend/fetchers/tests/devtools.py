@@ -0,0 +1,141 @@
+"""
+A stand-in for Chrome's DevTools websocket, for testing the CDP client offline.
+
+It answers the commands :mod:`fetchers.cdp` sends. Tabs load pages from the
+replay fixtures, and ``Runtime.evaluate`` runs the script through
+:class:`fetchers.replay.FakeDriver`, so readiness conditions and in-page
+extractors behave as they do in fake-browser replay.
+"""
+
+import asyncio
+import itertools
+import json
+import re
+import threading
+from urllib.parse import parse_qs, urlparse
+
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (
+    AcceptConnection,
+    CloseConnection,
+    Request,
+    TextMessage,
+)
+
+from fetchers.replay import FakeDriver, FixtureMissing, fixture_store
+
+EXPRESSION_RE = re.compile(r"^\(function\(\) \{ (.*) \}\)\.apply\(null, (.*)\)$", re.S)
+OUTER_HTML = "return document.documentElement.outerHTML;"
+
+
+class FakeDevTools:
+    """DevTools endpoint on its own thread and event loop; ``ws_url`` connects to it."""
+
+    def __init__(self):
+        self.commands = []
+        self.handshakes = 0
+        self._pages = {}
+        self._ids = itertools.count(1)
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+        self._connections = set()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="fake-devtools", daemon=True
+        )
+
+    def start(self) -> "FakeDevTools":
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._serve, "127.0.0.1", 0), self._loop
+        ).result()
+        return self
+
+    @property
+    def ws_url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}/devtools/browser/fake"
+
+    def stop(self):
+        async def close():
+            self._server.close()
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop.close()
+
+    async def _serve(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        ws = WSConnection(ConnectionType.SERVER)
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                ws.receive_data(data)
+                for event in ws.events():
+                    if isinstance(event, Request):
+                        self.handshakes += 1
+                        writer.write(ws.send(AcceptConnection()))
+                    elif isinstance(event, TextMessage):
+                        reply = self._handle(json.loads(event.data))
+                        writer.write(ws.send(TextMessage(data=json.dumps(reply))))
+                    elif isinstance(event, CloseConnection):
+                        writer.write(ws.send(event.response()))
+                        return
+                await writer.drain()
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    def _handle(self, message: dict) -> dict:
+        method, params = message["method"], message.get("params", {})
+        self.commands.append(method)
+        reply = {"id": message["id"]}
+        if "sessionId" in message:
+            reply["sessionId"] = message["sessionId"]
+        page = self._pages.get(message.get("sessionId"))
+
+        if method == "Target.createTarget":
+            reply["result"] = {"targetId": f"target-{next(self._ids)}"}
+        elif method == "Target.attachToTarget":
+            session_id = f"session-{params['targetId']}"
+            self._pages[session_id] = FakeDriver(fixture_store)
+            reply["result"] = {"sessionId": session_id}
+        elif method == "Target.closeTarget":
+            self._pages.pop(f"session-{params['targetId']}", None)
+            reply["result"] = {"success": True}
+        elif method == "Page.navigate":
+            reply["result"] = self._navigate(page, params["url"])
+        elif method == "Runtime.evaluate":
+            reply["result"] = self._evaluate(page, params["expression"])
+        else:
+            reply["result"] = {}
+        return reply
+
+    @staticmethod
+    def _navigate(page, url: str) -> dict:
+        # Replayed navigations point at the replay server; load its fixture directly.
+        query = parse_qs(urlparse(url).query)
+        try:
+            page.get(query["url"][0])
+        except (KeyError, FixtureMissing):
+            return {"frameId": "frame", "errorText": "net::ERR_FILE_NOT_FOUND"}
+        return {"frameId": "frame"}
+
+    @staticmethod
+    def _evaluate(page, expression: str) -> dict:
+        match = EXPRESSION_RE.match(expression)
+        if match is None:
+            return {"exceptionDetails": {"text": "Unsupported expression"}}
+        script, args = match.group(1), json.loads(match.group(2))
+        if script == OUTER_HTML:
+            value = page.page_source
+        else:
+            value = page.execute_script(script, *args)
+        return {"result": {"type": "object", "value": value}}
@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from fetchers.platforms import YoutubeApiFetcher
+from fetchers.resilience import CircuitBreaker, FetchSkipped, RateLimitedError
+from fetchers.stub_api import StubApiServer
+from fetchers.utils import run_fetcher_batch
+
+YOUTUBE_API = "fetchers.platforms.youtube_api.YoutubeApiFetcher"
+
+
+def channel_id(n: int) -> str:
+    return f"UC{n:022d}"
+
+
+def channel_url(n: int) -> str:
+    return f"https://www.youtube.com/channel/{channel_id(n)}"
+
+
+class BatchApiTestCase(SimpleTestCase):
+    """Runs YoutubeApiFetcher against a StubApiServer serving channels 0-119."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = StubApiServer({channel_id(n): 1000 + n for n in range(120)})
+        cls.server.start()
+        cls.addClassCleanup(cls.server.stop)
+
+    def setUp(self):
+        super().setUp()
+        self.server.batches.clear()
+        overrides = override_settings(
+            YOUTUBE_API_URL=self.server.url,
+            YOUTUBE_API_KEY="test-key",
+            FETCH_DOMAIN_RATE_LIMITS={"127.0.0.1": 6000},
+            FETCH_RATE_LIMIT_BURST=100,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+
+class BatchApiFetcherTests(BatchApiTestCase):
+    def test_one_request_per_batch_size_accounts(self):
+        urls = [channel_url(n) for n in range(120)]
+
+        results = YoutubeApiFetcher(urls[0]).fetch_followers_counts(urls)
+
+        self.assertEqual(results, {channel_url(n): 1000 + n for n in range(120)})
+        self.assertEqual([len(batch) for batch in self.server.batches], [50, 50, 20])
+
+    def test_missing_account_fails_only_its_own_url(self):
+        urls = [channel_url(1), channel_url(500), "https://www.youtube.com/@handle"]
+
+        results = YoutubeApiFetcher(urls[0]).fetch_followers_counts(urls)
+
+        self.assertEqual(results[channel_url(1)], 1001)
+        self.assertIsInstance(results[channel_url(500)], ValueError)
+        self.assertIsInstance(results["https://www.youtube.com/@handle"], ValueError)
+        self.assertEqual(len(self.server.batches), 1)
+
+    def test_single_fetch(self):
+        fetcher = YoutubeApiFetcher(channel_url(7))
+
+        self.assertEqual(fetcher.fetch_followers_count(), 1007)
+
+    @override_settings(YOUTUBE_API_KEY="")
+    def test_missing_api_key(self):
+        with self.assertRaisesMessage(ValueError, "YOUTUBE_API_KEY"):
+            YoutubeApiFetcher(channel_url(7)).fetch_followers_count()
+        self.assertEqual(self.server.batches, [])
+
+
+class RunFetcherBatchTests(BatchApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.platforms = [
+            SimpleNamespace(
+                pk=9100 + n,
+                name=f"batch-api-{n}",
+                page_url=channel_url(n),
+                fetch_script=SimpleNamespace(script_path=YOUTUBE_API),
+            )
+            for n in range(3)
+        ]
+        self._clear()
+        self.addCleanup(self._clear)
+
+    def _clear(self):
+        for platform in self.platforms:
+            breaker = CircuitBreaker(platform.name)
+            cache.delete_many(
+                [breaker.failures_key, breaker.open_key, breaker.trial_key]
+            )
+
+    def test_platforms_share_one_request(self):
+        counts = run_fetcher_batch(self.platforms)
+
+        self.assertEqual(
+            counts, {"batch-api-0": 1000, "batch-api-1": 1001, "batch-api-2": 1002}
+        )
+        self.assertEqual(len(self.server.batches), 1)
+
+    def test_own_rate_limiting_is_not_a_breaker_failure(self):
+        with mock.patch(
+            "fetchers.base.domain_rate_limiter.acquire",
+            side_effect=RateLimitedError("Rate limit exceeded", 5),
+        ):
+            counts = run_fetcher_batch(self.platforms)
+
+        for platform in self.platforms:
+            self.assertIsInstance(counts[platform.name], FetchSkipped)
+            self.assertEqual(
+                cache.get(CircuitBreaker(platform.name).failures_key, 0), 0
+            )
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from fetchers.base import BROWSER_TIER, BaseFetcher
+from fetchers.browser import DEFAULT_BLOCKED_URL_PATTERNS, BrowserPool, PooledDriver
+from fetchers.replay import RECORD, set_replay_mode
+
+PAGE_URL = "https://blocking.test/profile"
+
+
+class CountFetcher(BaseFetcher):
+    fetch_strategies = ((BROWSER_TIER, "_parse_count"),)
+    blocked_url_patterns = DEFAULT_BLOCKED_URL_PATTERNS + ("*cdn.blocking.test*",)
+
+    def __init__(self, url: str):
+        self.platform_url = url
+
+    def _parse_count(self, page_source: str) -> int:
+        return 42
+
+
+class BrowserPoolBlockingTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = BrowserPool(max_size=1, max_pages=50, max_memory_mb=1024)
+        self.addCleanup(self.pool.close)
+        self.driver = mock.Mock(page_source="<html></html>")
+        launch = mock.patch.object(
+            self.pool, "_launch", return_value=PooledDriver(self.driver)
+        )
+        launch.start()
+        self.addCleanup(launch.stop)
+
+    def blocked_urls(self):
+        """The blocklist of every lease, in order."""
+        return [
+            call.args[1]["urls"]
+            for call in self.driver.execute_cdp_cmd.call_args_list
+            if call.args[0] == "Network.setBlockedURLs"
+        ]
+
+    def test_default_blocklist_is_applied_to_each_lease(self):
+        with self.pool.session():
+            pass
+
+        [urls] = self.blocked_urls()
+        self.assertEqual(urls, list(DEFAULT_BLOCKED_URL_PATTERNS))
+        for pattern in ("*.png", "*.mp4", "*.woff2", "*.css", "*doubleclick.net*"):
+            self.assertIn(pattern, urls)
+
+    def test_blocklist_does_not_outlive_its_lease(self):
+        with self.pool.session(blocked_urls=("*.js",)):
+            pass
+        with self.pool.session(blocked_urls=None):
+            pass
+
+        self.assertEqual(self.blocked_urls(), [["*.js"], []])
+
+    def test_fetcher_blocklist_reaches_the_browser(self):
+        # Record mode drives the pooled browser rather than the replay fake.
+        set_replay_mode(RECORD)
+        self.addCleanup(set_replay_mode, None)
+
+        with (
+            mock.patch("fetchers.base.browser_pool", self.pool),
+            mock.patch("fetchers.base.fixture_store"),
+        ):
+            self.assertEqual(CountFetcher(PAGE_URL).fetch_followers_count(), 42)
+
+        self.assertEqual(self.blocked_urls(), [list(CountFetcher.blocked_url_patterns)])
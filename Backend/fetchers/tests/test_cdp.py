@@ -0,0 +1,97 @@
+import asyncio
+from unittest import mock
+
+from fetchers.base import BROWSER_TIER, HTTP_TIER, AsyncBaseFetcher
+from fetchers.cdp import async_browser
+from fetchers.platforms import FacebookFetcher, TwitterFetcher
+from fetchers.replay import set_replay_browser
+from fetchers.tests.devtools import FakeDevTools
+from fetchers.tests.test_platforms import (
+    FACEBOOK_LOGIN_WALL_URL,
+    FACEBOOK_URL,
+    TWITTER_URL,
+)
+from fetchers.tests.utils import ReplayTestCase
+from fetchers.utils import call_fetcher
+
+
+class AsyncFacebookFetcher(AsyncBaseFetcher, FacebookFetcher):
+    pass
+
+
+class AsyncTwitterFetcher(AsyncBaseFetcher, TwitterFetcher):
+    pass
+
+
+class AsyncTwitterPageSourceFetcher(AsyncTwitterFetcher):
+    # No in-page extractor: the whole page source is transferred and parsed.
+    in_page_extractor = None
+
+
+class AsyncFetcherReplayTests(ReplayTestCase):
+    def test_http_tier(self):
+        fetcher = AsyncFacebookFetcher(FACEBOOK_URL)
+
+        self.assertEqual(call_fetcher(fetcher), 13456)
+        self.assertEqual(fetcher.last_fetch_tier, HTTP_TIER)
+
+    def test_falls_back_to_browser_tier(self):
+        fetcher = AsyncFacebookFetcher(FACEBOOK_LOGIN_WALL_URL)
+
+        self.assertEqual(call_fetcher(fetcher), 2500)
+        self.assertEqual(fetcher.last_fetch_tier, BROWSER_TIER)
+
+
+class CDPReplayTests(ReplayTestCase):
+    """The browser tier driven over the CDP client against a fake DevTools endpoint."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.devtools = FakeDevTools().start()
+        cls.addClassCleanup(cls.devtools.stop)
+
+    def setUp(self):
+        super().setUp()
+        set_replay_browser("chrome")
+        self.devtools.commands.clear()
+        self.devtools.handshakes = 0
+        patcher = mock.patch.object(
+            async_browser, "_ensure_chrome", return_value=self.devtools.ws_url
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_in_page_extraction(self):
+        fetcher = AsyncTwitterFetcher(TWITTER_URL)
+
+        self.assertEqual(call_fetcher(fetcher), 4321)
+        self.assertEqual(fetcher.last_fetch_tier, BROWSER_TIER)
+        self.assertIn("Page.navigate", self.devtools.commands)
+        self.assertEqual(self.devtools.commands[-1], "Target.closeTarget")
+
+    def test_page_source_parsing(self):
+        fetcher = AsyncTwitterPageSourceFetcher(TWITTER_URL)
+
+        self.assertEqual(call_fetcher(fetcher), 4321)
+
+    def test_falls_back_to_browser_tier(self):
+        self.assertEqual(
+            call_fetcher(AsyncFacebookFetcher(FACEBOOK_LOGIN_WALL_URL)), 2500
+        )
+
+    def test_concurrent_pages_share_one_connection(self):
+        async def fetch_all():
+            try:
+                return await asyncio.gather(
+                    *(
+                        AsyncTwitterFetcher(TWITTER_URL).fetch_followers_count()
+                        for _ in range(5)
+                    )
+                )
+            finally:
+                await async_browser.disconnect()
+
+        self.assertEqual(asyncio.run(fetch_all()), [4321] * 5)
+        self.assertEqual(self.devtools.commands.count("Target.createTarget"), 5)
+        self.assertEqual(self.devtools.handshakes, 1)
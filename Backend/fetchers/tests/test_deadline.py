@@ -0,0 +1,192 @@
+import socket
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from core.utils.cache_keys import CacheKey
+from fetchers.deadline import (
+    AttemptExecutor,
+    CancelScope,
+    FetchTimeout,
+    call_with_deadline,
+    current_cancel_scope,
+    deadline_timeout,
+    hedged_call,
+    latency_p95,
+    record_latency,
+)
+from fetchers.http_client import http_client
+
+PLATFORM = "deadline-test"
+
+
+class FakeBrowser:
+    """Stands in for a pooled browser; killing it releases the attempt stuck in it."""
+
+    def __init__(self):
+        self.killed = threading.Event()
+
+    def kill(self):
+        self.killed.set()
+
+
+def stuck_in(browser):
+    def attempt():
+        current_cancel_scope().register(browser)
+        browser.killed.wait(10)
+        raise FetchTimeout("Browser was killed")
+
+    return attempt
+
+
+class HedgedCallTests(SimpleTestCase):
+    def setUp(self):
+        self.key = CacheKey.PLATFORM_FETCH_LATENCIES.build(name=PLATFORM)
+        cache.delete(self.key)
+        self.addCleanup(cache.delete, self.key)
+
+    def test_deadline_raises_and_kills_the_browser(self):
+        browser = FakeBrowser()
+
+        with self.assertRaises(FetchTimeout):
+            call_with_deadline(stuck_in(browser), 0.2)
+
+        self.assertTrue(browser.killed.is_set())
+
+    def test_first_result_wins_before_the_hedge(self):
+        hedge = mock.Mock(return_value=2)
+
+        self.assertEqual(hedged_call([lambda: 1, hedge], 5, hedge_after=1), (1, 0))
+        hedge.assert_not_called()
+
+    def test_hedge_fires_after_p95_and_the_loser_is_cancelled(self):
+        for _ in range(10):
+            record_latency(PLATFORM, 0.1)
+        browser = FakeBrowser()
+        start = time.monotonic()
+
+        result = hedged_call(
+            [stuck_in(browser), lambda: 7], 5, hedge_after=latency_p95(PLATFORM)
+        )
+
+        self.assertEqual(result, (7, 1))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertTrue(browser.killed.wait(1))
+
+    def test_no_hedge_when_it_is_refused(self):
+        hedge = mock.Mock(return_value=2)
+
+        with self.assertRaises(FetchTimeout):
+            hedged_call(
+                [stuck_in(FakeBrowser()), hedge],
+                0.3,
+                hedge_after=0.1,
+                can_hedge=lambda: False,
+            )
+        hedge.assert_not_called()
+
+    def test_first_error_when_every_attempt_fails(self):
+        def fail():
+            raise ValueError("No count on the page")
+
+        with self.assertRaisesMessage(ValueError, "No count on the page"):
+            call_with_deadline(fail, 5)
+
+    def test_attempt_gets_the_remaining_time(self):
+        self.assertEqual(deadline_timeout(30), 30)
+        self.assertLessEqual(call_with_deadline(lambda: deadline_timeout(30), 2), 2)
+
+    def test_abandoned_attempt_gives_its_thread_back(self):
+        browser = FakeBrowser()
+
+        with mock.patch("fetchers.deadline.attempt_executor", AttemptExecutor(1)):
+            with self.assertRaises(FetchTimeout):
+                call_with_deadline(stuck_in(browser), 0.2)
+            # The single thread is free again once the stuck attempt ends.
+            self.assertEqual(call_with_deadline(lambda: 3, 2), 3)
+
+
+class HttpDeadlineTests(SimpleTestCase):
+    def setUp(self):
+        # Accepts connections but never answers.
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen()
+        self.addCleanup(self.server.close)
+        self.url = f"http://127.0.0.1:{self.server.getsockname()[1]}/profile"
+
+    def test_abandoned_request_ends_by_its_deadline(self):
+        finished = threading.Event()
+
+        def fetch():
+            try:
+                return http_client.get(self.url)
+            finally:
+                finished.set()
+
+        with self.assertRaises(FetchTimeout):
+            call_with_deadline(fetch, 0.3)
+
+        # HTTP_TIMEOUT is 10s; capped at the deadline, the request and its
+        # retries give up well before that.
+        self.assertTrue(finished.wait(3))
+
+    def test_cancelled_attempt_makes_no_more_requests(self):
+        scope = CancelScope(time.monotonic() + 30)
+        scope.cancel()
+
+        with mock.patch("fetchers.deadline._local") as local:
+            local.scope = scope
+            with self.assertRaises(FetchTimeout):
+                http_client.get(self.url)
+
+
+class CancelScopeTests(SimpleTestCase):
+    def test_register_after_cancel_raises(self):
+        scope = CancelScope()
+        browser = FakeBrowser()
+        scope.register(browser)
+
+        scope.cancel()
+
+        self.assertTrue(browser.killed.is_set())
+        with self.assertRaises(FetchTimeout):
+            scope.register(FakeBrowser())
+
+    def test_remaining(self):
+        self.assertIsNone(CancelScope().remaining())
+        scope = CancelScope(time.monotonic() + 30)
+        self.assertGreater(scope.remaining(), 29)
+        scope.cancel()
+        self.assertEqual(scope.remaining(), 0)
+
+
+class LatencyHistoryTests(SimpleTestCase):
+    def setUp(self):
+        self.key = CacheKey.PLATFORM_FETCH_LATENCIES.build(name=PLATFORM)
+        cache.delete(self.key)
+        self.addCleanup(cache.delete, self.key)
+
+    def test_no_p95_until_there_are_enough_samples(self):
+        for seconds in range(9):
+            record_latency(PLATFORM, seconds)
+        self.assertIsNone(latency_p95(PLATFORM))
+
+        record_latency(PLATFORM, 9)
+        self.assertEqual(latency_p95(PLATFORM), 9)
+
+    def test_p95(self):
+        for seconds in range(1, 21):
+            record_latency(PLATFORM, seconds)
+
+        self.assertEqual(latency_p95(PLATFORM), 19)
+
+    @override_settings(FETCH_LATENCY_HISTORY=5)
+    def test_only_recent_samples_are_kept(self):
+        for seconds in range(8):
+            record_latency(PLATFORM, seconds)
+
+        self.assertEqual(cache.get(self.key), [3, 4, 5, 6, 7])
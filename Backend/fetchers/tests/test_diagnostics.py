@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+from types import SimpleNamespace
+
+from fetchers.base import HTTP_TIER
+from fetchers.diagnostics import (
+    COLUMNS,
+    CSV,
+    JSON,
+    TEXT,
+    diagnose_platforms,
+    format_row,
+    write_report,
+)
+from fetchers.tests.test_platforms import FACEBOOK_URL, LINKEDIN_URL
+from fetchers.tests.utils import ReplayTestCase
+from fetchers.timing import STAGES
+
+FACEBOOK = "fetchers.platforms.facebook.FacebookFetcher"
+LINKEDIN = "fetchers.platforms.linkedin.LinkedinFetcher"
+
+
+def platform(pk, name, page_url, script_path):
+    return SimpleNamespace(
+        pk=pk,
+        name=name,
+        page_url=page_url,
+        fetch_script=SimpleNamespace(script_path=script_path),
+    )
+
+
+class DiagnosticsTests(ReplayTestCase):
+    def setUp(self):
+        super().setUp()
+        self.platforms = [
+            platform(9301, "diag-linkedin", LINKEDIN_URL, LINKEDIN),
+            platform(9302, "diag-facebook", FACEBOOK_URL, FACEBOOK),
+            platform(9303, "diag-broken", FACEBOOK_URL, "fetchers.platforms.Nope"),
+        ]
+
+    def diagnose(self, **kwargs):
+        return {
+            row["platform"]: row for row in diagnose_platforms(self.platforms, **kwargs)
+        }
+
+    def test_rows_from_recorded_pages(self):
+        seen = []
+
+        rows = diagnose_platforms(
+            self.platforms, parallel=2, profile=True, on_row=seen.append
+        )
+
+        self.assertEqual(
+            [row["platform"] for row in rows],
+            ["diag-broken", "diag-facebook", "diag-linkedin"],
+        )
+        self.assertEqual(len(seen), 3)
+        broken, facebook, linkedin = rows
+        self.assertEqual(list(facebook), list(COLUMNS))
+        self.assertTrue(facebook["ok"])
+        self.assertEqual(facebook["followers"], 13456)
+        self.assertEqual(facebook["fetcher"], "FacebookFetcher")
+        self.assertEqual(facebook["tier"], HTTP_TIER)
+        self.assertIsInstance(facebook["peak_mb"], float)
+        for name in STAGES:
+            self.assertIsInstance(facebook[f"{name}_ms"], float)
+        self.assertEqual(linkedin["followers"], 2345)
+        self.assertFalse(broken["ok"])
+        self.assertTrue(broken["error"].startswith("Fetcher setup failed"))
+
+    def test_profiling_columns_stay_empty_without_profile(self):
+        row = self.diagnose()["diag-facebook"]
+
+        self.assertTrue(row["ok"])
+        self.assertIsNone(row["peak_mb"])
+        self.assertIsNone(row["parse_ms"])
+
+    def test_reports(self):
+        rows = diagnose_platforms(self.platforms[1:])
+
+        stream = io.StringIO()
+        write_report(rows, JSON, stream)
+        self.assertEqual(json.loads(stream.getvalue()), rows)
+
+        stream = io.StringIO()
+        write_report(rows, CSV, stream)
+        parsed = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        self.assertEqual(list(parsed[0]), list(COLUMNS))
+        self.assertEqual(parsed[1]["followers"], "13456")
+
+        stream = io.StringIO()
+        write_report(rows, TEXT, stream)
+        header, rule, broken, facebook = stream.getvalue().splitlines()
+        self.assertTrue(header.startswith("platform"))
+        self.assertNotIn("peak_mb", header)
+        self.assertEqual(len(rule), len(header))
+        self.assertIn("13456", facebook)
+        self.assertIn("Fetcher setup failed", broken)
+
+    def test_format_row(self):
+        rows = self.diagnose()
+
+        self.assertRegex(
+            format_row(rows["diag-facebook"]),
+            r"^diag-facebook: 13456 followers via http in \d+ ms$",
+        )
+        self.assertIn("diag-broken: failed in", format_row(rows["diag-broken"]))
@@ -0,0 +1,13 @@
+from django.test import SimpleTestCase
+
+
+class PackageExportsTests(SimpleTestCase):
+    def test_star_import_exposes_every_public_name(self):
+        import fetchers
+
+        namespace = {}
+        exec("from fetchers import *", namespace)
+
+        for name in fetchers.__all__:
+            self.assertIsInstance(name, str)
+            self.assertIn(name, namespace)
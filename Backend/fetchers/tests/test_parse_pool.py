@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+
+from django.test import SimpleTestCase
+
+from fetchers.base import HTTP_TIER, BaseFetcher, RawPage
+from fetchers.parse_pool import ParsePool, ParseWorkerError, fetcher_path
+
+PAGE = RawPage(HTTP_TIER, "https://parse.test/page", "<html></html>")
+
+
+class PidFetcher(BaseFetcher):
+    """Its "count" is the PID of the process that parsed the page."""
+
+    fetch_strategies = ((HTTP_TIER, "_parse_pid"),)
+
+    def __init__(self, url: str):
+        self.platform_url = url
+
+    def _parse_pid(self, page_source: str) -> int:
+        if "missing" in page_source:
+            raise ValueError("No count on the page")
+        if "crash" in page_source:
+            os._exit(1)
+        return os.getpid()
+
+
+def parse_in_daemon(results):
+    """Parse the way a Celery prefork child would: from a daemon process."""
+    pool = ParsePool(1)
+    try:
+        results.put(
+            (
+                os.getpid(),
+                pool.submit(fetcher_path(PidFetcher(PAGE.url)), PAGE).result(),
+            )
+        )
+    except Exception as e:
+        results.put((os.getpid(), repr(e)))
+    finally:
+        pool.close()
+
+
+class ParsePoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = ParsePool(2)
+        self.addCleanup(self.pool.close)
+        self.path = fetcher_path(PidFetcher(PAGE.url))
+
+    def test_pages_are_parsed_in_parse_processes(self):
+        pid = self.pool.submit(self.path, PAGE).result()
+
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual(self.pool.pids(), [pid])
+        # The idle process is reused.
+        self.assertEqual(self.pool.parse(self.path, PAGE), pid)
+
+    def test_parser_errors_keep_their_type_and_the_process(self):
+        pid = self.pool.parse(self.path, PAGE)
+
+        with self.assertRaisesMessage(ValueError, "No count on the page"):
+            self.pool.parse(self.path, PAGE._replace(source="missing"))
+        self.assertEqual(self.pool.pids(), [pid])
+
+    def test_dead_process_is_replaced(self):
+        pid = self.pool.parse(self.path, PAGE)
+
+        with self.assertRaises(ParseWorkerError):
+            self.pool.parse(self.path, PAGE._replace(source="crash"))
+
+        self.assertEqual(self.pool.pids(), [])
+        self.assertNotIn(self.pool.parse(self.path, PAGE), (pid, os.getpid()))
+
+    def test_daemon_process_parses_in_a_separate_process(self):
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        process = context.Process(target=parse_in_daemon, args=(results,), daemon=True)
+        process.start()
+        try:
+            daemon_pid, parsed_by = results.get(timeout=60)
+        finally:
+            process.join(10)
+
+        self.assertIsInstance(parsed_by, int, parsed_by)
+        self.assertNotIn(parsed_by, (daemon_pid, os.getpid()))
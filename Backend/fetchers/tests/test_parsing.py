@@ -0,0 +1,73 @@
+import re
+from unittest import mock, skipUnless
+
+from bs4 import SoupStrainer
+from django.test import SimpleTestCase
+
+from fetchers.parsing import SELECTOLAX, css_selector, is_available, make_soup
+from fetchers.platforms.tiktok import FOLLOWERS_STRONG
+from fetchers.platforms.twitter import FOLLOWERS_COUNT_TESTID, FOLLOWERS_LINKS
+
+PAGE = """
+<html><body>
+<div class="card big"><span>outer <span>inner</span></span></div>
+<a href="/replaytest/followers"><span>4,321</span> Followers</a>
+<a href="/replaytest/following">12 Following</a>
+<strong data-e2e="followers-count">98.7K</strong>
+<strong data-e2e="likes-count">456K</strong>
+<div data-testid="followersCount">4,321</div>
+<script>var html = "<span>not a tag</span>";</script>
+</body></html>
+"""
+
+STRAINERS = (
+    FOLLOWERS_STRONG,
+    FOLLOWERS_LINKS,
+    FOLLOWERS_COUNT_TESTID,
+    SoupStrainer("span"),
+    SoupStrainer(["a", "strong"]),
+    SoupStrainer(class_="card"),
+    SoupStrainer(string=re.compile("Following")),
+)
+
+
+class CssSelectorTests(SimpleTestCase):
+    def test_strainers_become_selectors(self):
+        self.assertEqual(
+            css_selector(FOLLOWERS_STRONG), 'strong[data-e2e="followers-count"]'
+        )
+        self.assertEqual(css_selector(FOLLOWERS_LINKS), "a[href]")
+        self.assertEqual(
+            css_selector(FOLLOWERS_COUNT_TESTID), '[data-testid="followersCount"]'
+        )
+        self.assertEqual(css_selector(SoupStrainer(["a", "b"])), "a, b")
+        self.assertEqual(css_selector(SoupStrainer(class_="card")), "[class]")
+
+    def test_rules_a_selector_cannot_narrow(self):
+        for strainer in (
+            SoupStrainer(string=re.compile("followers")),
+            SoupStrainer(re.compile("^h[1-6]$")),
+            SoupStrainer("a", href=lambda value: True),
+            SoupStrainer("a", href=False),
+            SoupStrainer(),
+        ):
+            with self.subTest(strainer=strainer):
+                self.assertIsNone(css_selector(strainer))
+
+
+class SelectolaxBackendTests(SimpleTestCase):
+    @skipUnless(is_available(SELECTOLAX), "selectolax is not installed")
+    def test_same_soup_as_the_tree_builder(self):
+        for strainer in STRAINERS:
+            with self.subTest(strainer=strainer):
+                self.assertEqual(
+                    str(make_soup(PAGE, strainer, backend=SELECTOLAX)),
+                    str(make_soup(PAGE, strainer, backend="html.parser")),
+                )
+
+    def test_falls_back_without_selectolax(self):
+        with mock.patch("fetchers.parsing.is_available", lambda b: b != SELECTOLAX):
+            soup = make_soup(PAGE, FOLLOWERS_STRONG, backend=SELECTOLAX)
+
+        self.assertEqual(soup.strong.get_text(), "98.7K")
+        self.assertEqual(len(soup.find_all("strong")), 1)
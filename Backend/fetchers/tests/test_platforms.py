@@ -0,0 +1,91 @@
+from fetchers.base import BROWSER_TIER, HTTP_TIER
+from fetchers.platforms import (
+    FacebookFetcher,
+    InstagramFetcher,
+    LinkedinFetcher,
+    TiktokFetcher,
+    TwitterFetcher,
+    YoutubeFetcher,
+)
+from fetchers.replay import BROWSER_FIXTURE
+from fetchers.tests.utils import ReplayTestCase
+
+FACEBOOK_URL = "https://www.facebook.com/replaytest"
+FACEBOOK_LOGIN_WALL_URL = "https://www.facebook.com/replaytest.loginwall"
+INSTAGRAM_URL = "https://www.instagram.com/replaytest"
+LINKEDIN_URL = "https://www.linkedin.com/company/replaytest"
+TIKTOK_URL = "https://www.tiktok.com/@replaytest"
+TWITTER_URL = "https://x.com/replaytest"
+YOUTUBE_URL = "https://www.youtube.com/@replaytest"
+
+
+class FetcherReplayTestCase(ReplayTestCase):
+    def assertFetches(self, fetcher, count, tier):
+        self.assertEqual(fetcher.fetch_followers_count(), count)
+        self.assertEqual(fetcher.last_fetch_tier, tier)
+
+    def assertBrowserTier(self, fetcher, count):
+        """The in-page extractor and the full-source parser both find ``count``."""
+        parser = fetcher._parse_rendered_page
+        self.assertEqual(fetcher._run_tier(BROWSER_TIER, parser), count)
+        source = self.fixture(BROWSER_FIXTURE, fetcher.platform_url)
+        self.assertEqual(parser(source), count)
+
+
+class FacebookReplayTests(FetcherReplayTestCase):
+    def test_http_tier_reads_meta_tags(self):
+        self.assertFetches(FacebookFetcher(FACEBOOK_URL), 13456, HTTP_TIER)
+
+    def test_browser_tier(self):
+        self.assertBrowserTier(FacebookFetcher(FACEBOOK_URL), 13000)
+
+    def test_login_wall_falls_back_to_browser(self):
+        self.assertFetches(FacebookFetcher(FACEBOOK_LOGIN_WALL_URL), 2500, BROWSER_TIER)
+
+    def test_batch_fetch(self):
+        fetcher = FacebookFetcher(FACEBOOK_URL)
+
+        counts = fetcher.fetch_followers_counts([FACEBOOK_URL, FACEBOOK_LOGIN_WALL_URL])
+
+        self.assertEqual(counts, {FACEBOOK_URL: 13456, FACEBOOK_LOGIN_WALL_URL: 2500})
+        self.assertEqual(
+            fetcher.last_batch_tiers,
+            {FACEBOOK_URL: HTTP_TIER, FACEBOOK_LOGIN_WALL_URL: BROWSER_TIER},
+        )
+
+
+class InstagramReplayTests(FetcherReplayTestCase):
+    def test_profile_api(self):
+        self.assertEqual(InstagramFetcher(INSTAGRAM_URL).fetch_followers_count(), 24680)
+
+
+class LinkedinReplayTests(FetcherReplayTestCase):
+    def test_http_tier_reads_meta_tags(self):
+        self.assertFetches(LinkedinFetcher(LINKEDIN_URL), 2345, HTTP_TIER)
+
+    def test_browser_tier(self):
+        self.assertBrowserTier(LinkedinFetcher(LINKEDIN_URL), 2346)
+
+
+class TiktokReplayTests(FetcherReplayTestCase):
+    def test_http_tier_reads_embedded_json(self):
+        self.assertFetches(TiktokFetcher(TIKTOK_URL), 98765, HTTP_TIER)
+
+    def test_browser_tier(self):
+        self.assertBrowserTier(TiktokFetcher(TIKTOK_URL), 98700)
+
+
+class TwitterReplayTests(FetcherReplayTestCase):
+    def test_browser_only(self):
+        self.assertFetches(TwitterFetcher(TWITTER_URL), 4321, BROWSER_TIER)
+
+    def test_browser_tier(self):
+        self.assertBrowserTier(TwitterFetcher(TWITTER_URL), 4321)
+
+
+class YoutubeReplayTests(FetcherReplayTestCase):
+    def test_http_tier_reads_embedded_json(self):
+        self.assertFetches(YoutubeFetcher(YOUTUBE_URL), 1200000, HTTP_TIER)
+
+    def test_browser_tier(self):
+        self.assertBrowserTier(YoutubeFetcher(YOUTUBE_URL), 1210000)
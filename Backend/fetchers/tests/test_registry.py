@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+
+from fetchers.platforms.facebook import FacebookFetcher
+from fetchers.registry import FetcherRegistry
+from metrics.models import FetchScript
+
+FACEBOOK = "fetchers.platforms.facebook.FacebookFetcher"
+
+
+def platform(page_url="https://www.facebook.com/example", script_path=FACEBOOK):
+    return SimpleNamespace(
+        pk=1,
+        name="Facebook",
+        page_url=page_url,
+        fetch_script=SimpleNamespace(script_path=script_path),
+    )
+
+
+class FetcherRegistryTests(TestCase):
+    def setUp(self):
+        cache.delete(FetcherRegistry.VERSION_KEY)
+        self.registry = FetcherRegistry()
+
+    def tearDown(self):
+        cache.delete(FetcherRegistry.VERSION_KEY)
+
+    def test_resolve_validates_script_paths(self):
+        self.assertIs(self.registry.resolve(FACEBOOK), FacebookFetcher)
+
+        with self.assertRaises(ImproperlyConfigured):
+            self.registry.resolve("fetchers.platforms.facebook.Missing")
+        with self.assertRaises(ImproperlyConfigured):
+            self.registry.resolve("fetchers.registry.FetcherRegistry")
+
+    def test_instance_is_reused_until_the_page_url_changes(self):
+        first = self.registry.get_fetcher(platform())
+
+        self.assertIs(self.registry.get_fetcher(platform()), first)
+        moved = self.registry.get_fetcher(
+            platform(page_url="https://www.facebook.com/new")
+        )
+        self.assertIsNot(moved, first)
+        self.assertEqual(moved.platform_url, "https://www.facebook.com/new")
+
+    def test_version_bump_drops_instances_in_every_registry(self):
+        first = self.registry.get_fetcher(platform())
+
+        FetcherRegistry.bump_version()
+
+        self.assertIsNot(self.registry.get_fetcher(platform()), first)
+
+    def test_fetch_script_change_invalidates_registry(self):
+        first = self.registry.get_fetcher(platform())
+
+        FetchScript.objects.create(name="Registry test", script_path=FACEBOOK)
+
+        self.assertIsNot(self.registry.get_fetcher(platform()), first)
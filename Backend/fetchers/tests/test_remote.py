@@ -0,0 +1,160 @@
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+from selenium.common.exceptions import WebDriverException
+
+from fetchers.farm import LocalBrowserFarm
+from fetchers.remote import RemoteNodePool
+
+NODE_A = "http://node-a:4444"
+NODE_B = "http://node-b:4444"
+
+# Answers /status like a ready chromedriver; enough for the farm to start it.
+FAKE_CHROMEDRIVER = f"""#!{sys.executable}
+import json, sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+class Status(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({{"value": {{"ready": True}}}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+port = int(sys.argv[1].split("=")[1])
+HTTPServer(("127.0.0.1", port), Status).serve_forever()
+"""
+
+
+class FakeDriver:
+    """Stands in for RemoteChromeDriver; nodes in ``failing`` refuse sessions."""
+
+    failing = set()
+
+    def __init__(self, node_url, options):
+        if node_url in self.failing:
+            raise WebDriverException(f"{node_url} is unreachable")
+        self.node_url = node_url
+
+
+class RemoteNodePoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = RemoteNodePool([NODE_A, NODE_B + "/"], cooldown=60)
+        self.now = 1000.0
+        FakeDriver.failing = set()
+        for target, replacement in (
+            ("fetchers.remote.RemoteChromeDriver", FakeDriver),
+            ("fetchers.remote.time.monotonic", lambda: self.now),
+        ):
+            patcher = mock.patch(target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def open(self):
+        return self.pool.open_session(options=None)[1]
+
+    def leases(self):
+        return {url: node["leases"] for url, node in self.pool.stats().items()}
+
+    def test_sessions_go_to_the_least_loaded_node(self):
+        self.assertEqual([self.open() for _ in range(4)], [NODE_A, NODE_B] * 2)
+
+        self.pool.release(NODE_B)
+
+        self.assertEqual(self.leases(), {NODE_A: 2, NODE_B: 1})
+        self.assertEqual(self.open(), NODE_B)
+
+    def test_release_never_goes_below_zero(self):
+        self.pool.release(NODE_A)
+        self.pool.release("http://unknown:4444")
+
+        self.assertEqual(self.leases(), {NODE_A: 0, NODE_B: 0})
+
+    def test_failing_node_cools_down_and_recovers(self):
+        FakeDriver.failing = {NODE_A}
+
+        # Node A fails, so the session moves to B and A cools down.
+        self.assertEqual(self.open(), NODE_B)
+        self.assertEqual(self.pool.stats()[NODE_A]["down_for"], 60)
+        # While A cools down, B takes everything even though A has fewer leases.
+        self.assertEqual([self.open() for _ in range(3)], [NODE_B] * 3)
+        self.assertEqual(self.leases(), {NODE_A: 0, NODE_B: 4})
+
+        FakeDriver.failing = set()
+        self.now += 61
+
+        # A is back and the least loaded.
+        self.assertEqual(self.open(), NODE_A)
+        self.assertEqual(self.pool.stats()[NODE_A]["down_for"], 0)
+
+    def test_nodes_in_cooldown_are_still_tried_last(self):
+        FakeDriver.failing = {NODE_A}
+        self.open()
+        FakeDriver.failing = {NODE_B}
+
+        # B fails now; A is still cooling down but is the only node left.
+        self.assertEqual(self.open(), NODE_A)
+
+    def test_no_node_can_open_a_session(self):
+        FakeDriver.failing = {NODE_A, NODE_B}
+
+        with self.assertRaisesMessage(WebDriverException, "No remote browser node"):
+            self.open()
+        self.assertEqual(self.leases(), {NODE_A: 0, NODE_B: 0})
+
+
+class LocalBrowserFarmTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        chromedriver = Path(directory.name) / "chromedriver"
+        chromedriver.write_text(FAKE_CHROMEDRIVER)
+        chromedriver.chmod(0o755)
+        patcher = mock.patch(
+            "fetchers.farm.resolve_chromedriver_path", return_value=str(chromedriver)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.farm = LocalBrowserFarm(nodes=2).start()
+        self.addCleanup(self.farm.stop)
+
+    def test_nodes_serve_and_stop(self):
+        first, second = self.farm.urls
+        self.assertTrue(requests.get(f"{first}/status", timeout=5).json()["value"])
+
+        port = int(first.rsplit(":", 1)[1])
+        process = self.farm._processes[port]
+        self.farm.stop_node(port)
+
+        self.assertEqual(self.farm.urls, [second])
+        self.assertIsNotNone(process.poll())
+        with self.assertRaises(requests.ConnectionError):
+            requests.get(f"{first}/status", timeout=5)
+
+    def test_stop_node_kills_a_node_that_outlived_its_tree(self):
+        port = int(self.farm.urls[0].rsplit(":", 1)[1])
+        process = self.farm._processes[port]
+        real_wait, waits = process.wait, []
+
+        def wait(timeout=None):
+            # Nothing was killed, so the first wait would time out.
+            waits.append(timeout)
+            if len(waits) == 1:
+                raise subprocess.TimeoutExpired("chromedriver", timeout)
+            return real_wait(timeout)
+
+        with mock.patch("fetchers.farm._process_tree", return_value=[]):
+            with mock.patch.object(process, "wait", side_effect=wait):
+                self.farm.stop_node(port)
+
+        self.assertEqual(len(waits), 2)
+        self.assertIsNotNone(process.poll())
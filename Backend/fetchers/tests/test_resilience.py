@@ -0,0 +1,168 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django_redis import get_redis_connection
+
+from core.utils.cache_keys import CacheKey
+from fetchers.base import BaseFetcher
+from fetchers.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    DomainRateLimiter,
+    FetchGuard,
+    FetchSkipped,
+    RateLimitedError,
+)
+from fetchers.utils import run_fetcher
+
+
+def clear_breaker(breaker):
+    cache.delete_many([breaker.failures_key, breaker.open_key, breaker.trial_key])
+
+
+@override_settings(
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD=3,
+    CIRCUIT_BREAKER_COOLDOWN=600,
+    CIRCUIT_BREAKER_FAILURE_WINDOW=3600,
+)
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker("breaker-test")
+        clear_breaker(self.breaker)
+        self.addCleanup(clear_breaker, self.breaker)
+
+    def test_opens_after_threshold_failures(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.before_request()
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+    def test_half_open_lets_one_trial_through(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        # The cooldown has passed.
+        cache.delete(self.breaker.open_key)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+        self.breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            CircuitBreaker("breaker-test").before_request()
+
+    def test_success_closes_the_circuit(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.before_request()
+
+
+@override_settings(
+    FETCH_DOMAIN_RATE_LIMITS={"ratelimit.test": 60}, FETCH_RATE_LIMIT_BURST=2
+)
+class DomainRateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        self.limiter = DomainRateLimiter()
+        self.key = CacheKey.DOMAIN_RATE_LIMIT.build(domain="ratelimit.test")
+        get_redis_connection("default").delete(self.key)
+        self.addCleanup(get_redis_connection("default").delete, self.key)
+
+    def test_burst_then_wait_for_refill(self):
+        self.assertEqual(self.limiter.try_acquire("ratelimit.test"), 0)
+        self.assertEqual(self.limiter.try_acquire("ratelimit.test"), 0)
+
+        # One token a second; the bucket is empty now.
+        wait = self.limiter.try_acquire("ratelimit.test")
+        self.assertGreater(wait, 0.5)
+        self.assertLessEqual(wait, 1)
+
+    def test_acquire_gives_up_past_max_wait(self):
+        self.limiter.try_acquire("ratelimit.test")
+        self.limiter.try_acquire("ratelimit.test")
+
+        with self.assertRaises(RateLimitedError) as raised:
+            self.limiter.acquire("ratelimit.test", max_wait=0.1)
+        self.assertGreater(raised.exception.retry_after, 0)
+
+
+class RaisingFetcher(BaseFetcher):
+    rate_limits_own_requests = True
+    error = None
+
+    def __init__(self, url: str):
+        self.platform_url = url
+
+    def fetch_followers_count(self) -> int:
+        raise self.error
+
+
+@override_settings(CIRCUIT_BREAKER_FAILURE_THRESHOLD=3, FETCH_HEDGE_ENABLED=False)
+class RunFetcherBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.platform = SimpleNamespace(
+            name="breaker-run-test", page_url="https://ratelimit.test/page"
+        )
+        self.breaker = CircuitBreaker(self.platform.name)
+        clear_breaker(self.breaker)
+        self.addCleanup(clear_breaker, self.breaker)
+
+    def run_with(self, error):
+        fetcher = RaisingFetcher(self.platform.page_url)
+        fetcher.error = error
+        with mock.patch("fetchers.utils.get_fetcher", return_value=fetcher):
+            run_fetcher(self.platform)
+
+    def test_own_rate_limiting_is_not_a_breaker_failure(self):
+        with self.assertRaises(FetchSkipped):
+            self.run_with(RateLimitedError("Rate limit exceeded", 5))
+
+        self.assertEqual(cache.get(self.breaker.failures_key, 0), 0)
+
+    def test_fetch_error_is_a_breaker_failure(self):
+        with self.assertRaises(ValueError):
+            self.run_with(ValueError("No count"))
+
+        self.assertEqual(cache.get(self.breaker.failures_key), 1)
+
+    def half_open(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        cache.delete(self.breaker.open_key)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+    def test_rate_limited_trial_is_given_back(self):
+        self.half_open()
+
+        with mock.patch(
+            "fetchers.resilience.domain_rate_limiter.acquire",
+            side_effect=RateLimitedError("Rate limit exceeded", 5),
+        ):
+            with self.assertRaises(RateLimitedError):
+                FetchGuard(self.platform).enter()
+
+        # The trial never ran, so the next caller gets it.
+        with mock.patch("fetchers.resilience.domain_rate_limiter.acquire"):
+            FetchGuard(self.platform).enter()
+            with self.assertRaises(CircuitOpenError):
+                FetchGuard(self.platform).enter()
+
+    def test_trial_skipped_inside_the_fetcher_is_given_back(self):
+        self.half_open()
+
+        with self.assertRaises(FetchSkipped):
+            self.run_with(RateLimitedError("Rate limit exceeded", 5))
+
+        self.assertIsNone(cache.get(self.breaker.trial_key))
+        self.assertEqual(self.breaker.state, HALF_OPEN)
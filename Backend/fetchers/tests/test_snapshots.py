@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from fetchers.snapshots import GZIP, ZSTD, SnapshotStore
+
+URL = "https://www.facebook.com/snapshots"
+OTHER_URL = "https://x.com/snapshots"
+
+
+class SnapshotStoreTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # A huge interval keeps save() from pruning behind the tests' back.
+        self.store = SnapshotStore(
+            directory.name, ttl_seconds=3600, max_bytes=10**6, prune_interval=10**10
+        )
+
+    def blobs(self):
+        return sorted((self.store.root / "blobs").glob("*/*"))
+
+    def age(self, seconds, url=URL):
+        """Pretend the snapshots of ``url`` (and every blob) were taken earlier."""
+        for ref in (self.store.root / "refs" / self.store.url_key(url)).glob("*"):
+            record = json.loads(ref.read_text())
+            record["taken_at"] -= seconds
+            ref.write_text(json.dumps(record))
+        for blob in self.blobs():
+            stat = blob.stat()
+            os.utime(blob, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+    def test_round_trip_with_zstd(self):
+        digest = self.store.save(URL, "http", "<html>13,456 followers</html>")
+
+        self.assertEqual(self.store.codec, ZSTD)
+        self.assertEqual(self.store.load(digest), "<html>13,456 followers</html>")
+        self.assertEqual(self.store.latest(URL)["digest"], digest)
+        self.assertEqual(self.blobs()[0].suffix, ZSTD)
+
+    def test_falls_back_to_gzip_without_zstandard(self):
+        with mock.patch("fetchers.snapshots.zstd_available", return_value=False):
+            store = SnapshotStore(self.store.root, 3600, 10**6)
+
+        digest = store.save(URL, "http", "<html></html>")
+
+        self.assertEqual(store.codec, GZIP)
+        self.assertEqual(self.store.load(digest), "<html></html>")
+
+    def test_identical_pages_share_one_blob(self):
+        self.store.save(URL, "http", "<html>same</html>")
+        self.store.save(URL, "browser", "<html>same</html>")
+
+        self.assertEqual(len(self.store.records(URL)), 2)
+        self.assertEqual(len(self.store.records(URL, tier="browser")), 1)
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_prune_drops_expired_records_and_their_blobs(self):
+        old = self.store.save(URL, "http", "<html>old</html>")
+        self.age(7200)
+        new = self.store.save(OTHER_URL, "http", "<html>new</html>")
+
+        result = self.store.prune()
+
+        self.assertEqual((result["expired"], result["blobs_removed"]), (1, 1))
+        self.assertEqual(self.store.records(URL), [])
+        with self.assertRaises(FileNotFoundError):
+            self.store.load(old)
+        self.assertEqual(self.store.load(new), "<html>new</html>")
+
+    def test_prune_evicts_oldest_records_over_budget(self):
+        self.store.save(URL, "http", "a" * 5000)
+        self.age(600)
+        self.store.save(OTHER_URL, "http", "b" * 5000)
+        self.age(300, url=OTHER_URL)
+        self.store.max_bytes = max(blob.stat().st_size for blob in self.blobs())
+
+        result = self.store.prune()
+
+        self.assertEqual((result["evicted"], result["records"]), (1, 1))
+        self.assertEqual(self.store.records(URL), [])
+        self.assertEqual(len(self.store.records(OTHER_URL)), 1)
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_prune_keeps_blobs_that_may_still_be_referenced(self):
+        # A young blob without a record yet: another process may be writing one.
+        self.store.save(URL, "http", "<html>young</html>")
+        for ref in (self.store.root / "refs").glob("*/*"):
+            ref.unlink()
+
+        self.assertEqual(self.store.prune()["blobs_removed"], 0)
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_prune_snapshots_command(self):
+        self.store.save(URL, "http", "<html>old</html>")
+        self.age(7200)
+        out = StringIO()
+
+        with mock.patch(
+            "metrics.management.commands.prune_snapshots.snapshot_store", self.store
+        ):
+            call_command("prune_snapshots", stdout=out)
+
+        self.assertIn("Expired 1", out.getvalue())
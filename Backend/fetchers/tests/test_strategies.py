@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import SimpleTestCase
+
+from fetchers.strategies import StrategyMemory
+
+SCOPE = "StrategyTest:scope"
+
+
+class StrategyMemoryTests(SimpleTestCase):
+    def setUp(self):
+        self.memory = StrategyMemory()
+        self.memory.reset(SCOPE)
+        self.addCleanup(self.memory.reset, SCOPE)
+
+    def test_record_keeps_wins_misses_and_average_cost(self):
+        self.memory.record(SCOPE, [("link", 10, False), ("regex", 20, True)], "regex")
+        self.memory.record(SCOPE, [("link", 20, False), ("regex", 30, True)], "regex")
+
+        stats = self.memory.stats(SCOPE)
+
+        self.assertEqual(stats["winner"], "regex")
+        self.assertEqual(stats["drift"], 0)
+        link, regex = stats["strategies"]["link"], stats["strategies"]["regex"]
+        self.assertEqual((link["wins"], link["misses"], link["avg_ms"]), (0, 2, 12.0))
+        self.assertEqual((regex["wins"], regex["misses"]), (2, 0))
+        self.assertEqual(regex["avg_ms"], 22.0)
+        self.assertIsNone(link["last_win"])
+        self.assertIsNotNone(regex["last_win"])
+
+    def test_cheap_reliable_strategies_go_first(self):
+        self.assertEqual(
+            self.memory.order(SCOPE, ["link", "regex", "json"]),
+            ["link", "regex", "json"],
+        )
+
+        self.memory.record(SCOPE, [("link", 50, False), ("regex", 5, True)], "regex")
+
+        # The untried strategy is assumed as costly as the worst known one.
+        self.assertEqual(
+            self.memory.order(SCOPE, ["link", "regex", "json"]),
+            ["regex", "json", "link"],
+        )
+
+    def test_winner_change_counts_as_drift(self):
+        self.memory.record(SCOPE, [("link", 1, True)], "link")
+        with self.assertLogs(level="WARNING"):
+            self.memory.record(SCOPE, [("link", 1, False), ("regex", 1, True)], "regex")
+
+        stats = self.memory.stats(SCOPE)
+        self.assertEqual((stats["winner"], stats["drift"]), ("regex", 1))
+
+    def test_concurrent_records_are_not_lost(self):
+        def parse(_):
+            self.memory.record(SCOPE, [("link", 1, False), ("regex", 1, True)], "regex")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(parse, range(200)))
+
+        strategies = self.memory.stats(SCOPE)["strategies"]
+        self.assertEqual(strategies["link"]["misses"], 200)
+        self.assertEqual(strategies["regex"]["wins"], 200)
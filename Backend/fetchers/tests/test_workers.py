@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import signal
+from unittest import mock
+
+from fetchers.base import BROWSER_TIER
+from fetchers.platforms import FacebookFetcher
+from fetchers.replay import FixtureMissing
+from fetchers.tests.test_platforms import FACEBOOK_LOGIN_WALL_URL
+from fetchers.tests.utils import ReplayTestCase
+from fetchers.utils import call_fetcher
+from fetchers.workers import (
+    PAGE_JOB,
+    TABS_JOB,
+    BrowserWorkerCrashed,
+    BrowserWorkerPool,
+)
+
+MISSING_URL = "https://www.facebook.com/replaytest.missing"
+
+
+def fetch_in_daemon(pool, results):
+    """Run a browser-tier fetch the way a Celery prefork child would: from a daemon."""
+    try:
+        with mock.patch("fetchers.base.browser_workers", pool):
+            results.put(call_fetcher(FacebookFetcher(FACEBOOK_LOGIN_WALL_URL)))
+    except Exception as e:
+        results.put(repr(e))
+    finally:
+        pool.close()
+
+
+class BrowserWorkerPoolTests(ReplayTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = BrowserWorkerPool(size=1, max_rss_mb=4096, max_jobs=10)
+        self.addCleanup(self.pool.close)
+        patcher = mock.patch("fetchers.base.browser_workers", self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_browser_tier_runs_in_a_worker(self):
+        fetcher = FacebookFetcher(FACEBOOK_LOGIN_WALL_URL)
+
+        self.assertEqual(call_fetcher(fetcher), 2500)
+        self.assertEqual(fetcher.last_fetch_tier, BROWSER_TIER)
+        self.assertEqual(self.pool.stats()["live"], 1)
+
+    def test_tabs_job(self):
+        fetcher = FacebookFetcher(FACEBOOK_LOGIN_WALL_URL)
+
+        outcomes = self.pool.run(
+            fetcher, TABS_JOB, [FACEBOOK_LOGIN_WALL_URL], "_parse_rendered_page", 60
+        )
+
+        self.assertEqual(outcomes, {FACEBOOK_LOGIN_WALL_URL: 2500})
+
+    def test_fetch_error_keeps_the_worker(self):
+        fetcher = FacebookFetcher(FACEBOOK_LOGIN_WALL_URL)
+        self.pool.run(
+            fetcher, PAGE_JOB, [FACEBOOK_LOGIN_WALL_URL], "_parse_rendered_page", 60
+        )
+        [pid] = self.pool.stats()["rss_mb"]
+
+        # An ordinary fetch error comes back as itself.
+        with self.assertRaises(FixtureMissing):
+            self.pool.run(fetcher, PAGE_JOB, [MISSING_URL], "_parse_rendered_page", 60)
+
+        self.assertEqual(list(self.pool.stats()["rss_mb"]), [pid])
+
+    def test_dead_worker_is_retired(self):
+        fetcher = FacebookFetcher(FACEBOOK_LOGIN_WALL_URL)
+        self.pool.run(
+            fetcher, PAGE_JOB, [FACEBOOK_LOGIN_WALL_URL], "_parse_rendered_page", 60
+        )
+        [pid] = self.pool.stats()["rss_mb"]
+        os.kill(pid, signal.SIGKILL)
+        worker = self.pool._idle.get()
+        worker.process.wait()
+        self.pool._idle.put(worker)
+
+        # Checked out before the next job notices it is gone, so the job hits a dead pipe.
+        with mock.patch.object(worker, "is_alive", return_value=True):
+            with self.assertRaises(BrowserWorkerCrashed):
+                self.pool.run(
+                    fetcher,
+                    PAGE_JOB,
+                    [FACEBOOK_LOGIN_WALL_URL],
+                    "_parse_rendered_page",
+                    60,
+                )
+
+        self.assertEqual(self.pool.stats()["live"], 0)
+
+    def test_worker_is_retired_after_max_jobs(self):
+        first = self.pool._checkout()
+        first.jobs_done = self.pool.max_jobs
+        self.pool._checkin(first)
+
+        self.assertFalse(first.is_alive())
+        self.assertEqual(self.pool.stats()["live"], 0)
+
+    def test_workers_start_from_a_daemon_process(self):
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        process = context.Process(
+            target=fetch_in_daemon, args=(self.pool, results), daemon=True
+        )
+        process.start()
+        try:
+            self.assertEqual(results.get(timeout=60), 2500)
+        finally:
+            process.join(10)
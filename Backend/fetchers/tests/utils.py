@@ -0,0 +1,26 @@
+from django.test import SimpleTestCase
+
+from fetchers.replay import (
+    REPLAY,
+    fixture_store,
+    set_replay_browser,
+    set_replay_mode,
+)
+
+
+class ReplayTestCase(SimpleTestCase):
+    """
+    Runs fetchers against the recorded pages in ``fetchers/fixtures``: HTTP
+    requests go to the local replay server and the browser tier to FakeDriver.
+    """
+
+    def setUp(self):
+        super().setUp()
+        set_replay_mode(REPLAY)
+        set_replay_browser("fake")
+        self.addCleanup(set_replay_mode, None)
+        self.addCleanup(set_replay_browser, None)
+
+    @staticmethod
+    def fixture(kind: str, url: str) -> str:
+        return fixture_store.load(kind, url)
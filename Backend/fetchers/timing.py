@@ -0,0 +1,58 @@
+"""
+Per-stage latency instrumentation for fetchers.
+
+The fetch path is wrapped in :func:`stage` blocks. They cost one attribute
+lookup unless a :class:`StageRecorder` is active on the current thread, which
+is what the benchmark command does around each fetch.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+DRIVER_STARTUP = "driver_startup"
+NAVIGATION = "navigation"
+READINESS = "readiness"
+TRANSFER = "transfer"
+PARSE = "parse"
+CACHE_WRITE = "cache_write"
+STAGES = (DRIVER_STARTUP, NAVIGATION, READINESS, TRANSFER, PARSE, CACHE_WRITE)
+
+_local = threading.local()
+
+
+class StageRecorder:
+    """Accumulates seconds spent per stage while active on a thread."""
+
+    def __init__(self):
+        self.stages = defaultdict(float)
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] += seconds
+
+    @contextmanager
+    def active(self):
+        previous = getattr(_local, "recorder", None)
+        _local.recorder = self
+        try:
+            yield self
+        finally:
+            _local.recorder = previous
+
+    def as_ms(self) -> dict:
+        return {name: self.stages.get(name, 0.0) * 1000 for name in STAGES}
+
+
+@contextmanager
+def stage(name: str):
+    """Attribute the time spent in the block to ``name`` on the active recorder."""
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(name, time.perf_counter() - start)
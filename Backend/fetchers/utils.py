@@ -1,19 +1,211 @@
-import importlib
+import asyncio
+import inspect
+import math
+import time
 
-from django.core.exceptions import ImproperlyConfigured
+from django.conf import settings
+
+from core.utils.platform_cache import PlatformCacheManager
+from fetchers.base import BatchApiFetcher
+from fetchers.cdp import async_browser
+from fetchers.deadline import (
+    FetchTimeout,
+    TaskCanceller,
+    call_with_deadline,
+    current_cancel_scope,
+    hedged_call,
+    latency_p95,
+    record_latency,
+)
+from fetchers.registry import fetcher_registry
+from fetchers.resilience import FetchGuard, FetchSkipped
+
+
+def get_fetcher(platform):
+    """
+    Given a Platform instance that has fetch_script and page_url,
+    return its fetcher instance from the process-wide registry.
+    """
+    return fetcher_registry.get_fetcher(platform)
 
 
 def run_fetcher(platform) -> int:
     """
     Given a Platform instance that has fetch_script and page_url,
-    import & instantiate the fetcher, call fetch_followers_count(),
+    look up its fetcher, call fetch_followers_count(),
     return the int.
+
+    The call goes through the platform's circuit breaker and its domain's
+    rate limiter, so it raises FetchSkipped instead of fetching when either
+    says no. It runs under the fetcher's deadline and raises FetchTimeout
+    (after killing any browser it was stuck in) when that passes. With
+    FETCH_HEDGE_ENABLED, a second attempt is started once the first has run
+    longer than the platform's p95 latency, and the first to finish wins.
+    Fetchers whose fetch_followers_count is a coroutine are supported too.
     """
-    fetch_script = platform.fetch_script
-    if not fetch_script:
-        raise ImproperlyConfigured(f"No FetchScript linked for {platform.name}")
-    module_path, class_name = fetch_script.script_path.rsplit(".", 1)
-    module = importlib.import_module(module_path)
-    FetcherCls = getattr(module, class_name)
-    fetcher = FetcherCls(platform.page_url)
-    return fetcher.fetch_followers_count()
+    fetcher = get_fetcher(platform)
+    guard = FetchGuard(platform)
+    guard.enter(rate_limit=not fetcher.rate_limits_own_requests)
+
+    hedge = {}
+
+    def hedged_fetch():
+        # A separate instance, so the two attempts never share fetcher state.
+        hedge["fetcher"] = type(fetcher)(platform.page_url)
+        return call_fetcher(hedge["fetcher"])
+
+    hedge_after = None
+    if getattr(settings, "FETCH_HEDGE_ENABLED", False):
+        hedge_after = latency_p95(platform.name)
+
+    start = time.monotonic()
+    try:
+        count, winner = hedged_call(
+            [lambda: call_fetcher(fetcher), hedged_fetch],
+            timeout=fetch_deadline(fetcher),
+            hedge_after=hedge_after,
+            can_hedge=guard.try_acquire_extra,
+            name=f"fetch {platform.name}",
+        )
+    except FetchSkipped:
+        # Our own rate limiter refused a request inside the fetcher; the site
+        # did not fail, so the breaker must not count it.
+        guard.record_skipped()
+        raise
+    except Exception:
+        guard.record_failure()
+        raise
+    guard.record_success()
+    record_latency(platform.name, time.monotonic() - start)
+    record_fetch_tier(platform, hedge["fetcher"] if winner else fetcher)
+    return count
+
+
+def call_fetcher(fetcher) -> int:
+    """
+    Call fetch_followers_count() on a sync or async fetcher and return the count.
+
+    A coroutine is run to completion on a new event loop in this thread. If the
+    attempt it belongs to is cancelled by its deadline, the coroutine is
+    cancelled too and FetchTimeout is raised.
+    """
+    if not inspect.iscoroutinefunction(fetcher.fetch_followers_count):
+        return fetcher.fetch_followers_count()
+    return asyncio.run(_cancellable(fetcher.fetch_followers_count()))
+
+
+async def _cancellable(coro):
+    task = asyncio.ensure_future(coro)
+    canceller = TaskCanceller(task)
+    scope = current_cancel_scope()
+    try:
+        if scope is not None:
+            scope.register(canceller)
+        return await task
+    except asyncio.CancelledError:
+        raise FetchTimeout("Async fetch was cancelled by its deadline")
+    finally:
+        task.cancel()
+        if scope is not None:
+            scope.unregister(canceller)
+        # Each asyncio.run() has its own loop, so its DevTools connection ends here.
+        await async_browser.disconnect()
+
+
+def fetch_deadline(fetcher) -> float:
+    """Seconds a single fetch by this fetcher may take before it is cancelled."""
+    return getattr(fetcher, "fetch_deadline", None) or getattr(
+        settings, "FETCH_DEADLINE", 90
+    )
+
+
+def run_fetcher_batch(platforms) -> dict:
+    """
+    Fetch several platforms that share one fetcher class in a single batch:
+    one browser session with a tab per platform, or one API request per
+    chunk of accounts for a BatchApiFetcher.
+
+    Each platform still goes through its own breaker and rate limiter.
+
+    Returns:
+        dict: Platform name mapped to its count, or to the exception raised
+        for it (FetchSkipped when its guard refused the fetch)
+    """
+    platforms = list(platforms)
+    if not platforms:
+        return {}
+    fetcher = get_fetcher(platforms[0])
+
+    results, admitted = {}, {}
+    for platform in platforms:
+        guard = FetchGuard(platform)
+        try:
+            guard.enter(rate_limit=not fetcher.rate_limits_own_requests)
+        except FetchSkipped as e:
+            results[platform.name] = e
+            continue
+        admitted[platform.page_url] = (platform, guard)
+
+    if not admitted:
+        return results
+
+    urls = list(admitted)
+    # Tabs (or API IDs) go batch_max_tabs (batch_size) at a time; allow one deadline per chunk.
+    chunk_size = getattr(fetcher, "batch_size", None) or getattr(
+        fetcher, "batch_max_tabs", 1
+    )
+    chunks = math.ceil(len(urls) / max(chunk_size, 1))
+    try:
+        counts = call_with_deadline(
+            lambda: fetcher.fetch_followers_counts(urls),
+            timeout=fetch_deadline(fetcher) * chunks,
+            name=f"batch fetch {type(fetcher).__name__}",
+        )
+    except Exception as e:
+        counts = {url: e for url in admitted}
+
+    for url, (platform, guard) in admitted.items():
+        outcome = counts.get(url, ValueError(f"No result for {url}"))
+        if isinstance(outcome, FetchSkipped):
+            guard.record_skipped()
+        elif isinstance(outcome, Exception):
+            guard.record_failure()
+        else:
+            guard.record_success()
+            tier = (fetcher.last_batch_tiers or {}).get(url)
+            if tier:
+                PlatformCacheManager.set_fetch_tier(platform.name, tier)
+        results[platform.name] = outcome
+    return results
+
+
+def group_batch_api_platforms(platforms):
+    """
+    Split platforms into ones fetched on their own and lists of platforms that
+    share a BatchApiFetcher class (and have distinct URLs), so each list can
+    go to run_fetcher_batch.
+
+    Returns:
+        tuple: (single platforms, list of platform lists)
+    """
+    singles, groups = [], {}
+    for platform in platforms:
+        try:
+            fetcher = get_fetcher(platform)
+        except Exception:
+            # Let the single-platform path report the configuration error.
+            singles.append(platform)
+            continue
+        group = groups.setdefault(type(fetcher), {})
+        if not isinstance(fetcher, BatchApiFetcher) or platform.page_url in group:
+            singles.append(platform)
+        else:
+            group[platform.page_url] = platform
+    return singles, [list(group.values()) for group in groups.values() if group]
+
+
+def record_fetch_tier(platform, fetcher):
+    """Remember which tier produced the platform's latest count, for diagnostics."""
+    tier = getattr(fetcher, "last_fetch_tier", None)
+    if tier:
+        PlatformCacheManager.set_fetch_tier(platform.name, tier)
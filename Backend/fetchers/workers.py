@@ -0,0 +1,322 @@
+"""
+Supervised subprocess pool for browser fetches.
+
+With ``BROWSER_WORKER_PROCESSES > 0`` the browser tier no longer runs Chrome
+inside the calling process (a Celery prefork child, the web server, a
+management command). Each browser job is sent to a dedicated worker process
+that owns its own ``browser_pool``. The supervisor:
+
+* restarts a worker that crashed or stopped answering;
+* retires a worker once its process tree (Chrome included) exceeds
+  ``BROWSER_WORKER_MAX_RSS_MB`` or it has served ``BROWSER_WORKER_MAX_JOBS`` jobs;
+* starts every worker in its own session and kills the whole process group on
+  retirement, so no Chrome outlives its worker, and reaps orphaned browsers
+  left behind by processes that died without cleaning up.
+
+Workers are fresh interpreters started with ``subprocess``, so they never
+inherit the parent's threads, sockets or pooled browsers, and they can be
+started from daemonic processes such as Celery's prefork children, where
+``multiprocessing`` refuses to create children. Jobs and replies travel as
+pickled messages over a socket pair.
+"""
+
+import atexit
+import os
+import pickle
+import signal
+import socket
+import subprocess
+import sys
+import threading
+from multiprocessing.connection import Connection
+from queue import Empty, Queue
+
+from django.conf import settings
+from selenium.common.exceptions import WebDriverException
+
+from core.utils.logger import logger
+from fetchers.browser import _process_tree_rss_mb, reap_orphaned_browsers
+from fetchers.deadline import current_cancel_scope
+from fetchers.replay import (
+    replay_browser,
+    replay_mode,
+    set_replay_browser,
+    set_replay_mode,
+)
+
+PAGE_JOB = "page"
+TABS_JOB = "tabs"
+
+_in_worker = False
+
+
+class BrowserWorkerError(WebDriverException):
+    """A browser job failed in the worker with an error that could not be sent back."""
+
+
+class BrowserWorkerCrashed(BrowserWorkerError):
+    """The browser worker died or stopped answering; it is retired."""
+
+
+def serve(fd: int):
+    """Entry point of a browser worker process: run jobs until told to stop."""
+    global _in_worker
+    _in_worker = True
+    conn = Connection(fd)
+
+    import django
+
+    django.setup()
+
+    from django.utils.module_loading import import_string
+
+    from fetchers.browser import browser_pool
+
+    try:
+        while True:
+            try:
+                job = conn.recv()
+            except EOFError:
+                break
+            if job is None:
+                break
+
+            set_replay_mode(job["replay_mode"])
+            set_replay_browser(job["replay_browser"])
+            try:
+                fetcher = import_string(job["fetcher"])(job["urls"][0])
+                parser = getattr(fetcher, job["parser"])
+                if job["kind"] == TABS_JOB:
+                    outcomes = fetcher._fetch_tabs_with_browser(job["urls"], parser)
+                    reply = ("ok", {url: _portable(v) for url, v in outcomes.items()})
+                else:
+                    reply = ("ok", fetcher._fetch_with_browser(job["urls"][0], parser))
+            except Exception as e:
+                reply = ("error", _portable(e))
+            conn.send(reply)
+    finally:
+        browser_pool.close()
+
+
+def _portable(value):
+    """
+    Errors cross the socket as themselves, so the caller can tell parser and
+    WebDriver errors apart; ones that do not survive pickling become
+    :class:`BrowserWorkerError`.
+    """
+    if not isinstance(value, Exception):
+        return value
+    try:
+        pickle.loads(pickle.dumps(value))
+    except Exception:
+        return BrowserWorkerError(f"{type(value).__name__}: {value}")
+    return value
+
+
+def start_worker_process(entry_point: str):
+    """
+    Start a fresh interpreter running ``entry_point(fd)``, where ``fd`` is its end
+    of a socket pair, in a session of its own.
+
+    Args:
+        entry_point: Dotted path of the function to run, e.g. ``fetchers.workers.serve``
+
+    Returns:
+        tuple: (the ``subprocess.Popen``, the parent's end of the pair as a
+        :class:`multiprocessing.connection.Connection`)
+    """
+    module, name = entry_point.rsplit(".", 1)
+    command = f"import sys; from {module} import {name}; {name}(int(sys.argv[1]))"
+    parent_sock, child_sock = socket.socketpair()
+    with parent_sock, child_sock:
+        process = subprocess.Popen(
+            [sys.executable, "-c", command, str(child_sock.fileno())],
+            cwd=settings.BASE_DIR,
+            env={
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": os.environ.get(
+                    "DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE
+                ),
+            },
+            stdin=subprocess.DEVNULL,
+            pass_fds=(child_sock.fileno(),),
+            # Its own session, so the whole process group can be killed at once.
+            start_new_session=True,
+        )
+        return process, Connection(parent_sock.detach())
+
+
+class BrowserWorker:
+    """Parent-side handle on one worker process."""
+
+    def __init__(self):
+        self.process, self.conn = start_worker_process("fetchers.workers.serve")
+        self.jobs_done = 0
+        logger.info(f"Started browser worker (pid={self.pid})")
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def rss_mb(self) -> float:
+        return _process_tree_rss_mb(self.pid)
+
+    def call(self, job: dict, timeout: float):
+        try:
+            self.conn.send(job)
+            if not self.conn.poll(timeout):
+                raise BrowserWorkerCrashed(f"Browser worker (pid={self.pid}) timed out")
+            status, payload = self.conn.recv()
+        except (EOFError, OSError) as e:
+            raise BrowserWorkerCrashed(f"Browser worker (pid={self.pid}) died: {e}")
+        self.jobs_done += 1
+        if status == "error":
+            raise payload
+        return payload
+
+    def stop(self):
+        """Ask the worker to exit, then kill its process group whatever it did."""
+        try:
+            self.conn.send(None)
+            self.process.wait(5)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+    def kill(self):
+        """SIGKILL the worker and every process in its session (its Chrome included)."""
+        try:
+            os.killpg(self.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            self.process.wait(1)
+        except subprocess.TimeoutExpired:
+            pass
+        self.conn.close()
+
+
+class BrowserWorkerPool:
+    """Bounded pool of :class:`BrowserWorker` processes, restarted as needed."""
+
+    def __init__(self, size: int, max_rss_mb: int, max_jobs: int):
+        self.size = size
+        self.max_rss_mb = max_rss_mb
+        self.max_jobs = max_jobs
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = Queue()
+        self._slots = threading.BoundedSemaphore(max(self.size, 1))
+        self._lock = threading.Lock()
+        self._live = set()
+
+    @property
+    def enabled(self) -> bool:
+        """True when browser jobs should be shipped to worker processes."""
+        return self.size > 0 and not _in_worker
+
+    def _checkout(self) -> BrowserWorker:
+        if self._pid != os.getpid():
+            self._reset()
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except Empty:
+                reap_orphaned_browsers()
+                worker = BrowserWorker()
+                with self._lock:
+                    self._live.add(worker)
+                return worker
+            if worker.is_alive():
+                return worker
+            self._retire(worker, "exited")
+
+    def _retire(self, worker: BrowserWorker, reason: str):
+        logger.info(f"Retiring browser worker (pid={worker.pid}): {reason}")
+        with self._lock:
+            self._live.discard(worker)
+        worker.stop()
+
+    def _checkin(self, worker: BrowserWorker):
+        if worker.jobs_done >= self.max_jobs:
+            self._retire(worker, f"served {worker.jobs_done} jobs")
+            return
+        rss = worker.rss_mb()
+        if rss > self.max_rss_mb:
+            self._retire(worker, f"using {rss:.0f} MB")
+            return
+        self._idle.put(worker)
+
+    def run(self, fetcher, kind: str, urls, parser_name: str, timeout: float):
+        """
+        Run a browser job for ``fetcher`` in a worker process.
+
+        Raises:
+            BrowserWorkerCrashed: If the worker crashed or did not answer in time
+        """
+        job = {
+            "kind": kind,
+            "fetcher": f"{type(fetcher).__module__}.{type(fetcher).__qualname__}",
+            "urls": list(urls),
+            "parser": parser_name,
+            "replay_mode": replay_mode(),
+            "replay_browser": replay_browser(),
+        }
+        scope = current_cancel_scope()
+        with self._slots:
+            worker = self._checkout()
+            try:
+                if scope is not None:
+                    # A fetch deadline kills the worker's whole process group.
+                    scope.register(worker)
+                result = worker.call(job, timeout)
+            except BrowserWorkerCrashed:
+                self._retire(worker, "crashed or timed out")
+                raise
+            except BaseException:
+                if scope is not None and scope.cancelled:
+                    self._retire(worker, "killed by fetch deadline")
+                else:
+                    self._checkin(worker)
+                raise
+            else:
+                self._checkin(worker)
+            finally:
+                if scope is not None:
+                    scope.unregister(worker)
+
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            live = list(self._live)
+        return {
+            "live": len(live),
+            "idle": self._idle.qsize(),
+            "size": self.size,
+            "rss_mb": {worker.pid: round(worker.rss_mb()) for worker in live},
+        }
+
+    def close(self):
+        """Stop every worker owned by this process."""
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            live, self._live = self._live, set()
+        for worker in live:
+            worker.stop()
+        self._idle = Queue()
+
+
+browser_workers = BrowserWorkerPool(
+    size=getattr(settings, "BROWSER_WORKER_PROCESSES", 0),
+    max_rss_mb=getattr(settings, "BROWSER_WORKER_MAX_RSS_MB", 1536),
+    max_jobs=getattr(settings, "BROWSER_WORKER_MAX_JOBS", 200),
+)
+
+atexit.register(browser_workers.close)
@@ -0,0 +1,259 @@
+import json
+import statistics
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.platform_cache import PlatformCacheManager
+from fetchers import call_fetcher, get_fetcher
+from fetchers.browser import browser_pool
+from fetchers.replay import (
+    REPLAY,
+    REPLAY_BROWSERS,
+    fixture_store,
+    set_replay_browser,
+    set_replay_mode,
+)
+from fetchers.timing import CACHE_WRITE, STAGES, StageRecorder, stage
+from metrics.models import Platform
+
+TOTAL = "total"
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "fetchers" / "benchmarks" / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark each fetcher stage by stage (driver startup, navigation, readiness, "
+        "transfer, parse, cache write) against recorded fixtures"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--platform",
+            type=str,
+            help="Benchmark platforms whose name contains this text",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed fetches per platform",
+        )
+        parser.add_argument(
+            "--browser",
+            choices=REPLAY_BROWSERS,
+            default="fake",
+            help="Replay the browser tier with the file-backed fake driver or a real Chrome",
+        )
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Close pooled browsers before every run so driver startup is measured each time",
+        )
+        parser.add_argument(
+            "--json",
+            type=str,
+            help="Write the results as JSON to this file ('-' for stdout)",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=str,
+            default=str(DEFAULT_BASELINE),
+            help="Baseline JSON to compare against (written on the first run)",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store these results as the new baseline",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=20.0,
+            help="Percent slowdown of a stage median that counts as a regression",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error when any stage regressed past the threshold",
+        )
+
+    def handle(self, *args, **options):
+        platforms = Platform.objects.get_all()
+        if options["platform"]:
+            needle = options["platform"].lower()
+            platforms = [p for p in platforms if needle in p.name.lower()]
+        if not platforms:
+            raise CommandError("No platforms to benchmark")
+
+        set_replay_mode(REPLAY)
+        set_replay_browser(options["browser"])
+        self.stdout.write(
+            f"Replaying fixtures from {fixture_store.root} "
+            f"({options['browser']} browser, {options['repeat']} runs each)"
+        )
+        try:
+            results = {
+                platform.name: self.benchmark(
+                    platform, options["repeat"], options["cold"]
+                )
+                for platform in platforms
+            }
+        finally:
+            set_replay_mode(None)
+            set_replay_browser(None)
+            browser_pool.close()
+
+        baseline_path = Path(options["baseline"])
+        baseline = self.load_baseline(baseline_path)
+        regressions = self.compare(results, baseline, options["threshold"])
+        self.print_table(results, baseline)
+
+        if options["json"]:
+            payload = json.dumps(
+                {"results": results, "regressions": regressions}, indent=2
+            )
+            if options["json"] == "-":
+                self.stdout.write(payload)
+            else:
+                Path(options["json"]).write_text(payload, encoding="utf-8")
+
+        if options["save_baseline"]:
+            self.save_baseline(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}"))
+        elif not baseline_path.exists():
+            self.save_baseline(baseline_path, results)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"No baseline at {baseline_path} yet; saved these results "
+                    "as the baseline for the next runs"
+                )
+            )
+
+        for regression in regressions:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Regression: {regression['platform']} {regression['stage']} "
+                    f"{regression['baseline_ms']:.1f} ms -> {regression['median_ms']:.1f} ms "
+                    f"(+{regression['percent']:.0f}%)"
+                )
+            )
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} stage(s) regressed")
+
+    def benchmark(self, platform, repeat: int, cold: bool) -> dict:
+        """Run the platform's fetcher ``repeat`` times and summarize each stage."""
+        fetcher = get_fetcher(platform)
+        # Cache writes go to a scratch name so the real platform's numbers are untouched.
+        scratch_name = f"benchmark_{platform.name}"
+        runs, errors, count = [], [], None
+
+        for _ in range(max(repeat, 1)):
+            if cold:
+                browser_pool.close()
+            recorder = StageRecorder()
+            with recorder.active():
+                try:
+                    count = call_fetcher(fetcher)
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+                with stage(CACHE_WRITE):
+                    PlatformCacheManager.update_platform_metrics(scratch_name, count)
+            timings = recorder.as_ms()
+            timings[TOTAL] = sum(timings.values())
+            runs.append(timings)
+
+        PlatformCacheManager.clear_platform_cache(scratch_name)
+        return {
+            "runs": len(runs),
+            "errors": errors,
+            "followers": count,
+            "tier": fetcher.last_fetch_tier,
+            "stages": {
+                name: self.summarize([run[name] for run in runs])
+                for name in STAGES + (TOTAL,)
+            },
+        }
+
+    @staticmethod
+    def summarize(values) -> dict:
+        if not values:
+            return {"median_ms": None, "p95_ms": None}
+        ordered = sorted(values)
+        p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+        return {"median_ms": statistics.median(ordered), "p95_ms": p95}
+
+    @staticmethod
+    def load_baseline(path: Path) -> dict:
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as e:
+            raise CommandError(f"Unreadable baseline {path}: {e}")
+
+    @staticmethod
+    def save_baseline(path: Path, results: dict):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    @staticmethod
+    def compare(results: dict, baseline: dict, threshold: float) -> list:
+        """Stages whose median grew more than ``threshold`` percent (and at least 1 ms)."""
+        regressions = []
+        for name, result in results.items():
+            for stage_name, summary in result["stages"].items():
+                before = (
+                    baseline.get(name, {})
+                    .get("stages", {})
+                    .get(stage_name, {})
+                    .get("median_ms")
+                )
+                now = summary["median_ms"]
+                if not before or now is None or now - before < 1:
+                    continue
+                percent = (now - before) / before * 100
+                if percent > threshold:
+                    regressions.append(
+                        {
+                            "platform": name,
+                            "stage": stage_name,
+                            "baseline_ms": before,
+                            "median_ms": now,
+                            "percent": percent,
+                        }
+                    )
+        return regressions
+
+    def print_table(self, results: dict, baseline: dict):
+        columns = STAGES + (TOTAL,)
+        header = f"{'platform':<16} {'tier':<8} " + " ".join(
+            f"{c:>14}" for c in columns
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for name, result in results.items():
+            if not result["runs"]:
+                self.stdout.write(
+                    self.style.ERROR(f"{name[:16]:<16} failed: {result['errors'][-1]}")
+                )
+                continue
+            cells = []
+            for column in columns:
+                median = result["stages"][column]["median_ms"]
+                before = (
+                    baseline.get(name, {})
+                    .get("stages", {})
+                    .get(column, {})
+                    .get("median_ms")
+                )
+                cell = f"{median:.1f}"
+                if before:
+                    cell += f" ({(median - before) / before * 100:+.0f}%)"
+                cells.append(f"{cell:>14}")
+            self.stdout.write(
+                f"{name[:16]:<16} {str(result['tier']):<8} " + " ".join(cells)
+            )
@@ -0,0 +1,109 @@
+import statistics
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fetchers import platforms as fetcher_platforms
+from fetchers.parsing import BACKENDS, available_backends, make_soup
+
+
+class Command(BaseCommand):
+    help = "Benchmark HTML parser backends against stored page sources"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "pages",
+            nargs="+",
+            help="HTML files or directories of *.html files (e.g. facebook_page.html)",
+        )
+        parser.add_argument(
+            "--fetcher",
+            type=str,
+            help="Fetcher class to parse with (e.g. FacebookFetcher). "
+            "Defaults to the one named by each file's prefix.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed runs per page and backend",
+        )
+        parser.add_argument(
+            "--backends",
+            nargs="+",
+            choices=BACKENDS,
+            help="Backends to compare (defaults to every installed backend)",
+        )
+
+    def handle(self, *args, **options):
+        backends = options["backends"] or available_backends()
+        missing = [b for b in backends if b not in available_backends()]
+        if missing:
+            raise CommandError(f"Backend(s) not installed: {', '.join(missing)}")
+
+        pages = self.collect_pages(options["pages"])
+        if not pages:
+            raise CommandError("No HTML pages found")
+
+        header = f"{'page':<32} {'backend':<12} {'full tree ms':>13} {'extract ms':>11} {'result':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for page in pages:
+            fetcher_cls = self.fetcher_for(page, options["fetcher"])
+            page_source = page.read_text(encoding="utf-8", errors="replace")
+
+            for backend in backends:
+                full_ms = self.time_ms(
+                    lambda: make_soup(page_source, backend=backend), options["repeat"]
+                )
+
+                fetcher = fetcher_cls("")
+                fetcher.parser_backend = backend
+                extract = getattr(fetcher, "_parse_rendered_page", None)
+                if extract is None:
+                    extract_ms, result = float("nan"), "n/a"
+                else:
+                    try:
+                        result = extract(page_source)
+                        extract_ms = self.time_ms(
+                            lambda: extract(page_source), options["repeat"]
+                        )
+                    except ValueError as e:
+                        extract_ms, result = float("nan"), f"error: {e}"[:10]
+
+                self.stdout.write(
+                    f"{page.name[:32]:<32} {backend:<12} {full_ms:>13.2f} "
+                    f"{extract_ms:>11.2f} {str(result):>10}"
+                )
+
+    @staticmethod
+    def collect_pages(paths):
+        pages = []
+        for raw in paths:
+            path = Path(raw)
+            if path.is_dir():
+                pages.extend(sorted(path.glob("*.html")))
+            elif path.is_file():
+                pages.append(path)
+        return pages
+
+    @staticmethod
+    def fetcher_for(page: Path, class_name: str = None):
+        if not class_name:
+            prefix = page.stem.replace("-", "_").split("_")[0]
+            class_name = f"{prefix.capitalize()}Fetcher"
+        if class_name not in fetcher_platforms.__all__:
+            raise CommandError(f"Unknown fetcher {class_name!r} for page {page.name}")
+        return getattr(fetcher_platforms, class_name)
+
+    @staticmethod
+    def time_ms(func, repeat: int) -> float:
+        """Median wall time of ``repeat`` calls, in milliseconds."""
+        timings = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -1,10 +1,13 @@
+import os
+import sys
+import traceback
+from datetime import datetime
+
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-import traceback
-import sys
-import os
 
 from core.utils.logger import logger
+from fetchers.diagnostics import add_report_arguments, report_requested, run_report
 from metrics.models import Platform
 
 
@@ -22,12 +25,46 @@ class Command(BaseCommand):
             action='store_true',
             help='Test browser environment setup',
         )
+        parser.add_argument(
+            '--record',
+            action='store_true',
+            help='Fetch live and save every page seen as a replay fixture',
+        )
+        parser.add_argument(
+            '--replay',
+            action='store_true',
+            help='Fetch from recorded fixtures only, without touching the network',
+        )
+        parser.add_argument(
+            '--from-snapshot',
+            action='store_true',
+            help='Re-parse the latest stored page snapshot instead of fetching again',
+        )
+        add_report_arguments(parser)
 
     def handle(self, *args, **options):
         platform_name = options.get('platform')
         test_browser = options.get('test_browser', False)
+        self.from_snapshot = options.get('from_snapshot', False)
 
-        self.stdout.write(self.style.SUCCESS("🔍 DETAILED Platform Diagnostics Starting..."))
+        if options.get('record') and options.get('replay'):
+            self.stdout.write(self.style.ERROR("--record and --replay are mutually exclusive"))
+            return
+        if report_requested(options) and (self.from_snapshot or test_browser):
+            self.stdout.write(self.style.ERROR(
+                "--from-snapshot and --test-browser cannot be combined with --parallel/--profile/--format"
+            ))
+            return
+        if options.get('record') or options.get('replay'):
+            from fetchers.replay import RECORD, REPLAY, fixture_store, set_replay_mode
+            set_replay_mode(RECORD if options.get('record') else REPLAY)
+            # Structured reports may be on stdout, so notes go to stderr there.
+            notes = self.stderr if report_requested(options) else self.stdout
+            notes.write(f"📼 Replay mode: {'record' if options.get('record') else 'replay'} "
+                        f"(fixtures in {fixture_store.root})")
+
+        if not report_requested(options):
+            self.stdout.write(self.style.SUCCESS("🔍 DETAILED Platform Diagnostics Starting..."))
 
         # Test browser environment first
         if test_browser:
@@ -49,6 +86,10 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR("No platforms found in database"))
             return
 
+        if report_requested(options):
+            run_report(self, list(platforms), options)
+            return
+
         self.stdout.write(f"Testing {platforms.count()} platform(s) with detailed logging...")
 
         for platform in platforms:
@@ -152,6 +193,10 @@ class Command(BaseCommand):
             fetcher_instance = fetcher_class(platform.page_url)
             self.stdout.write("  ✓ Fetcher instance created successfully")
 
+            if self.from_snapshot:
+                self.reparse_snapshot(fetcher_instance)
+                return
+
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"  ✗ Fetcher setup failed: {e}"))
             self.stdout.write("  📋 Full traceback:")
@@ -241,3 +286,31 @@ class Command(BaseCommand):
                 self.stdout.write("  • Chrome not found in PATH")
         except:
             self.stdout.write("  • Could not check Chrome location")
+
+    def reparse_snapshot(self, fetcher):
+        """Parse the newest stored snapshot and show what the parser sees"""
+        from fetchers.snapshots import snapshot_store
+
+        self.stdout.write("\n🗄️ SNAPSHOT RE-PARSE:")
+        self.stdout.write(f"  📂 Store: {snapshot_store.root}")
+        for url in fetcher.snapshot_urls():
+            records = snapshot_store.records(url)
+            self.stdout.write(f"  🔗 {url}: {len(records)} snapshot(s)")
+            for record in records[:5]:
+                taken_at = datetime.fromtimestamp(record['taken_at'])
+                self.stdout.write(
+                    f"    • {taken_at.isoformat(timespec='seconds')} {record['tier']:<8} "
+                    f"{record['size']:>9} bytes  {record['digest'][:12]}"
+                )
+
+        try:
+            record, count = fetcher.reparse_latest_snapshot()
+            self.stdout.write(
+                self.style.SUCCESS(f"  ✓ Parsed {count} followers from the latest {record['tier']} snapshot")
+            )
+        except LookupError as e:
+            self.stdout.write(self.style.WARNING(f"  ⚠ {e}"))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"  ✗ Re-parse failed: {e}"))
+            self.stdout.write("  📋 Full traceback:")
+            self.stdout.write(traceback.format_exc())
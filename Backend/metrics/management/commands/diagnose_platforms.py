@@ -1,7 +1,10 @@
+from datetime import datetime
+
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from core.utils.logger import logger
+from fetchers.diagnostics import add_report_arguments, report_requested, run_report
 from metrics.models import Platform
 
 
@@ -19,12 +22,26 @@ class Command(BaseCommand):
             action='store_true',
             help='Show detailed output',
         )
+        parser.add_argument(
+            '--from-snapshot',
+            action='store_true',
+            help='Re-parse the latest stored page snapshot instead of fetching again',
+        )
+        add_report_arguments(parser)
 
     def handle(self, *args, **options):
         platform_name = options.get('platform')
         verbose = options.get('verbose', False)
+        self.from_snapshot = options.get('from_snapshot', False)
+
+        if report_requested(options) and self.from_snapshot:
+            self.stdout.write(
+                self.style.ERROR("--from-snapshot cannot be combined with --parallel/--profile/--format")
+            )
+            return
 
-        self.stdout.write(self.style.SUCCESS("🔍 Platform Diagnostics Starting..."))
+        if not report_requested(options):
+            self.stdout.write(self.style.SUCCESS("🔍 Platform Diagnostics Starting..."))
 
         # Get platforms to test
         if platform_name:
@@ -41,6 +58,10 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR("No platforms found in database"))
             return
 
+        if report_requested(options):
+            run_report(self, list(platforms), options)
+            return
+
         self.stdout.write(f"Testing {platforms.count()} platform(s)...")
 
         for platform in platforms:
@@ -98,6 +119,10 @@ class Command(BaseCommand):
                 fetcher_instance = fetcher_class(platform.page_url)
                 self.stdout.write(f"  ✓ Successfully created fetcher instance")
 
+                if self.from_snapshot:
+                    self.test_snapshot(fetcher_instance, verbose)
+                    return
+
                 # Test 4: Metrics Refresh (Dry Run)
                 self.stdout.write("\n📊 Metrics Refresh Test:")
 
@@ -129,6 +154,8 @@ class Command(BaseCommand):
                         import traceback
                         self.stdout.write(traceback.format_exc())
 
+                self.show_strategy_stats(fetcher_instance)
+
         except ImportError as e:
             self.stdout.write(self.style.ERROR(f"  ✗ Import failed: {e}"))
         except AttributeError as e:
@@ -155,3 +182,48 @@ class Command(BaseCommand):
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"  ✗ Cache error: {e}"))
+
+    def show_strategy_stats(self, fetcher):
+        """Show which extraction strategies have been winning for this platform"""
+        from fetchers.strategies import strategy_memory, strategy_scope
+
+        stats = strategy_memory.stats(strategy_scope(fetcher))
+        if not stats['strategies']:
+            return
+
+        self.stdout.write("\n🧭 Extraction Strategies:")
+        for name, entry in stats['strategies'].items():
+            marker = "★" if name == stats['winner'] else " "
+            avg_ms = entry['avg_ms'] if entry['avg_ms'] is not None else 0
+            self.stdout.write(
+                f"  {marker} {name}: {entry['wins']} won, {entry['misses']} missed, "
+                f"avg {avg_ms:.1f} ms"
+            )
+        if stats['drift']:
+            self.stdout.write(
+                self.style.WARNING(f"  ⚠ Winning strategy changed {stats['drift']} time(s)")
+            )
+
+    def test_snapshot(self, fetcher, verbose=False):
+        """Re-parse the newest stored snapshot with the fetcher's parser"""
+        self.stdout.write("\n🗄️ Snapshot Re-parse Test:")
+        try:
+            record, count = fetcher.reparse_latest_snapshot()
+        except LookupError as e:
+            self.stdout.write(self.style.WARNING(f"  ⚠ {e}"))
+            return
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"  ✗ Re-parse failed: {e}"))
+            if verbose:
+                import traceback
+                self.stdout.write(traceback.format_exc())
+            return
+
+        taken_at = datetime.fromtimestamp(record['taken_at'])
+        self.stdout.write(
+            self.style.SUCCESS(f"  ✓ Parsed {count} followers from {record['tier']} snapshot")
+        )
+        self.stdout.write(f"  🕒 Taken At: {taken_at.isoformat(timespec='seconds')}")
+        if verbose:
+            self.stdout.write(f"    URL: {record['url']}")
+            self.stdout.write(f"    Digest: {record['digest']} ({record['size']} bytes)")
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from fetchers.profiles import profile_store
+
+
+class Command(BaseCommand):
+    help = "Delete persistent browser profiles that have not been used within BROWSER_PROFILE_TTL"
+
+    def handle(self, *args, **options):
+        result = profile_store.prune()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {result['removed']} browser profile(s); {result['kept']} kept "
+                f"in {profile_store.root}"
+            )
+        )
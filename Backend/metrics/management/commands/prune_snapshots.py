@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from fetchers.snapshots import snapshot_store
+
+
+class Command(BaseCommand):
+    help = "Drop expired page snapshots and evict the oldest ones over the size budget"
+
+    def handle(self, *args, **options):
+        result = snapshot_store.prune()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Expired {result['expired']}, evicted {result['evicted']}, "
+                f"removed {result['blobs_removed']} blob(s); {result['records']} snapshot(s) kept"
+            )
+        )
@@ -0,0 +1,44 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from fetchers.farm import LocalBrowserFarm
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local stand-in browser farm: several chromedriver nodes to point "
+        "BROWSER_REMOTE_URLS at"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--nodes",
+            type=int,
+            default=2,
+            help="Number of browser nodes (processes) to start",
+        )
+        parser.add_argument(
+            "--base-port",
+            type=int,
+            default=9600,
+            help="Port of the first node; the others follow it",
+        )
+
+    def handle(self, *args, **options):
+        farm = LocalBrowserFarm(
+            nodes=options["nodes"], base_port=options["base_port"]
+        ).start()
+        self.stdout.write(
+            self.style.SUCCESS(f"Started {options['nodes']} browser node(s)")
+        )
+        self.stdout.write(f"BROWSER_REMOTE_URLS='{json.dumps(farm.urls)}'")
+        self.stdout.write("Ctrl+C stops the farm.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            farm.stop()
@@ -0,0 +1,57 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fetchers.stub_api import StubApiServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve account counts from a JSON file as a local stand-in for a batch "
+        "counts API (YouTube channels.list shape), for testing BatchApiFetcher subclasses"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "counts",
+            type=str,
+            help='JSON file mapping account IDs to counts, e.g. {"UC...": 1200}',
+        )
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=8765,
+            help="Port to listen on (127.0.0.1 only)",
+        )
+        parser.add_argument(
+            "--id-param",
+            type=str,
+            default="id",
+            help="Query parameter carrying the comma-separated IDs",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            counts = json.loads(Path(options["counts"]).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read counts from {options['counts']}: {e}")
+
+        server = StubApiServer(
+            counts, id_param=options["id_param"], port=options["port"]
+        ).start()
+        self.stdout.write(
+            self.style.SUCCESS(f"Serving {len(counts)} account(s) at {server.url}")
+        )
+        self.stdout.write(
+            f"Set YOUTUBE_API_URL={server.url} to fetch from it. Ctrl+C stops."
+        )
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+            self.stdout.write(f"Served {len(server.batches)} request(s)")
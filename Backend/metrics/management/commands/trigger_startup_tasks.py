@@ -36,7 +36,9 @@ class Command(BaseCommand):
 
         # Execute all registered tasks immediately
         self.stdout.write("Executing all registered metrics tasks...")
-        task = execute_all_metrics_tasks.apply_async(countdown=1)
+        task = execute_all_metrics_tasks.apply_async(
+            kwargs={"force": True}, countdown=1
+        )
         self.stdout.write(self.style.SUCCESS(f"Tasks scheduled (task ID: {task.id})"))
 
         # Display task count (for informational purposes)
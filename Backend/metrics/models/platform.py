@@ -4,7 +4,7 @@ from django.db import models
 
 from core.utils.logger import logger
 from core.utils.platform_cache import PlatformCacheManager
-from fetchers import run_fetcher
+from fetchers import FetchSkipped, FetchTimeout, run_fetcher
 from metrics.models.fetch_script import FetchScript
 
 
@@ -24,6 +24,8 @@ class PlatformManager(models.Manager):
         """
         Get all active platforms with caching.
         Returns a cached queryset of active platforms to reduce database queries.
+        Fetch scripts are loaded in the same query so refreshes never hit the
+        database per platform.
         """
         from django.core.cache import cache
         from core.utils.logger import logger
@@ -34,7 +36,7 @@ class PlatformManager(models.Manager):
         if platforms is None:
             # Cache miss, fetch from database
             logger.debug("Platform cache miss, fetching from database")
-            platforms = list(self.get_queryset())
+            platforms = list(self.get_queryset().select_related("fetch_script"))
             cache.set(self.CACHE_KEY, platforms, self.CACHE_TIMEOUT)
         else:
             logger.debug("Platform cache hit, using cached platforms")
@@ -166,6 +168,9 @@ class Platform(models.Model):
                 f"Successfully refreshed metrics for {self.name}: {new_followers} followers"
             )
             return True
-        except (KeyError, ValueError, TypeError, AttributeError) as e:
+        except FetchSkipped as e:
+            logger.info(f"Skipped refreshing {self.name}, keeping cached count: {e}")
+            return False
+        except (KeyError, ValueError, TypeError, AttributeError, FetchTimeout) as e:
             logger.error(f"Error refreshing metrics for {self.name}: {e}")
             return False
@@ -5,7 +5,7 @@ from django.contrib import messages
 from django.core.cache import cache
 
 from core.utils.logger import logger
-from metrics.models import Platform
+from metrics.models import FetchScript, Platform
 
 
 def trigger_platform_tasks(platform_name, action):
@@ -44,7 +44,9 @@ def trigger_platform_tasks(platform_name, action):
         from metrics.tasks.tasks import execute_all_metrics_tasks
 
         # Trigger all metrics tasks asynchronously with a small delay
-        task = execute_all_metrics_tasks.apply_async(countdown=3)
+        task = execute_all_metrics_tasks.apply_async(
+            kwargs={"force": True}, countdown=3
+        )
 
         logger.info(
             f"All metrics tasks triggered due to Platform {action} "
@@ -87,3 +89,28 @@ def platform_deleted_handler(sender, instance, **kwargs):
         **kwargs: Additional keyword arguments
     """
     trigger_platform_tasks(instance.name, "deleted")
+
+
+@receiver(post_save, sender=FetchScript)
+@receiver(post_delete, sender=FetchScript)
+def fetch_script_changed_handler(sender, instance, **kwargs):
+    """
+    Signal handler that invalidates resolved fetchers when a FetchScript changes.
+
+    Bumps the fetcher registry version so every worker re-resolves its fetchers,
+    and drops the cached platform list, which embeds each platform's script.
+
+    Args:
+        sender: The model class (FetchScript)
+        instance: The FetchScript instance that was saved or deleted
+        **kwargs: Additional keyword arguments
+    """
+    from fetchers.registry import FetcherRegistry
+    from metrics.models.platform import PlatformManager
+
+    try:
+        FetcherRegistry.bump_version()
+        PlatformManager().invalidate_cache()
+        logger.info(f"Fetcher registry invalidated due to FetchScript '{instance.name}' change")
+    except Exception as e:
+        logger.error(f"Failed to invalidate fetcher registry: {e}")
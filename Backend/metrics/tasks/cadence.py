@@ -0,0 +1,123 @@
+"""
+Adaptive refresh cadence per platform.
+
+Each platform's next refresh is scheduled from how fast its follower count has
+been moving: the time it should take to gain (or lose) REFRESH_TARGET_CHANGE
+followers, clamped between REFRESH_MIN_INTERVAL and REFRESH_MAX_INTERVAL.
+Velocity comes from the last couple of weeks of DailyPlatformMetric rows and
+from the delta observed over the previous refresh interval, whichever is
+faster, so a sudden spike shortens the interval right away.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.utils.cache_keys import CacheKey
+from core.utils.logger import logger
+from core.utils.platform_cache import PlatformCacheManager
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class AdaptiveScheduler:
+    """Decides which platforms are due and when each one should run next."""
+
+    def __init__(self):
+        self.min_interval = getattr(settings, "REFRESH_MIN_INTERVAL", 15 * 60)
+        self.max_interval = getattr(settings, "REFRESH_MAX_INTERVAL", SECONDS_PER_DAY)
+        self.target_change = getattr(settings, "REFRESH_TARGET_CHANGE", 5)
+        self.history_days = getattr(settings, "REFRESH_VELOCITY_DAYS", 14)
+
+    # ─────────────────────────────── Due check ────────────────────────────────
+    def due_platforms(self, platforms, now=None) -> list:
+        """Return the platforms whose scheduled refresh time has passed (or was never set)."""
+        now = now or timezone.now()
+        keys = {
+            CacheKey.PLATFORM_REFRESH_SCHEDULE.build(name=p.name): p for p in platforms
+        }
+        schedules = cache.get_many(list(keys))
+
+        due = []
+        for key, platform in keys.items():
+            schedule = schedules.get(key)
+            next_refresh = (
+                parse_datetime(schedule["next_refresh"]) if schedule else None
+            )
+            if next_refresh is None or next_refresh <= now:
+                due.append(platform)
+        return due
+
+    # ─────────────────────────────── Scheduling ───────────────────────────────
+    def schedule(self, platforms, now=None) -> dict:
+        """
+        Compute and store the next refresh time for each platform.
+
+        Returns:
+            dict: Platform name mapped to the chosen interval in seconds
+        """
+        now = now or timezone.now()
+        daily_velocity = self._daily_velocities(platforms)
+        keys = [
+            CacheKey.PLATFORM_REFRESH_SCHEDULE.build(name=p.name) for p in platforms
+        ]
+        previous = cache.get_many(keys)
+
+        schedules, intervals = {}, {}
+        for key, platform in zip(keys, platforms):
+            velocity = daily_velocity.get(platform.id, 0.0)
+
+            # The delta since the previous refresh covers the interval we picked then.
+            last_interval = (previous.get(key) or {}).get("interval")
+            delta = abs(PlatformCacheManager.get_delta(platform.name) or 0)
+            if last_interval:
+                velocity = max(velocity, delta / last_interval)
+
+            interval = self._interval_for(velocity)
+            intervals[platform.name] = interval
+            schedules[key] = {
+                "next_refresh": (now + timedelta(seconds=interval)).isoformat(),
+                "interval": interval,
+                "velocity_per_day": velocity * SECONDS_PER_DAY,
+            }
+
+        cache.set_many(schedules, timeout=None)
+        logger.debug(f"Next refresh intervals (s): {intervals}")
+        return intervals
+
+    def _interval_for(self, velocity_per_second: float) -> int:
+        if velocity_per_second <= 0:
+            return self.max_interval
+        interval = self.target_change / velocity_per_second
+        return int(min(self.max_interval, max(self.min_interval, interval)))
+
+    def _daily_velocities(self, platforms) -> dict:
+        """Followers per second over the history window, from one query for all platforms."""
+        from metrics.models import DailyPlatformMetric
+
+        since = timezone.now().date() - timedelta(days=self.history_days)
+        rows = (
+            DailyPlatformMetric.objects.filter(
+                platform__in=[p.id for p in platforms], date__gte=since
+            )
+            .order_by("platform_id", "date")
+            .values_list("platform_id", "date", "followers")
+        )
+
+        bounds = {}
+        for platform_id, date, followers in rows:
+            first, _ = bounds.get(platform_id, ((date, followers), None))
+            bounds[platform_id] = (first, (date, followers))
+
+        velocities = {}
+        for platform_id, ((first_date, first), (last_date, last)) in bounds.items():
+            days = (last_date - first_date).days
+            if days > 0:
+                velocities[platform_id] = abs(last - first) / (days * SECONDS_PER_DAY)
+        return velocities
+
+
+adaptive_scheduler = AdaptiveScheduler()
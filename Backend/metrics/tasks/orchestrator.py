@@ -0,0 +1,428 @@
+"""
+Pipelined refresh of platform metrics.
+
+A refresh streams every platform through three stages joined by bounded
+queues, all driven from one asyncio event loop:
+
+* fetch: ``REFRESH_CONCURRENCY`` workers download pages. Blocking
+  (Selenium/requests) fetchers run in a thread pool; fetchers whose
+  ``fetch_followers_count`` is a coroutine run directly on the loop. Platforms
+  sharing a batch-capable fetcher class are fetched as one batch: one tab per
+  platform in a single browser session, or one request per chunk of accounts
+  for a BatchApiFetcher.
+* parse: downloaded pages are parsed in the processes of
+  :data:`fetchers.parse_pool.parse_pool`, so CPU-bound parsing uses every core
+  instead of contending for the GIL with the fetch threads. A page the parser
+  finds no count in sends the platform back to the fetch stage for its next
+  tier, exactly as fetch_followers_count would.
+* persist: a single writer drains finished counts in batches of up to
+  ``REFRESH_WRITE_BATCH`` and writes each batch to the cache in one round trip.
+
+Only fetchers that use the default tier loop (``defers_parsing``) are split
+into separate fetch and parse steps; batches, coroutine fetchers, custom
+fetchers and hedged fetches still parse as part of their fetch. When a queue is
+full the stage feeding it waits, so a slow stage throttles the ones before it
+instead of piling pages up in memory.
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from core.utils.logger import logger
+from core.utils.platform_cache import PlatformCacheManager
+from fetchers import (
+    FetchSkipped,
+    get_fetcher,
+    record_fetch_tier,
+    run_fetcher,
+    run_fetcher_batch,
+)
+from fetchers.base import TIER_ERRORS, RawPage
+from fetchers.cdp import async_browser
+from fetchers.deadline import FetchTimeout, call_with_deadline, record_latency
+from fetchers.parse_pool import ParseWorkerError, fetcher_path, parse_pool
+from fetchers.resilience import FetchGuard
+from fetchers.utils import fetch_deadline
+
+# Errors a fetcher raises when the page did not contain a usable count (or did
+# not load in time). Mirrors the exceptions Platform.refresh_metrics treats as
+# a failed refresh.
+FETCH_ERRORS = (KeyError, ValueError, TypeError, AttributeError, FetchTimeout)
+
+
+class RefreshJob:
+    """One platform, or one batch of platforms, moving through the pipeline."""
+
+    def __init__(self, platforms, batch: bool = False):
+        self.platforms = platforms
+        self.batch = batch
+        self.start = time.perf_counter()
+        self.fetcher = None
+        # Set once the job is fetched tier by tier, with the parse stage in between.
+        self.guard = None
+        self.tier_index = 0
+        self.errors = []
+
+
+class RefreshOrchestrator:
+    """
+    Runs the fetchers for a set of platforms through the fetch, parse and
+    persist stages and writes each result to the platform cache.
+    """
+
+    def __init__(
+        self, concurrency: int = None, queue_size: int = None, write_batch: int = None
+    ):
+        self.concurrency = concurrency or getattr(settings, "REFRESH_CONCURRENCY", 4)
+        self.queue_size = queue_size or getattr(settings, "REFRESH_QUEUE_SIZE", 16)
+        self.write_batch = write_batch or getattr(settings, "REFRESH_WRITE_BATCH", 20)
+
+    def run(self, platforms) -> dict:
+        """
+        Refresh the given platforms and return per-platform results keyed by name:
+        ``{"success": bool, "followers": int | None, "duration_seconds": float}``
+        plus an ``"error"`` message on failure.
+        """
+        platforms = list(platforms)
+        # Resolve the fetch_script relation up front so worker threads never
+        # touch the database.
+        for platform in platforms:
+            platform.fetch_script  # noqa: B018
+        return asyncio.run(self._run_all(platforms))
+
+    async def _run_all(self, platforms) -> dict:
+        start = time.perf_counter()
+        singles, batches = self._group(platforms)
+        self._results = {}
+        self._remaining = len(singles) + sum(len(batch) for batch in batches)
+        self._done = asyncio.Event()
+        self._stats = {"parsed": 0, "writes": 0}
+        if not self._remaining:
+            return {}
+
+        # Unbounded: it never holds more than one entry per job.
+        self._fetch_queue = asyncio.Queue()
+        self._parse_queue = asyncio.Queue(self.queue_size)
+        self._persist_queue = asyncio.Queue(self.queue_size)
+        for platform in singles:
+            self._fetch_queue.put_nowait((RefreshJob([platform]),))
+        for batch in batches:
+            self._fetch_queue.put_nowait((RefreshJob(batch, batch=True),))
+
+        parsers = parse_pool.size if parse_pool.enabled else self.concurrency
+        with (
+            ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="refresh"
+            ) as self._io,
+            ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="refresh-writer"
+            ) as self._writer,
+        ):
+            workers = [
+                *(
+                    self._worker(self._fetch_queue, self._fetch)
+                    for _ in range(self.concurrency)
+                ),
+                *(self._worker(self._parse_queue, self._parse) for _ in range(parsers)),
+                asyncio.create_task(self._persist_worker()),
+            ]
+            try:
+                await self._done.wait()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                # Async fetchers shared this loop's DevTools connection.
+                await async_browser.disconnect()
+
+        logger.info(
+            f"Refresh pipeline finished {len(self._results)} platforms in "
+            f"{time.perf_counter() - start:.2f}s: {self._stats['parsed']} page(s) parsed "
+            f"{f'in {parse_pool.size} process(es)' if parse_pool.enabled else 'on threads'}, "
+            f"{self._stats['writes']} cache write(s)"
+        )
+        return self._results
+
+    @staticmethod
+    def _group(platforms):
+        """
+        Split platforms into ones fetched on their own and batches of two or more
+        that share a batch-capable fetcher class (and have distinct URLs).
+        """
+        groups = {}
+        singles = []
+        for platform in platforms:
+            try:
+                fetcher = get_fetcher(platform)
+            except Exception:
+                # Let _refresh_one report the configuration error.
+                singles.append(platform)
+                continue
+            if inspect.iscoroutinefunction(
+                fetcher.fetch_followers_count
+            ) or not getattr(fetcher, "supports_batch", False):
+                singles.append(platform)
+                continue
+            group = groups.setdefault(type(fetcher), {})
+            if platform.page_url in group:
+                singles.append(platform)
+            else:
+                group[platform.page_url] = platform
+
+        batches = []
+        for group in groups.values():
+            members = list(group.values())
+            if len(members) > 1:
+                batches.append(members)
+            else:
+                singles.extend(members)
+        return singles, batches
+
+    # ─────────────────────────────── Stages ───────────────────────────────────
+    def _worker(self, queue, handle):
+        """A task taking jobs off ``queue`` forever; a job that raises has failed."""
+
+        async def work():
+            while True:
+                job, *args = await queue.get()
+                try:
+                    await handle(job, *args)
+                except Exception as e:
+                    await self._fail(job, e)
+
+        return asyncio.create_task(work())
+
+    async def _fetch(self, job):
+        loop = asyncio.get_running_loop()
+        if job.batch:
+            await self._fetch_batch(job)
+            return
+
+        platform = job.platforms[0]
+        if job.fetcher is None:
+            job.start = time.perf_counter()
+            job.fetcher = get_fetcher(platform)
+            if self._staged(job.fetcher):
+                guard = FetchGuard(platform)
+                await loop.run_in_executor(self._io, guard.enter)
+                job.guard = guard
+        fetcher = job.fetcher
+
+        if job.guard is None:
+            if inspect.iscoroutinefunction(fetcher.fetch_followers_count):
+                followers = await self._fetch_async(platform, fetcher, self._io)
+            else:
+                followers = await loop.run_in_executor(self._io, run_fetcher, platform)
+            await self._persist_queue.put((job, platform, followers, None))
+            return
+
+        tier, _ = fetcher.fetch_strategies[job.tier_index]
+        remaining = fetch_deadline(fetcher) - (time.perf_counter() - job.start)
+        if remaining <= 0:
+            raise FetchTimeout(
+                f"fetch {platform.name} ran out of time before its {tier} tier"
+            )
+        try:
+            page = await loop.run_in_executor(
+                self._io,
+                call_with_deadline,
+                functools.partial(fetcher.fetch_page, tier),
+                remaining,
+                f"fetch {platform.name}",
+            )
+        except TIER_ERRORS as e:
+            self._next_tier(job, tier, e)
+            return
+        if isinstance(page, RawPage):
+            await self._parse_queue.put((job, page))
+        else:
+            await self._persist_queue.put((job, platform, page, tier))
+
+    @staticmethod
+    async def _fetch_async(platform, fetcher, executor) -> int:
+        """
+        Await a coroutine fetcher inside the same breaker/rate-limit guard and
+        deadline run_fetcher uses.
+        """
+        loop = asyncio.get_running_loop()
+        guard = FetchGuard(platform)
+        await loop.run_in_executor(executor, guard.enter)
+        deadline = fetch_deadline(fetcher)
+        try:
+            try:
+                followers = await asyncio.wait_for(
+                    fetcher.fetch_followers_count(), deadline
+                )
+            except asyncio.TimeoutError:
+                raise FetchTimeout(
+                    f"fetch {platform.name} did not finish within {deadline:.0f}s"
+                )
+        except FetchSkipped:
+            await loop.run_in_executor(executor, guard.record_skipped)
+            raise
+        except Exception:
+            await loop.run_in_executor(executor, guard.record_failure)
+            raise
+        await loop.run_in_executor(executor, guard.record_success)
+        await loop.run_in_executor(executor, record_fetch_tier, platform, fetcher)
+        return followers
+
+    async def _fetch_batch(self, job):
+        loop = asyncio.get_running_loop()
+        job.start = time.perf_counter()
+        try:
+            counts = await loop.run_in_executor(
+                self._io, run_fetcher_batch, job.platforms
+            )
+        except Exception as e:
+            counts = {platform.name: e for platform in job.platforms}
+        logger.info(
+            f"Batch-fetched {len(job.platforms)} platforms in one batch "
+            f"({time.perf_counter() - job.start:.2f}s)"
+        )
+        for platform in job.platforms:
+            followers = counts.get(platform.name)
+            if isinstance(followers, Exception):
+                self._complete(platform, self._failure(platform, followers, job.start))
+            else:
+                await self._persist_queue.put((job, platform, followers, None))
+
+    async def _parse(self, job, page: RawPage):
+        try:
+            count = await self._run_parser(job.fetcher, page)
+        except TIER_ERRORS as e:
+            self._next_tier(job, page.tier, e)
+            return
+        self._stats["parsed"] += 1
+        await self._persist_queue.put((job, job.platforms[0], count, page.tier))
+
+    async def _run_parser(self, fetcher, page: RawPage) -> int:
+        if parse_pool.enabled:
+            try:
+                return await asyncio.wrap_future(
+                    parse_pool.submit(fetcher_path(fetcher), page)
+                )
+            except ParseWorkerError as e:
+                logger.warning(f"{e}; parsing {page.url} in-process")
+        return await asyncio.get_running_loop().run_in_executor(
+            self._io, fetcher.parse_snapshot, page.source, page.tier
+        )
+
+    async def _persist_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._persist_queue.get()]
+            while len(batch) < self.write_batch and not self._persist_queue.empty():
+                batch.append(self._persist_queue.get_nowait())
+            try:
+                await loop.run_in_executor(self._writer, self._write, batch)
+            except Exception as e:
+                for job, platform, _, _ in batch:
+                    self._complete(platform, self._failure(platform, e, job.start))
+                continue
+
+            self._stats["writes"] += 1
+            for job, platform, followers, _ in batch:
+                outcome = self._outcome(True, job.start, followers=followers)
+                self._complete(platform, outcome)
+                logger.info(
+                    f"Successfully refreshed metrics for {platform.name}: {followers} followers "
+                    f"({outcome['duration_seconds']:.2f}s)"
+                )
+
+    @staticmethod
+    def _write(batch):
+        """Write a batch of counts in one cache round trip, then settle staged fetches."""
+        PlatformCacheManager.update_many_platform_metrics(
+            {platform.name: followers for _, platform, followers, _ in batch},
+            # Staged fetches only; run_fetcher records the tier itself.
+            tiers={
+                platform.name: tier
+                for job, platform, _, tier in batch
+                if job.guard and tier
+            },
+        )
+        for job, platform, _, _ in batch:
+            if job.guard is not None:
+                job.guard.record_success()
+                record_latency(platform.name, time.perf_counter() - job.start)
+
+    # ─────────────────────────────── Bookkeeping ──────────────────────────────
+    @staticmethod
+    def _staged(fetcher) -> bool:
+        """Whether to fetch tier by tier and parse in the parse stage."""
+        # Hedged fetches race whole attempts, which run_fetcher already does.
+        return fetcher.defers_parsing and not getattr(
+            settings, "FETCH_HEDGE_ENABLED", False
+        )
+
+    def _next_tier(self, job, tier: str, error: Exception):
+        """Send a staged job back to be fetched with its next tier, if it has one."""
+        logger.debug(f"{type(job.fetcher).__name__}: {tier} tier failed: {error}")
+        job.errors.append(f"{tier}: {error}")
+        job.tier_index += 1
+        if job.tier_index >= len(job.fetcher.fetch_strategies):
+            raise ValueError(
+                f"{type(job.fetcher).__name__} could not find a count ({'; '.join(job.errors)})"
+            )
+        self._fetch_queue.put_nowait((job,))
+
+    async def _fail(self, job, error: Exception):
+        if job.guard is not None:
+            loop = asyncio.get_running_loop()
+            if isinstance(error, FetchSkipped):
+                record = job.guard.record_skipped
+            else:
+                record = job.guard.record_failure
+            try:
+                await loop.run_in_executor(self._writer, record)
+            except Exception as e:
+                # The platform still has to be reported, or the refresh never ends.
+                logger.error(
+                    f"Could not record the outcome for {job.platforms[0].name}: {e}"
+                )
+        for platform in job.platforms:
+            if platform.name not in self._results:
+                self._complete(platform, self._failure(platform, error, job.start))
+
+    def _complete(self, platform, outcome: dict):
+        self._results[platform.name] = outcome
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self._done.set()
+
+    def _failure(self, platform, error: Exception, start) -> dict:
+        if isinstance(error, FetchSkipped):
+            logger.info(f"Skipped {platform.name}, serving cached count: {error}")
+            return self._outcome(
+                False,
+                start,
+                followers=PlatformCacheManager.get_followers(platform.name),
+                error=str(error),
+            )
+        if isinstance(error, FETCH_ERRORS):
+            logger.error(f"Error refreshing metrics for {platform.name}: {error}")
+        else:
+            logger.error(f"Unexpected error refreshing {platform.name}: {error}")
+        return self._outcome(False, start, error=str(error))
+
+    @staticmethod
+    def _outcome(success, start, followers=None, error=None) -> dict:
+        outcome = {
+            "success": success,
+            "followers": followers,
+            "duration_seconds": time.perf_counter() - start,
+        }
+        if error is not None:
+            outcome["error"] = error
+        return outcome
+
+
+def refresh_platforms_concurrently(platforms, concurrency: int = None) -> dict:
+    """Convenience wrapper around :class:`RefreshOrchestrator`."""
+    return RefreshOrchestrator(concurrency=concurrency).run(platforms)
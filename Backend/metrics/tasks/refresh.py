@@ -1,6 +1,7 @@
 from celery import shared_task
 from core.utils.logger import logger
 from metrics.models import Platform
+from metrics.tasks.orchestrator import refresh_platforms_concurrently
 
 
 @shared_task(name="force_refresh_platforms")
@@ -10,14 +11,9 @@ def force_refresh_platforms():
     This task is triggered on-demand via an API endpoint.
     """
     logger.info("Starting on-demand platform metric refresh...")
-    platforms = Platform.objects.filter(is_active=True)
-    refreshed_count = 0
-    for platform in platforms:
-        try:
-            if platform.refresh_metrics():
-                refreshed_count += 1
-        except Exception as e:
-            logger.error(f"Error during force-refresh for {platform.name}: {e}")
+    platforms = Platform.objects.filter(is_active=True).select_related("fetch_script")
+    outcomes = refresh_platforms_concurrently(platforms)
+    refreshed_count = sum(1 for outcome in outcomes.values() if outcome["success"])
 
-    logger.info(f"Force-refresh completed. {refreshed_count}/{len(platforms)} platforms refreshed.")
+    logger.info(f"Force-refresh completed. {refreshed_count}/{len(outcomes)} platforms refreshed.")
 
@@ -2,7 +2,7 @@
 Task Observer pattern implementation for scheduled metrics operations.
 This module provides a centralized way to register and execute tasks on schedule.
 """
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Any, Iterable
 from django.utils import timezone
 from core.utils.logger import logger
 
@@ -30,19 +30,25 @@ class TaskRegistry:
         return task_func  # Return the function for use as a decorator
 
     @classmethod
-    def execute_all_tasks(cls) -> Dict[str, Any]:
+    def execute_all_tasks(cls, exclude: Iterable[str] = ()) -> Dict[str, Any]:
         """
         Execute all registered tasks.
 
+        Args:
+            exclude: Names of registered tasks to skip, e.g. when their work
+                has already been done elsewhere
+
         Returns:
             Dict containing execution results
         """
         start_time = timezone.now()
         results = {}
+        excluded = set(exclude)
+        tasks = [t for t in cls._tasks if t.__name__ not in excluded]
 
-        logger.info(f"Executing {len(cls._tasks)} registered tasks")
+        logger.info(f"Executing {len(tasks)} registered tasks")
 
-        for task_func in cls._tasks:
+        for task_func in tasks:
             task_name = task_func.__name__
             try:
                 logger.info(f"Executing task: {task_name}")
@@ -54,7 +60,7 @@ class TaskRegistry:
                 results[task_name] = {'success': False, 'error': str(e)}
 
         duration = (timezone.now() - start_time).total_seconds()
-        logger.info(f"Completed {len(cls._tasks)} tasks in {duration:.2f}s")
+        logger.info(f"Completed {len(tasks)} tasks in {duration:.2f}s")
 
         return results
 
@@ -2,11 +2,24 @@
 Metrics-specific Celery tasks.
 This module contains tasks for platform metrics, analytics, and reporting.
 """
-from celery import shared_task
+
+import time
+
+from celery import chord, shared_task
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.utils import uuid
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
 
 from core.utils.analytics import AnalyticsManager
 from core.utils.logger import logger
+from core.utils.platform_cache import PlatformCacheManager
+from fetchers import FetchSkipped, run_fetcher, run_fetcher_batch
+from fetchers.resilience import RateLimitedError
+from fetchers.utils import group_batch_api_platforms
 from metrics.models.platform import Platform
+from metrics.tasks.cadence import adaptive_scheduler
+from metrics.tasks.orchestrator import refresh_platforms_concurrently
 from metrics.tasks.registry import register_task
 
 
@@ -18,17 +31,8 @@ def update_platform_metrics():
     Automatically registered with TaskRegistry and Celery.
     """
     platforms = Platform.objects.get_all()
-    results = {}
-
-    for platform in platforms:
-        try:
-            success = platform.refresh_metrics()
-            results[platform.name] = success
-        except Exception as e:
-            logger.error(f"Error refreshing metrics for {platform.name}: {e}")
-            results[platform.name] = False
-
-    return results
+    outcomes = refresh_platforms_concurrently(platforms)
+    return {name: outcome["success"] for name, outcome in outcomes.items()}
 
 
 @register_task
@@ -53,24 +57,258 @@ def create_daily_platform_metrics():
     Automatically registered with TaskRegistry and Celery.
     """
     from metrics.models.other_model import DailyPlatformMetric
+
     return DailyPlatformMetric.create_daily_metrics_for_all_platforms()
 
 
-# Shared task for Celery Beat scheduling - executes all registered tasks
+# ─────────────────────────── Per-platform fan-out ───────────────────────────
+@shared_task(
+    bind=True,
+    max_retries=getattr(settings, "PLATFORM_FETCH_MAX_RETRIES", 3),
+    soft_time_limit=getattr(settings, "PLATFORM_FETCH_SOFT_TIME_LIMIT", 120),
+    time_limit=getattr(settings, "PLATFORM_FETCH_TIME_LIMIT", 150),
+)
+def fetch_platform_metrics(self, platform_id):
+    """
+    Fetches the follower count for a single platform.
+
+    Failures are retried with exponential backoff and full jitter. Once retries
+    are exhausted (or the soft time limit fires) a failure result is returned
+    instead of raising, so the chord callback still runs for everyone else.
+    A platform whose circuit breaker is open is skipped without retrying.
+
+    Returns:
+        dict: {"platform": name, "success": bool, "followers": int | None,
+        "duration_seconds": float} plus "error" on failure
+    """
+    start = time.perf_counter()
+    try:
+        platform = Platform.objects.select_related("fetch_script").get(pk=platform_id)
+    except Platform.DoesNotExist:
+        # Deleted between dispatch and run; report it instead of failing the chord.
+        logger.warning(f"Platform {platform_id} no longer exists, skipping its fetch")
+        return _missing_result(str(platform_id))
+
+    try:
+        followers = run_fetcher(platform)
+    except RateLimitedError as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=int(e.retry_after) + 1)
+        return _fetch_result(platform, start, error=str(e), skipped=True)
+    except FetchSkipped as e:
+        logger.info(f"Skipped {platform.name}, serving cached count: {e}")
+        return _fetch_result(platform, start, error=str(e), skipped=True)
+    except SoftTimeLimitExceeded:
+        logger.error(f"Fetching {platform.name} exceeded its soft time limit")
+        return _fetch_result(platform, start, error="soft time limit exceeded")
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            countdown = get_exponential_backoff_interval(
+                factor=getattr(settings, "PLATFORM_FETCH_RETRY_BACKOFF", 10),
+                retries=self.request.retries,
+                maximum=getattr(settings, "PLATFORM_FETCH_RETRY_BACKOFF_MAX", 300),
+                full_jitter=True,
+            )
+            logger.warning(
+                f"Fetching {platform.name} failed ({e}); "
+                f"retry {self.request.retries + 1}/{self.max_retries} in {countdown}s"
+            )
+            raise self.retry(exc=e, countdown=countdown)
+        logger.error(
+            f"Giving up on {platform.name} after {self.max_retries} retries: {e}"
+        )
+        return _fetch_result(platform, start, error=str(e))
+
+    return _fetch_result(platform, start, followers=followers)
+
+
+@shared_task(
+    soft_time_limit=getattr(settings, "PLATFORM_FETCH_SOFT_TIME_LIMIT", 120),
+    time_limit=getattr(settings, "PLATFORM_FETCH_TIME_LIMIT", 150),
+)
+def fetch_platform_metrics_batch(platform_ids):
+    """
+    Fetches the follower counts of platforms sharing a BatchApiFetcher with one
+    API request per chunk of accounts instead of one task and request each.
+
+    Returns:
+        list: One :func:`fetch_platform_metrics`-style result per platform
+    """
+    platforms = list(
+        Platform.objects.select_related("fetch_script").filter(pk__in=platform_ids)
+    )
+    start = time.perf_counter()
+    try:
+        outcomes = run_fetcher_batch(platforms)
+    except SoftTimeLimitExceeded:
+        logger.error(
+            f"Batch fetch of {len(platforms)} platforms exceeded its soft time limit"
+        )
+        outcomes = {p.name: Exception("soft time limit exceeded") for p in platforms}
+
+    results = []
+    for platform in platforms:
+        outcome = outcomes.get(platform.name, ValueError("No result"))
+        if isinstance(outcome, FetchSkipped):
+            logger.info(f"Skipped {platform.name}, serving cached count: {outcome}")
+            results.append(
+                _fetch_result(platform, start, error=str(outcome), skipped=True)
+            )
+        elif isinstance(outcome, Exception):
+            logger.error(f"Error fetching {platform.name} in batch: {outcome}")
+            results.append(_fetch_result(platform, start, error=str(outcome)))
+        else:
+            results.append(_fetch_result(platform, start, followers=outcome))
+    return results
+
+
+def _missing_result(name, error="Platform no longer exists") -> dict:
+    return {
+        "platform": name,
+        "success": False,
+        "followers": None,
+        "duration_seconds": 0.0,
+        "error": error,
+    }
+
+
+def _fetch_result(platform, start, followers=None, error=None, skipped=False) -> dict:
+    if skipped:
+        # Report the count the dashboard keeps serving; the callback never writes it back.
+        followers = PlatformCacheManager.get_followers(platform.name)
+    result = {
+        "platform": platform.name,
+        "success": error is None,
+        "followers": followers,
+        "duration_seconds": time.perf_counter() - start,
+    }
+    if error is not None:
+        result["error"] = error
+    return result
+
+
 @shared_task
-def execute_all_metrics_tasks():
+def finalize_metrics_refresh(fetch_results):
     """
-    Executes all tasks registered in the TaskRegistry.
-    This is the main entry point for scheduled task execution.
+    Chord callback for :func:`execute_all_metrics_tasks`.
+
+    Writes every successful fetch to the platform cache, then runs the rest of
+    the registered tasks (analytics recompute, daily metrics) exactly once.
     """
     from metrics.tasks.registry import TaskRegistry
 
-    logger.info("Starting execution of all metrics tasks")
-    results = TaskRegistry.execute_all_tasks()
+    # Batch tasks return a list of results; single-platform tasks return one.
+    flattened = []
+    for result in fetch_results:
+        flattened.extend(result if isinstance(result, list) else [result])
+
+    platform_results = {}
+    for result in flattened:
+        if result["success"]:
+            PlatformCacheManager.update_platform_metrics(
+                result["platform"], result["followers"]
+            )
+        platform_results[result["platform"]] = result["success"]
+
+    results = {"update_platform_metrics": {"success": True, "result": platform_results}}
+    results.update(TaskRegistry.execute_all_tasks(exclude={"update_platform_metrics"}))
 
-    # Count successes and failures
-    successes = sum(1 for r in results.values() if r.get('success', False))
+    successes = sum(1 for r in results.values() if r.get("success", False))
     failures = len(results) - successes
+    refreshed = sum(1 for ok in platform_results.values() if ok)
 
-    logger.info(f"Task execution completed: {successes} succeeded, {failures} failed")
+    logger.info(
+        f"Metrics refresh finalized: {refreshed}/{len(platform_results)} platforms "
+        f"refreshed, {successes} tasks succeeded, {failures} failed"
+    )
     return results
+
+
+@shared_task
+def finalize_metrics_refresh_on_error(request, exc, traceback, header):
+    """
+    Error path of the :func:`execute_all_metrics_tasks` chord.
+
+    A header task that is killed at its hard time limit (or otherwise dies
+    without returning) fails the whole chord and the callback is never
+    called. This errback collects the results of the tasks that did finish,
+    reports the rest as failed and dispatches :func:`finalize_metrics_refresh`
+    with them, so the cache and the other registered tasks are still updated.
+
+    Args:
+        header: ``[task_id, [platform names]]`` for every header task
+    """
+    logger.error(
+        f"Metrics refresh chord failed ({exc!r}); finalizing with partial results"
+    )
+
+    fetch_results = []
+    for task_id, names in header:
+        result = fetch_platform_metrics.AsyncResult(task_id)
+        if result.successful():
+            fetch_results.append(result.result)
+        else:
+            error = f"Fetch task {result.state.lower()}: {result.result!r}"
+            fetch_results.append([_missing_result(name, error) for name in names])
+    return finalize_metrics_refresh.delay(fetch_results).id
+
+
+# Shared task for Celery Beat scheduling - fans out one fetch task per platform
+@shared_task
+def execute_all_metrics_tasks(force=False):
+    """
+    Entry point for scheduled task execution.
+
+    Dispatches one :func:`fetch_platform_metrics` task per due platform (and
+    one :func:`fetch_platform_metrics_batch` task per group of platforms that
+    share a batch API fetcher) as the header of a chord whose callback,
+    :func:`finalize_metrics_refresh`, updates the cache and runs the remaining
+    registered tasks once every fetch has finished, failed or timed out.
+
+    Scheduled runs only fetch platforms the adaptive scheduler says are due,
+    so Beat should fire this at least as often as REFRESH_MIN_INTERVAL.
+    Pass ``force=True`` (API, signals, startup) to refresh every platform.
+
+    Args:
+        force (bool): Ignore each platform's next refresh time
+    """
+    platforms = Platform.objects.get_all()
+    if not force:
+        platforms = adaptive_scheduler.due_platforms(platforms)
+    # Schedule before dispatching so the next Beat tick does not re-enqueue
+    # platforms whose fetch is still in flight.
+    adaptive_scheduler.schedule(platforms)
+
+    singles, batches = group_batch_api_platforms(platforms)
+    platform_ids = [platform.id for platform in platforms]
+    logger.info(
+        f"Fanning out metrics refresh to {len(platform_ids)} platforms"
+        f"{' (forced)' if force else ''}"
+        f"{f', {len(batches)} batched API group(s)' if batches else ''}"
+    )
+
+    if not platform_ids:
+        result = finalize_metrics_refresh.delay([])
+    else:
+        # Task ids are assigned up front so the error path can look the results up.
+        header, manifest = [], []
+        for platform in singles:
+            task_id = uuid()
+            header.append(
+                fetch_platform_metrics.s(str(platform.id)).set(task_id=task_id)
+            )
+            manifest.append([task_id, [platform.name]])
+        for batch in batches:
+            task_id = uuid()
+            header.append(
+                fetch_platform_metrics_batch.s(
+                    [str(platform.id) for platform in batch]
+                ).set(task_id=task_id)
+            )
+            manifest.append([task_id, [platform.name for platform in batch]])
+        callback = finalize_metrics_refresh.s().on_error(
+            finalize_metrics_refresh_on_error.s(manifest)
+        )
+        result = chord(header)(callback)
+
+    return {"platforms": len(platform_ids), "callback_id": result.id}
@@ -0,0 +1,104 @@
+import json
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from fetchers.base import HTTP_TIER
+from fetchers.timing import PARSE, stage
+from metrics.management.commands import benchmark_fetchers
+
+PLATFORM = SimpleNamespace(name="benchmark-test", page_url="https://bench.test/page")
+
+
+class FakeFetcher:
+    """Spends ``parse_ms`` in the parse stage of every fetch."""
+
+    last_fetch_tier = HTTP_TIER
+
+    def __init__(self, parse_ms: float):
+        self.parse_ms = parse_ms
+
+    def fetch_followers_count(self) -> int:
+        with stage(PARSE):
+            time.sleep(self.parse_ms / 1000)
+        return 1234
+
+
+class BenchmarkFetchersTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.baseline = Path(directory.name) / "benchmarks" / "baseline.json"
+        patcher = mock.patch.object(
+            benchmark_fetchers.Platform.objects, "get_all", return_value=[PLATFORM]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def benchmark(self, parse_ms: float, *args) -> str:
+        out = StringIO()
+        with mock.patch.object(
+            benchmark_fetchers, "get_fetcher", return_value=FakeFetcher(parse_ms)
+        ):
+            call_command(
+                "benchmark_fetchers",
+                "--repeat=1",
+                f"--baseline={self.baseline}",
+                *args,
+                stdout=out,
+            )
+        return out.getvalue()
+
+    def test_first_run_writes_the_baseline(self):
+        output = self.benchmark(5)
+
+        self.assertIn(f"No baseline at {self.baseline} yet", output)
+        stages = json.loads(self.baseline.read_text())[PLATFORM.name]["stages"]
+        self.assertGreaterEqual(stages[PARSE]["median_ms"], 5)
+
+    def test_slower_stage_is_flagged_as_a_regression(self):
+        self.benchmark(5)
+
+        output = self.benchmark(50)
+
+        self.assertIn(f"Regression: {PLATFORM.name} parse", output)
+        with self.assertRaisesMessage(CommandError, "regressed"):
+            self.benchmark(50, "--fail-on-regression")
+
+    def test_compare(self):
+        baseline = {"x": {"stages": {"parse": {"median_ms": 10}, "navigation": {}}}}
+        results = {
+            "x": {
+                "stages": {
+                    "parse": {"median_ms": 13},
+                    "navigation": {"median_ms": 50},
+                    "transfer": {"median_ms": None},
+                }
+            }
+        }
+
+        regressions = benchmark_fetchers.Command.compare(results, baseline, 20)
+
+        self.assertEqual(
+            regressions,
+            [
+                {
+                    "platform": "x",
+                    "stage": "parse",
+                    "baseline_ms": 10,
+                    "median_ms": 13,
+                    "percent": 30.0,
+                }
+            ],
+        )
+        # Under the threshold, or less than a millisecond slower, is not a regression.
+        self.assertEqual(benchmark_fetchers.Command.compare(results, baseline, 40), [])
+        results["x"]["stages"]["parse"]["median_ms"] = 10.5
+        self.assertEqual(benchmark_fetchers.Command.compare(results, baseline, 1), [])
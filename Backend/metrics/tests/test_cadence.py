@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from core.utils.cache_keys import CacheKey
+from core.utils.platform_cache import PlatformCacheManager
+from metrics.models import DailyPlatformMetric, Platform
+from metrics.tasks.cadence import SECONDS_PER_DAY, AdaptiveScheduler
+
+
+class AdaptiveSchedulerTests(TestCase):
+    def setUp(self):
+        self.scheduler = AdaptiveScheduler()
+        self.scheduler.min_interval = 15 * 60
+        self.scheduler.max_interval = SECONDS_PER_DAY
+        self.scheduler.target_change = 5
+        self.scheduler.history_days = 14
+
+        # bulk_create skips the post_save handler, which would dispatch a refresh.
+        self.busy, self.quiet = Platform.objects.bulk_create(
+            [
+                Platform(name="cadence-busy", name_ar="busy", color="#000000"),
+                Platform(name="cadence-quiet", name_ar="quiet", color="#000000"),
+            ]
+        )
+        self.platforms = [self.busy, self.quiet]
+        for platform in self.platforms:
+            PlatformCacheManager.clear_platform_cache(platform.name)
+        cache.delete_many(self._schedule_keys())
+
+    def tearDown(self):
+        cache.delete_many(self._schedule_keys())
+        for platform in self.platforms:
+            PlatformCacheManager.clear_platform_cache(platform.name)
+
+    def _schedule_keys(self):
+        return [
+            CacheKey.PLATFORM_REFRESH_SCHEDULE.build(name=p.name)
+            for p in self.platforms
+        ]
+
+    def _history(self, platform, per_day, days=10):
+        today = date.today()
+        DailyPlatformMetric.objects.bulk_create(
+            [
+                DailyPlatformMetric(
+                    platform=platform,
+                    date=today - timedelta(days=days - i),
+                    followers=1000 + per_day * i,
+                )
+                for i in range(days + 1)
+            ]
+        )
+
+    def test_interval_is_clamped(self):
+        self.assertEqual(self.scheduler._interval_for(0), SECONDS_PER_DAY)
+        self.assertEqual(self.scheduler._interval_for(1), 15 * 60)
+        self.assertEqual(self.scheduler._interval_for(5 / 3600), 3600)
+
+    def test_interval_follows_daily_velocity(self):
+        self._history(self.busy, per_day=100)
+
+        intervals = self.scheduler.schedule(self.platforms)
+
+        # 5 followers at 100 a day take 72 minutes.
+        self.assertEqual(intervals["cadence-busy"], 72 * 60)
+        self.assertEqual(intervals["cadence-quiet"], SECONDS_PER_DAY)
+
+    def test_scheduled_platforms_are_due_after_their_interval(self):
+        now = timezone.now()
+        self._history(self.busy, per_day=100)
+        self.assertEqual(
+            self.scheduler.due_platforms(self.platforms, now), self.platforms
+        )
+
+        self.scheduler.schedule(self.platforms, now=now)
+
+        self.assertEqual(self.scheduler.due_platforms(self.platforms, now), [])
+        later = now + timedelta(seconds=72 * 60)
+        self.assertEqual(
+            self.scheduler.due_platforms(self.platforms, later), [self.busy]
+        )
+
+    def test_spike_since_last_refresh_shortens_interval(self):
+        self.scheduler.schedule(self.platforms)
+        # 50 new followers over the day-long interval picked last time.
+        PlatformCacheManager.update_platform_metrics("cadence-quiet", 1050, delta=50)
+
+        intervals = self.scheduler.schedule(self.platforms)
+
+        self.assertEqual(intervals["cadence-quiet"], SECONDS_PER_DAY // 10)
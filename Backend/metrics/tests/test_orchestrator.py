@@ -0,0 +1,105 @@
+import multiprocessing
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from core.utils.platform_cache import PlatformCacheManager
+from fetchers.parse_pool import ParsePool
+from fetchers.resilience import CircuitBreaker
+from fetchers.tests.test_platforms import (
+    FACEBOOK_LOGIN_WALL_URL,
+    LINKEDIN_URL,
+    TIKTOK_URL,
+)
+from fetchers.tests.utils import ReplayTestCase
+from metrics.tasks.orchestrator import RefreshOrchestrator
+
+FACEBOOK = "fetchers.platforms.facebook.FacebookFetcher"
+LINKEDIN = "fetchers.platforms.linkedin.LinkedinFetcher"
+TIKTOK = "fetchers.platforms.tiktok.TiktokFetcher"
+
+
+def platform(pk, name, page_url, script_path):
+    return SimpleNamespace(
+        pk=pk,
+        name=name,
+        page_url=page_url,
+        fetch_script=SimpleNamespace(script_path=script_path),
+    )
+
+
+def refresh_in_daemon(platforms, results):
+    """Run a refresh the way a Celery prefork child would: from a daemon process."""
+    try:
+        with mock.patch("metrics.tasks.orchestrator.parse_pool", ParsePool(2)):
+            results.put(RefreshOrchestrator(concurrency=2).run(platforms))
+    except Exception as e:
+        results.put(repr(e))
+
+
+@override_settings(FETCH_HEDGE_ENABLED=False)
+class RefreshOrchestratorTests(ReplayTestCase):
+    def setUp(self):
+        super().setUp()
+        # One platform per fetcher class, so none of them is batched.
+        self.platforms = [
+            platform(9001, "orchestrator-http", LINKEDIN_URL, LINKEDIN),
+            platform(9002, "orchestrator-json", TIKTOK_URL, TIKTOK),
+            platform(9003, "orchestrator-browser", FACEBOOK_LOGIN_WALL_URL, FACEBOOK),
+            platform(9004, "orchestrator-broken", TIKTOK_URL, "fetchers.Missing"),
+        ]
+        self._clear()
+        self.addCleanup(self._clear)
+
+    def _clear(self):
+        for p in self.platforms:
+            PlatformCacheManager.clear_platform_cache(p.name)
+            breaker = CircuitBreaker(p.name)
+            cache.delete_many(
+                [breaker.failures_key, breaker.open_key, breaker.trial_key]
+            )
+
+    def assertRefreshed(self, results):
+        followers = {name: result["followers"] for name, result in results.items()}
+        self.assertEqual(
+            followers,
+            {
+                "orchestrator-http": 2345,
+                "orchestrator-json": 98765,
+                "orchestrator-browser": 2500,
+                "orchestrator-broken": None,
+            },
+        )
+        self.assertFalse(results["orchestrator-broken"]["success"])
+
+    def test_parses_on_threads(self):
+        with mock.patch("metrics.tasks.orchestrator.parse_pool", ParsePool(0)):
+            results = RefreshOrchestrator(concurrency=2).run(self.platforms)
+
+        self.assertRefreshed(results)
+        self.assertEqual(PlatformCacheManager.get_followers("orchestrator-http"), 2345)
+        self.assertEqual(
+            PlatformCacheManager.get_followers("orchestrator-browser"), 2500
+        )
+
+    def test_parses_in_processes(self):
+        pool = ParsePool(1)
+        self.addCleanup(pool.close)
+        with mock.patch("metrics.tasks.orchestrator.parse_pool", pool):
+            results = RefreshOrchestrator(concurrency=2).run(self.platforms)
+
+        self.assertRefreshed(results)
+
+    def test_daemon_process_parses_in_processes(self):
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        process = context.Process(
+            target=refresh_in_daemon, args=(self.platforms, results), daemon=True
+        )
+        process.start()
+        try:
+            self.assertRefreshed(results.get(timeout=60))
+        finally:
+            process.join(10)
@@ -0,0 +1,78 @@
+import uuid
+from unittest import mock
+
+from django.test import TestCase
+
+from metrics.models import Platform
+from metrics.tasks import tasks
+
+
+class FetchPlatformMetricsTests(TestCase):
+    def test_deleted_platform_returns_failure_result(self):
+        platform_id = str(uuid.uuid4())
+
+        result = tasks.fetch_platform_metrics.apply(args=[platform_id]).get()
+
+        self.assertEqual(result["platform"], platform_id)
+        self.assertFalse(result["success"])
+        self.assertIsNone(result["followers"])
+        self.assertIn("no longer exists", result["error"])
+
+
+class MetricsChordTests(TestCase):
+    def setUp(self):
+        # bulk_create skips the post_save handler, which would dispatch a refresh.
+        self.platforms = Platform.objects.bulk_create(
+            [
+                Platform(name="Facebook", name_ar="فيسبوك", color="#4267B2"),
+                Platform(name="Twitter", name_ar="تويتر", color="#1DA1F2"),
+            ]
+        )
+
+    def test_chord_callback_has_an_error_path(self):
+        with (
+            mock.patch.object(tasks, "chord") as chord,
+            mock.patch.object(
+                tasks.Platform.objects, "get_all", return_value=self.platforms
+            ),
+        ):
+            tasks.execute_all_metrics_tasks.run(force=True)
+
+        header = chord.call_args.args[0]
+        callback = chord.return_value.call_args.args[0]
+        errback = callback.options["link_error"][0]
+        manifest = errback.args[0]
+
+        self.assertEqual(errback.task, tasks.finalize_metrics_refresh_on_error.name)
+        self.assertEqual(
+            [task_id for task_id, _ in manifest],
+            [signature.options["task_id"] for signature in header],
+        )
+        self.assertEqual(
+            sorted(name for _, names in manifest for name in names),
+            ["Facebook", "Twitter"],
+        )
+
+    def test_error_path_finalizes_with_partial_results(self):
+        finished = mock.Mock(state="SUCCESS", result={"platform": "Facebook"})
+        finished.successful.return_value = True
+        killed = mock.Mock(state="FAILURE", result=Exception("Hard time limit"))
+        killed.successful.return_value = False
+        results = {"finished": finished, "killed": killed}
+        header = [["finished", ["Facebook"]], ["killed", ["Twitter"]]]
+
+        with (
+            mock.patch.object(
+                tasks.fetch_platform_metrics, "AsyncResult", side_effect=results.get
+            ),
+            mock.patch.object(tasks.finalize_metrics_refresh, "delay") as delay,
+        ):
+            tasks.finalize_metrics_refresh_on_error(
+                None, Exception("Hard time limit"), None, header
+            )
+
+        (fetch_results,), _ = delay.call_args
+        self.assertEqual(fetch_results[0], {"platform": "Facebook"})
+        self.assertEqual(fetch_results[1][0]["platform"], "Twitter")
+        self.assertFalse(fetch_results[1][0]["success"])
+        self.assertIn("Hard time limit", fetch_results[1][0]["error"])
@@ -37,7 +37,7 @@ class ForceRefreshView(APIView):
         Triggers the Celery task to refresh platform metrics in the background.
         """
         try:
-            execute_all_metrics_tasks.apply_async(countdown=3)
+            execute_all_metrics_tasks.apply_async(kwargs={"force": True}, countdown=3)
             logger.info("Force refresh task triggered successfully via API.")
             return Response(
                 {"message": "Platform metric refresh has been triggered."},